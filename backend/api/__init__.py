@@ -2,6 +2,7 @@ __all__ = (
     "api",
     "auth",
     "menus",
+    "metrics",
     "orders",
     "printers",
     "products",
@@ -17,6 +18,7 @@ from fastapi import APIRouter
 
 from .auth import auth
 from .menus import menus
+from .metrics import metrics
 from .orders import orders
 from .printers import printers
 from .products import products
@@ -30,6 +32,7 @@ from .users import users
 api = APIRouter()
 api.include_router(auth)
 api.include_router(menus)
+api.include_router(metrics)
 api.include_router(orders)
 api.include_router(printers)
 api.include_router(products)
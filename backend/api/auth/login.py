@@ -19,7 +19,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     Performs user authentication.
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         try:
             user = await User.get_or_none(
                 username=form_data.username, using_db=connection
@@ -21,7 +21,7 @@ async def register(
     Register a new user.
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         role = await Role.get_or_none(id=item.role_id, using_db=connection)
 
         if not role:
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuDate
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound
 from backend.models.menu import AddMenuDateItem, AddMenuDateResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -15,6 +15,7 @@ add_menu_date_router = APIRouter()
     "/{menu_id}/date", response_model=AddMenuDateResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def add_menu_date(
     menu_id: int,
     item: AddMenuDateItem,
@@ -26,7 +27,7 @@ async def add_menu_date(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuField, MenuFieldProduct, Product
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound
 from backend.models.menu import (
     AddMenuFieldProductItem,
@@ -19,6 +19,7 @@ add_menu_field_product_router = APIRouter()
     response_model=AddMenuFieldProductResponse,
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def add_menu_field_product(
     menu_id: int,
     menu_field_id: int,
@@ -31,7 +32,7 @@ async def add_menu_field_product(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
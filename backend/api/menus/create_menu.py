@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict
 from backend.models.menu import CreateMenuItem, CreateMenuResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -13,6 +13,7 @@ create_menu_router = APIRouter()
 
 @create_menu_router.post("/", response_model=CreateMenuResponse)
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def create_menu(
     item: CreateMenuItem,
     token: TokenJwt = Depends(validate_token),
@@ -23,7 +24,7 @@ async def create_menu(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         new_menu = Menu(
             name=item.name, short_name=item.short_name, price=item.price
         )
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuField
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -14,6 +14,7 @@ delete_menu_field_router = APIRouter()
     "/{menu_id}/field/{menu_field_id}", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def delete_menu_field(
     menu_id: int,
     menu_field_id: int,
@@ -25,7 +26,7 @@ async def delete_menu_field(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuField, MenuFieldProduct
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -15,6 +15,7 @@ delete_menu_field_product_router = APIRouter()
     response_model=BaseResponse,
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def delete_menu_field_product(
     menu_id: int,
     menu_field_id: int,
@@ -27,7 +28,7 @@ async def delete_menu_field_product(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
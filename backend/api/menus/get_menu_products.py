@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from tortoise.query_utils import Prefetch
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, ProductIngredient, ProductVariant
+from backend.decorators import cache_catalog
 from backend.models.error import NotFound
 from backend.models.menu import GetMenuProductsResponse
 from backend.services.orders import get_today_quantities
 from backend.utils import ErrorCodes, TokenJwt, validate_token
 from backend.utils.query_filters import build_single_query_filter
+from backend.utils.transaction_utils import get_read_connection
 
 get_menu_products_router = APIRouter()
 
@@ -15,7 +16,9 @@ get_menu_products_router = APIRouter()
 @get_menu_products_router.get(
     "/{menu_id}/products", response_model=GetMenuProductsResponse
 )
+@cache_catalog
 async def get_menu_products(
+    request: Request,
     menu_id: int,
     include_dates: bool = False,
     include_ingredients: bool = False,
@@ -27,53 +30,53 @@ async def get_menu_products(
     Get list of product in a menu.
     """
 
-    async with in_transaction() as connection:
-        # Build a query filter
-        query_filter = build_single_query_filter(
-            menu_id, token, include_dates, include_roles
-        )
+    connection = get_read_connection()
+    # Build a query filter
+    query_filter = build_single_query_filter(
+        menu_id, token, include_dates, include_roles
+    )
 
-        # Fetch the menu with related products, ingredients, and variants
-        menu = (
-            await Menu.filter(query_filter)
-            .prefetch_related(
-                "menu_fields__field_products",
-                "menu_fields__field_products__product__dates",
-                "menu_fields__field_products__product__roles",
-                Prefetch(
-                    "menu_fields__field_products__product__ingredients",
-                    queryset=ProductIngredient.filter(is_deleted=False),
-                ),
-                Prefetch(
-                    "menu_fields__field_products__product__variants",
-                    queryset=ProductVariant.filter(is_deleted=False),
-                ),
-            )
-            .using_db(connection)
-            .first()
+    # Fetch the menu with related products, ingredients, and variants
+    menu = (
+        await Menu.filter(query_filter)
+        .prefetch_related(
+            "menu_fields__field_products",
+            "menu_fields__field_products__product__dates",
+            "menu_fields__field_products__product__roles",
+            Prefetch(
+                "menu_fields__field_products__product__ingredients",
+                queryset=ProductIngredient.filter(is_deleted=False),
+            ),
+            Prefetch(
+                "menu_fields__field_products__product__variants",
+                queryset=ProductVariant.filter(is_deleted=False),
+            ),
         )
+        .using_db(connection)
+        .first()
+    )
 
-        if not menu:
-            raise NotFound(code=ErrorCodes.MENU_NOT_FOUND)
+    if not menu:
+        raise NotFound(code=ErrorCodes.MENU_NOT_FOUND)
 
-        if not token.permissions["can_administer"] and menu.daily_max_sales:
-            today_quantities = await get_today_quantities(
-                {menu.id}, connection, True
-            )
+    if not token.permissions["can_administer"] and menu.daily_max_sales:
+        today_quantities = await get_today_quantities(
+            {menu.id}, connection, True
+        )
 
-            if today_quantities.get(menu.id, 0) >= menu.daily_max_sales:
-                raise NotFound(code=ErrorCodes.MENU_NOT_FOUND)
+        if today_quantities.get(menu.id, 0) >= menu.daily_max_sales:
+            raise NotFound(code=ErrorCodes.MENU_NOT_FOUND)
 
-        # Get product details
-        menu_products = [
-            await field_product.product.to_dict(
-                include_dates,
-                include_ingredients,
-                include_roles,
-                include_variants,
-            )
-            for field in menu.menu_fields
-            for field_product in field.field_products
-        ]
+    # Get product details
+    menu_products = [
+        await field_product.product.to_dict(
+            include_dates,
+            include_ingredients,
+            include_roles,
+            include_variants,
+        )
+        for field in menu.menu_fields
+        for field_product in field.field_products
+    ]
 
     return GetMenuProductsResponse(products=menu_products)
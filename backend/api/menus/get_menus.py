@@ -1,21 +1,25 @@
-from fastapi import APIRouter, Depends
-from tortoise.exceptions import ParamsError
-from tortoise.query_utils import Prefetch
-from tortoise.transactions import in_transaction
+from fastapi import APIRouter, Depends, Request
 
-from backend.database.models import Menu, ProductIngredient, ProductVariant
-from backend.models.error import BadRequest
+from backend.database.models import Menu
+from backend.decorators import cache_catalog
 from backend.models.menu import GetMenusResponse, Menu as MenuModel
 from backend.services.orders import get_today_quantities
-from backend.utils import ErrorCodes, TokenJwt, validate_token
+from backend.utils import TokenJwt, validate_token
+from backend.utils.prefetch_utils import MENU_PREFETCH_PLAN, plan_prefetch
 from backend.utils.query_filters import build_multiple_query_filter
-from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.query_utils import (
+    paginate,
+    process_query_with_pagination,
+)
+from backend.utils.transaction_utils import get_read_connection
 
 get_menus_router = APIRouter()
 
 
 @get_menus_router.get("/", response_model=GetMenusResponse)
+@cache_catalog
 async def get_menus(
+    request: Request,
     offset: int = 0,
     limit: int | None = None,
     order_by: str = None,
@@ -33,75 +37,57 @@ async def get_menus(
     Get list of menu.
     """
 
-    async with in_transaction() as connection:
-        menus_query_filter = build_multiple_query_filter(
-            token,
-            include_dates,
-            include_roles,
-            include_fields_products_dates,
-            include_fields_products_roles,
-        )
+    include = {
+        "include_dates": include_dates,
+        "include_fields": include_fields,
+        "include_fields_products": include_fields_products,
+        "include_fields_products_dates": include_fields_products_dates,
+        "include_fields_products_ingredients": (
+            include_fields_products_ingredients
+        ),
+        "include_fields_products_roles": include_fields_products_roles,
+        "include_fields_products_variants": include_fields_products_variants,
+        "include_roles": include_roles,
+    }
 
-        menus_query, _, limit = await process_query_with_pagination(
-            Menu,
-            menus_query_filter,
-            connection,
-            offset,
-            limit,
-            order_by,
-        )
+    connection = get_read_connection()
+    menus_query_filter = build_multiple_query_filter(
+        token,
+        include_dates,
+        include_roles,
+        include_fields_products_dates,
+        include_fields_products_roles,
+    )
 
-        try:
-            menus = (
-                await menus_query.prefetch_related(
-                    "dates",
-                    "menu_fields__field_products",
-                    "menu_fields__field_products__product__dates",
-                    "menu_fields__field_products__product__roles",
-                    "roles",
-                    Prefetch(
-                        "menu_fields__field_products__product__ingredients",
-                        queryset=ProductIngredient.filter(is_deleted=False),
-                    ),
-                    Prefetch(
-                        "menu_fields__field_products__product__variants",
-                        queryset=ProductVariant.filter(is_deleted=False),
-                    ),
-                )
-                .offset(offset)
-                .limit(limit)
-            )
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+    menus_query, _, limit = await process_query_with_pagination(
+        Menu,
+        menus_query_filter,
+        connection,
+        offset,
+        limit,
+        order_by,
+        include_total_count=False,
+    )
 
-        if not token.permissions["can_administer"]:
-            menu_ids = {m.id for m in menus if m.daily_max_sales}
-            today_quantities = await get_today_quantities(
-                menu_ids, connection, True
-            )
+    menus_query = paginate(menus_query, offset, limit)
+    menus = await menus_query.prefetch_related(
+        *plan_prefetch(MENU_PREFETCH_PLAN, include)
+    )
+
+    if not token.permissions["can_administer"]:
+        menu_ids = {m.id for m in menus if m.daily_max_sales}
+        today_quantities = await get_today_quantities(
+            menu_ids, connection, True
+        )
 
-            menus = [
-                m
-                for m in menus
-                if not m.daily_max_sales
-                or today_quantities.get(m.id, 0) < m.daily_max_sales
-            ]
+        menus = [
+            m
+            for m in menus
+            if not m.daily_max_sales
+            or today_quantities.get(m.id, 0) < m.daily_max_sales
+        ]
 
     return GetMenusResponse(
         total_count=len(menus),
-        menus=[
-            MenuModel(
-                **await menu.to_dict(
-                    include_dates,
-                    include_fields,
-                    include_fields_products,
-                    include_fields_products_dates,
-                    include_fields_products_ingredients,
-                    include_fields_products_roles,
-                    include_fields_products_variants,
-                    include_roles,
-                )
-            )
-            for menu in menus
-        ],
+        menus=[MenuModel(**await menu.to_dict(**include)) for menu in menus],
     )
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import Conflict, NotFound
 from backend.models.menu import UpdateMenuDailyMaxSales
@@ -16,6 +16,7 @@ update_menu_daily_max_sales_router = APIRouter()
     "/{menu_id}/daily_max_sales", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_menu_daily_max_sales(
     menu_id: int,
     item: UpdateMenuDailyMaxSales,
@@ -27,7 +28,7 @@ async def update_menu_daily_max_sales(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuField
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.models.menu import UpdateMenuFieldIsOptionalItem
@@ -15,6 +15,7 @@ update_menu_field_is_optional_router = APIRouter()
     "/{menu_id}/field/{menu_field_id}/is_optional", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_menu_field_is_optional(
     menu_id: int,
     menu_field_id: int,
@@ -27,7 +28,7 @@ async def update_menu_field_is_optional(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Menu, MenuField
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.models.menu import UpdateMenuFieldMaxSortableElementsItem
@@ -16,6 +16,7 @@ update_menu_field_max_sortable_elements_router = APIRouter()
     response_model=BaseResponse,
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_menu_field_max_sortable_elements(
     menu_id: int,
     menu_field_id: int,
@@ -28,7 +29,7 @@ async def update_menu_field_max_sortable_elements(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         menu = await Menu.get_or_none(id=menu_id, using_db=connection)
 
         if not menu:
@@ -0,0 +1,8 @@
+__all__ = ("metrics", "get_metrics_router")
+
+from fastapi import APIRouter
+
+from .get_metrics import get_metrics_router
+
+metrics = APIRouter(prefix="/metrics", tags=["metrics"])
+metrics.include_router(get_metrics_router)
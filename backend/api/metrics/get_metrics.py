@@ -0,0 +1,40 @@
+import hmac
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response
+
+from backend.config import Session
+from backend.database.pool import update_pool_metrics
+from backend.models.error import NotFound, Unauthorized
+from backend.utils import ErrorCodes
+from backend.utils.metrics import CONTENT_TYPE, render_metrics
+from backend.utils.token_jwt import OAUTH2_SCHEME
+
+get_metrics_router = APIRouter()
+
+
+@get_metrics_router.get("/", include_in_schema=False)
+async def get_metrics(access_token: str = Depends(OAUTH2_SCHEME)):
+    """
+    Export the request, transaction, pool and print metrics in the Prometheus
+    text format.
+
+    A scrape reaches one of the workers, which also exports the metrics
+    written by the others to METRICS_DIR: the counters and histograms are
+    summed, the gauges are labelled with their worker. The print queues
+    are reported by the leader alone.
+    """
+
+    metrics_token = Session.config.METRICS_TOKEN
+
+    if not metrics_token:
+        raise NotFound()
+
+    if not hmac.compare_digest(access_token.encode(), metrics_token.encode()):
+        raise Unauthorized(code=ErrorCodes.NOT_AUTHENTICATED)
+
+    update_pool_metrics()
+
+    return Response(
+        render_metrics(Session.config.METRICS_DIR), media_type=CONTENT_TYPE
+    )
@@ -1,6 +1,7 @@
 __all__ = (
     "orders",
     "create_order_router",
+    "create_orders_router",
     "delete_order_router",
     "get_order_router",
     "get_orders_router",
@@ -12,6 +13,7 @@ from fastapi import APIRouter
 
 from .confirm_order import confirm_order_router
 from .create_order import create_order_router
+from .create_orders import create_orders_router
 from .delete_order import delete_order_router
 from .get_order import get_order_router
 from .get_orders import get_orders_router
@@ -21,6 +23,7 @@ from .serve_order import serve_order_router
 orders = APIRouter(prefix="/orders", tags=["orders"])
 orders.include_router(confirm_order_router)
 orders.include_router(create_order_router)
+orders.include_router(create_orders_router)
 orders.include_router(delete_order_router)
 orders.include_router(get_order_router)
 orders.include_router(get_orders_router)
@@ -10,6 +10,12 @@ from backend.decorators import check_role
 from backend.models import BaseResponse
 from backend.models.error import Unauthorized, NotFound, BadRequest
 from backend.models.orders import ConfirmOrderItem
+from backend.services.pending_stream import (
+    PendingEvent,
+    get_pending_change,
+    publish,
+    share_changes,
+)
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
 from backend.utils.order_utils import is_table_allowed_for_role
 
@@ -32,9 +38,12 @@ async def confirm_order(
     if not Session.settings.order_requires_confirmation:
         raise Unauthorized(code=ErrorCodes.NOT_ALLOWED)
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
+        # Locked until the commit, so a concurrent confirm or delete sees
+        # the order as left by this one
         order = (
-            await Order.filter(id=order_id)
+            await Order.filter(id=order_id, is_deleted=False)
+            .select_for_update()
             .prefetch_related("user__role")
             .using_db(connection)
             .first()
@@ -65,6 +74,8 @@ async def confirm_order(
         ):
             raise Unauthorized(code=ErrorCodes.TABLE_NOT_ALLOWED_FOR_ROLE)
 
+        pending_change = await get_pending_change(order, connection)
+
         rome_tz = pytz.timezone("Europe/Rome")
         now_in_rome = datetime.datetime.now(rome_tz)
 
@@ -77,4 +88,11 @@ async def confirm_order(
             }
         ).save(using_db=connection)
 
+    Session.print_manager.notify(order.id)
+
+    if pending_change:
+        publish(pending_change.negate(), pending_change.confirm())
+
+    await share_changes(PendingEvent.CONFIRMED, order.id)
+
     return BaseResponse()
@@ -1,24 +1,27 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
+from tortoise import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError
 
 from backend.config import Session
-from backend.database.models import Order
 from backend.decorators import check_role
-from backend.models.error import BadRequest, Conflict, NotFound, Unauthorized
 from backend.models.orders import (
     CreateOrderItem,
     CreateOrderResponse,
     Order as OrderModel,
 )
-from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
-from backend.utils.order_utils import (
-    check_menus,
-    check_products,
-    create_order_menus,
-    create_order_products,
-    get_order_price,
-    is_table_allowed_for_role,
+from backend.services.order_ingestion import (
+    check_order_item,
+    get_idempotent_orders,
+    place_order,
 )
+from backend.services.pending_stream import (
+    PendingEvent,
+    get_pending_change,
+    publish,
+    share_changes,
+)
+from backend.utils import Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import run_in_transaction
 
 create_order_router = APIRouter()
 
@@ -35,112 +38,46 @@ async def create_order(
     **Permission**: can_order
     """
 
-    if not item.products and not item.menus:
-        raise BadRequest(code=ErrorCodes.NO_PRODUCTS_AND_MENUS)
-
-    if item.is_takeaway_kiosk and item.is_take_away:
-        raise BadRequest(code=ErrorCodes.CANNOT_BE_BOTH_TAKEAWAY_AND_KIOSK)
-
-    if (
-        token.permissions["can_modify_completed_orders"]
-        and not item.parent_order_id
-    ):
-        raise BadRequest(code=ErrorCodes.PARENT_ORDER_ID_REQUIRED)
-
-    if token.permissions["can_order"]:
-        if item.parent_order_id:
-            raise BadRequest(code=ErrorCodes.PARENT_ORDER_ID_NOT_ALLOWED)
-
-        if item.is_takeaway_kiosk and not item.guests:
-            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
-
-        if (
-            not item.is_take_away
-            and not Session.settings.order_requires_confirmation
-            and (not item.guests or not item.table)
-        ):
-            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
-
-        if (
-            not item.is_take_away
-            and Session.settings.order_requires_confirmation
-            and not item.guests
-        ):
-            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
-
-    async with in_transaction() as connection:
-        await connection.execute_query(
-            "SET TRANSACTION ISOLATION LEVEL SERIALIZABLE;"
-        )
+    # Repeats of an order already created return it without validation
+    stored_orders = await get_idempotent_orders(
+        [item.idempotency_key], token.user_id
+    )
 
-        if item.parent_order_id:
-            parent_order = await Order.get_or_none(
-                id=item.parent_order_id, using_db=connection
-            )
+    if not stored_orders:
+        check_order_item(item, token)
 
-            if not parent_order:
-                raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
+        async def create(connection: BaseDBAsyncClient):
+            created_order = await place_order(item, token, connection)
 
-            if not parent_order.is_confirm:
-                raise BadRequest(code=ErrorCodes.PARENT_ORDER_NOT_CONFIRMED)
+            return created_order, await get_pending_change(
+                created_order, connection
+            )
 
-        if (
-            not Session.settings.order_requires_confirmation
-            and not (item.is_take_away or item.is_takeaway_kiosk)
-            and not await is_table_allowed_for_role(
-                token.role_id, item.table, connection
+        try:
+            order, pending_change = await run_in_transaction(
+                "create_order", create
+            )
+        except IntegrityError:
+            # A concurrent repeat has created the order first
+            stored_orders = await get_idempotent_orders(
+                [item.idempotency_key], token.user_id
             )
-        ):
-            raise Unauthorized(code=ErrorCodes.TABLE_NOT_ALLOWED_FOR_ROLE)
 
-        has_error_products, error_code_products = await check_products(
-            item.products, token.role_id, connection
-        )
+            if not stored_orders:
+                raise
 
-        if has_error_products:
-            raise Conflict(code=error_code_products)
+    if stored_orders:
+        stored_order = stored_orders[item.idempotency_key]
 
-        has_error_menus, error_code_menus = await check_menus(
-            item.menus, token.role_id, connection
+        return CreateOrderResponse(
+            order=OrderModel(**await stored_order.to_dict())
         )
 
-        if has_error_menus:
-            raise Conflict(code=error_code_menus)
-
-        order_price = await get_order_price(item)
-
-        order = await Order.create(
-            customer=item.customer,
-            guests=(
-                item.guests
-                if not item.is_take_away and not item.parent_order_id
-                else None
-            ),
-            is_take_away=(
-                item.is_take_away if not item.parent_order_id else False
-            ),
-            table=(
-                item.table
-                if not item.is_take_away
-                and not Session.settings.order_requires_confirmation
-                and not item.parent_order_id
-                and not item.is_takeaway_kiosk
-                else None
-            ),
-            is_confirm=(
-                True
-                if not Session.settings.order_requires_confirmation
-                else False
-            ),
-            is_voucher=item.is_voucher,
-            is_takeaway_kiosk=item.is_takeaway_kiosk,
-            price=order_price,
-            user_id=token.user_id,
-            parent_order_id=item.parent_order_id,
-            using_db=connection,
-        )
+    Session.print_manager.notify(order.id)
+
+    if pending_change:
+        publish(pending_change)
 
-        await create_order_products(item.products, order, connection)
-        await create_order_menus(item.menus, order, connection)
+    await share_changes(PendingEvent.CREATED, order.id)
 
     return CreateOrderResponse(order=OrderModel(**await order.to_dict()))
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends
+from tortoise import BaseDBAsyncClient
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from backend.config import Session
+from backend.decorators import check_role
+from backend.models import UnicornException
+from backend.models.orders import (
+    CreateOrdersItem,
+    CreateOrdersResponse,
+    CreateOrdersResult,
+    Order as OrderModel,
+)
+from backend.services.order_ingestion import (
+    check_order_item,
+    get_idempotent_orders,
+    place_order,
+)
+from backend.services.pending_stream import (
+    PendingEvent,
+    get_pending_change,
+    publish,
+    share_changes,
+)
+from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import run_in_transaction
+
+create_orders_router = APIRouter()
+
+
+@create_orders_router.post("/batch", response_model=CreateOrdersResponse)
+@check_role(Permission.CAN_ORDER, Permission.CAN_MODIFY_COMPLETED_ORDERS)
+async def create_orders(
+    item: CreateOrdersItem,
+    token: TokenJwt = Depends(validate_token),
+):
+    """
+    Create the orders queued by a till while it was offline.
+
+    Orders are created in one transaction and each one succeeds or fails
+    on its own. Orders whose idempotency key was already used are returned
+    as they were created.
+
+    **Permission**: can_order
+    """
+
+    async def create(connection: BaseDBAsyncClient):
+        stored_orders = await get_idempotent_orders(
+            [x.idempotency_key for x in item.orders],
+            token.user_id,
+            connection,
+        )
+        results = []
+        orders = []
+        pending_changes = []
+
+        for order_item in item.orders:
+            result = CreateOrdersResult(
+                idempotency_key=order_item.idempotency_key
+            )
+            results.append(result)
+            order = stored_orders.get(order_item.idempotency_key)
+
+            if order:
+                result.order = OrderModel(**await order.to_dict())
+                continue
+
+            try:
+                check_order_item(order_item, token)
+
+                # A failed order only rolls back to its own savepoint
+                async with in_transaction("default") as savepoint:
+                    order = await place_order(order_item, token, savepoint)
+                    pending_change = await get_pending_change(order, savepoint)
+            except UnicornException as e:
+                result.error = True
+                result.code = (
+                    e.code.value
+                    if e.code
+                    else ErrorCodes.GENERIC_HTTP_EXCEPTION.value
+                )
+                continue
+            except IntegrityError:
+                # A concurrent upload holds the same key, the order is
+                # returned on the next retry
+                result.error = True
+                result.code = ErrorCodes.REQUEST_VALIDATION_ERROR.value
+                continue
+
+            if order_item.idempotency_key:
+                stored_orders[order_item.idempotency_key] = order
+
+            result.order = OrderModel(**await order.to_dict())
+            orders.append(order)
+
+            if pending_change:
+                pending_changes.append(pending_change)
+
+        return results, orders, pending_changes
+
+    results, orders, pending_changes = await run_in_transaction(
+        "create_orders", create
+    )
+
+    for order in orders:
+        Session.print_manager.notify(order.id)
+
+    publish(*pending_changes)
+    await share_changes(PendingEvent.CREATED, *(x.id for x in orders))
+
+    return CreateOrdersResponse(results=results)
@@ -5,6 +5,13 @@ from backend.database.models import Order
 from backend.decorators import check_role
 from backend.models import BaseResponse
 from backend.models.error import NotFound
+from backend.services.pending_stream import (
+    PendingEvent,
+    get_pending_change,
+    publish,
+    share_changes,
+)
+from backend.services.statistics import remove_order_statistics
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
 
 delete_order_router = APIRouter()
@@ -21,13 +28,33 @@ async def delete_order(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        order = await Order.get_or_none(id=order_id, using_db=connection)
+    async with in_transaction("default") as connection:
+        # Locked until the commit, so a concurrent delete or serve sees
+        # the order as left by this one
+        order = (
+            await Order.filter(id=order_id)
+            .select_for_update()
+            .using_db(connection)
+            .first()
+        )
 
         if not order:
             raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
 
+        pending_change = None
+        was_deleted = order.is_deleted
+
+        if not was_deleted:
+            pending_change = await get_pending_change(order, connection)
+            await remove_order_statistics(order.id, connection)
+
         order.is_deleted = True
         await order.save(using_db=connection)
 
+    if pending_change:
+        publish(pending_change.negate())
+
+    if not was_deleted:
+        await share_changes(PendingEvent.DELETED, order.id)
+
     return BaseResponse()
@@ -1,11 +1,17 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Order
 from backend.decorators import check_role
 from backend.models.error import Unauthorized, NotFound
 from backend.models.orders import GetOrderResponse
+from backend.services.serializers import (
+    BASE_RESPONSE,
+    json_response,
+    serialize_order,
+)
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.prefetch_utils import ORDER_PREFETCH_PLAN, plan_prefetch
+from backend.utils.transaction_utils import get_read_connection
 
 get_order_router = APIRouter()
 
@@ -55,61 +61,43 @@ async def get_order(
         ):
             raise Unauthorized(code=ErrorCodes.ADMIN_OPTION_REQUIRED)
 
-    async with in_transaction() as connection:
-        order = (
-            await Order.filter(id=order_id)
-            .prefetch_related(
-                "order_menus__order_menu_fields__order_menu_field_products",
-                "order_menus__order_menu_fields__order_menu_field_products__order_product_ingredients",
-                "order_menus__menu__dates",
-                "order_menus__menu__menu_fields",
-                "order_menus__menu__menu_fields__field_products",
-                "order_menus__menu__menu_fields__field_products__product__dates",
-                "order_menus__menu__menu_fields__field_products__product__ingredients",
-                "order_menus__menu__menu_fields__field_products__product__roles",
-                "order_menus__menu__menu_fields__field_products__product__variants",
-                "order_menus__menu__roles",
-                "order_products__order_product_ingredients",
-                "order_products__product__dates",
-                "order_products__product__ingredients",
-                "order_products__product__roles",
-                "order_products__product__variants",
-                "user",
-                "confirmed_by",
-            )
-            .using_db(connection)
-            .first()
-        )
+    include = {
+        "include_menus": include_menus,
+        "include_menus_menu": include_menus_menu,
+        "include_menus_menu_dates": include_menus_menu_dates,
+        "include_menus_menu_fields": include_menus_menu_fields,
+        "include_menus_menu_fields_products": include_menus_menu_fields_products,
+        "include_menus_menu_fields_products_dates": include_menus_menu_fields_products_dates,
+        "include_menus_menu_fields_products_ingredients": include_menus_menu_fields_products_ingredients,
+        "include_menus_menu_fields_products_roles": include_menus_menu_fields_products_roles,
+        "include_menus_menu_fields_products_variants": include_menus_menu_fields_products_variants,
+        "include_menus_menu_roles": include_menus_menu_roles,
+        "include_menus_fields": include_menus_fields,
+        "include_menus_fields_products": include_menus_fields_products,
+        "include_menus_fields_products_ingredients": include_menus_fields_products_ingredients,
+        "include_products": include_products,
+        "include_products_product": include_products_product,
+        "include_products_product_dates": include_products_product_dates,
+        "include_products_product_ingredients": include_products_product_ingredients,
+        "include_products_product_roles": include_products_product_roles,
+        "include_products_product_variants": include_products_product_variants,
+        "include_products_ingredients": include_products_ingredients,
+        "include_user": include_user,
+        "include_confirmer_user": include_confirmer_user,
+    }
 
-        if not order:
-            raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
+    connection = get_read_connection()
+    order = (
+        await Order.filter(id=order_id)
+        .prefetch_related(*plan_prefetch(ORDER_PREFETCH_PLAN, include))
+        .using_db(connection)
+        .first()
+    )
 
-        if order.is_deleted:
-            raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
+    if not order:
+        raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
 
-    return GetOrderResponse(
-        **await order.to_dict(
-            include_menus,
-            include_menus_menu,
-            include_menus_menu_dates,
-            include_menus_menu_fields,
-            include_menus_menu_fields_products,
-            include_menus_menu_fields_products_dates,
-            include_menus_menu_fields_products_ingredients,
-            include_menus_menu_fields_products_roles,
-            include_menus_menu_fields_products_variants,
-            include_menus_menu_roles,
-            include_menus_fields,
-            include_menus_fields_products,
-            include_menus_fields_products_ingredients,
-            include_products,
-            include_products_product,
-            include_products_product_dates,
-            include_products_product_ingredients,
-            include_products_product_roles,
-            include_products_product_variants,
-            include_products_ingredients,
-            include_user,
-            include_confirmer_user,
-        )
-    )
+    if order.is_deleted:
+        raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
+
+    return json_response({**serialize_order(order, include), **BASE_RESPONSE})
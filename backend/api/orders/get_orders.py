@@ -1,24 +1,73 @@
 from fastapi import APIRouter, Depends
-from tortoise.exceptions import ParamsError
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
 from tortoise.expressions import Q
-from tortoise.transactions import in_transaction
 
+from backend.config import Session
 from backend.database.models import Order
 from backend.decorators import check_role
-from backend.models.error import BadRequest, Unauthorized
-from backend.models.orders import GetOrdersResponse, Order as OrderModel
+from backend.models.error import BadRequest, Unauthorized, UnprocessableEntity
+from backend.models.orders import GetOrdersResponse
+from backend.services.serializers import (
+    BASE_RESPONSE,
+    json_response,
+    serialize_order,
+)
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
-from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.prefetch_utils import ORDER_PREFETCH_PLAN, plan_prefetch
+from backend.utils.query_utils import (
+    after_filter,
+    cursor_filter,
+    encode_cursor,
+    paginate,
+    process_query_with_pagination,
+)
+from backend.utils.transaction_utils import get_read_connection
+
+EXPORT_CHUNK_SIZE = 200
+# Seconds of replica lag the listing and the export tolerate
+MAX_STALENESS = 5
+EXPORT_MAX_STALENESS = 30
 
 get_orders_router = APIRouter()
 
 
+async def _export_orders(orders_filter: Q, include: dict[str, bool]):
+    last_filter = Q()
+
+    while True:
+        connection = get_read_connection(EXPORT_MAX_STALENESS)
+        orders = (
+            await Order.filter(orders_filter & last_filter)
+            .order_by("created_at", "id")
+            .limit(EXPORT_CHUNK_SIZE)
+            .prefetch_related(*plan_prefetch(ORDER_PREFETCH_PLAN, include))
+            .using_db(connection)
+        )
+
+        if not orders:
+            return
+
+        yield b"".join(
+            to_json(serialize_order(order, include)) + b"\n"
+            for order in orders
+        )
+
+        if len(orders) < EXPORT_CHUNK_SIZE:
+            return
+
+        last_filter = after_filter(orders[-1].created_at, orders[-1].id)
+
+
 @get_orders_router.get("/", response_model=GetOrdersResponse)
 @check_role(Permission.CAN_ADMINISTER)
 async def get_orders(
     offset: int = 0,
-    limit: int | None = None,
+    limit: int = Session.config.DEFAULT_LIMIT_VALUE,
     order_by: str = None,
+    cursor: str | None = None,
+    include_total_count: bool = True,
+    export: bool = False,
     include_menus: bool = False,
     include_menus_menu: bool = False,
     include_menus_menu_dates: bool = False,
@@ -46,6 +95,11 @@ async def get_orders(
     """
     Get list of orders.
 
+    A page has at most `limit` orders. Without order_by, orders are sorted
+    by creation and a full page has a `next_cursor` to pass as `cursor`
+    for the following page. With `export`, every order after the cursor
+    is streamed as NDJSON.
+
     **Permission**: can_administer
     """
 
@@ -60,67 +114,80 @@ async def get_orders(
         ):
             raise Unauthorized(code=ErrorCodes.ADMIN_OPTION_REQUIRED)
 
-    async with in_transaction() as connection:
-        orders_query, total_count, limit = await process_query_with_pagination(
-            Order, Q(is_deleted=False), connection, offset, limit, order_by
+    if order_by and (cursor or export):
+        raise UnprocessableEntity(code=ErrorCodes.REQUEST_VALIDATION_ERROR)
+
+    include = {
+        "include_menus": include_menus,
+        "include_menus_menu": include_menus_menu,
+        "include_menus_menu_dates": include_menus_menu_dates,
+        "include_menus_menu_fields": include_menus_menu_fields,
+        "include_menus_menu_fields_products": include_menus_menu_fields_products,
+        "include_menus_menu_fields_products_dates": include_menus_menu_fields_products_dates,
+        "include_menus_menu_fields_products_ingredients": include_menus_menu_fields_products_ingredients,
+        "include_menus_menu_fields_products_roles": include_menus_menu_fields_products_roles,
+        "include_menus_menu_fields_products_variants": include_menus_menu_fields_products_variants,
+        "include_menus_menu_roles": include_menus_menu_roles,
+        "include_menus_fields": include_menus_fields,
+        "include_menus_fields_products": include_menus_fields_products,
+        "include_menus_fields_products_ingredients": include_menus_fields_products_ingredients,
+        "include_products": include_products,
+        "include_products_product": include_products_product,
+        "include_products_product_dates": include_products_product_dates,
+        "include_products_product_ingredients": include_products_product_ingredients,
+        "include_products_product_roles": include_products_product_roles,
+        "include_products_product_variants": include_products_product_variants,
+        "include_products_ingredients": include_products_ingredients,
+        "include_user": include_user,
+        "include_confirmer_user": include_confirmer_user,
+    }
+    orders_filter = Q(is_deleted=False)
+    next_filter = cursor_filter(cursor) if cursor else Q()
+
+    if export:
+        return StreamingResponse(
+            _export_orders(orders_filter & next_filter, include),
+            media_type="application/x-ndjson",
         )
 
-        try:
-            orders = (
-                await orders_query.prefetch_related(
-                    "order_menus__order_menu_fields__order_menu_field_products",
-                    "order_menus__order_menu_fields__order_menu_field_products__order_product_ingredients",
-                    "order_menus__menu__dates",
-                    "order_menus__menu__menu_fields",
-                    "order_menus__menu__menu_fields__field_products",
-                    "order_menus__menu__menu_fields__field_products__product__dates",
-                    "order_menus__menu__menu_fields__field_products__product__ingredients",
-                    "order_menus__menu__menu_fields__field_products__product__roles",
-                    "order_menus__menu__menu_fields__field_products__product__variants",
-                    "order_menus__menu__roles",
-                    "order_products__order_product_ingredients",
-                    "order_products__product__dates",
-                    "order_products__product__ingredients",
-                    "order_products__product__roles",
-                    "order_products__product__variants",
-                    "user",
-                    "confirmed_by",
-                )
-                .offset(offset)
-                .limit(limit)
-            )
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
-
-    return GetOrdersResponse(
-        total_count=total_count,
-        orders=[
-            OrderModel(
-                **await order.to_dict(
-                    include_menus,
-                    include_menus_menu,
-                    include_menus_menu_dates,
-                    include_menus_menu_fields,
-                    include_menus_menu_fields_products,
-                    include_menus_menu_fields_products_dates,
-                    include_menus_menu_fields_products_ingredients,
-                    include_menus_menu_fields_products_roles,
-                    include_menus_menu_fields_products_variants,
-                    include_menus_menu_roles,
-                    include_menus_fields,
-                    include_menus_fields_products,
-                    include_menus_fields_products_ingredients,
-                    include_products,
-                    include_products_product,
-                    include_products_product_dates,
-                    include_products_product_ingredients,
-                    include_products_product_roles,
-                    include_products_product_variants,
-                    include_products_ingredients,
-                    include_user,
-                    include_confirmer_user,
-                )
-            )
-            for order in orders
-        ],
+    # The listing is never read whole, only the export is
+    if limit < 1:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+
+    connection = get_read_connection(MAX_STALENESS)
+    orders_query, total_count, limit = await process_query_with_pagination(
+        Order,
+        orders_filter,
+        connection,
+        offset,
+        limit,
+        order_by,
+        include_total_count=include_total_count,
+    )
+
+    # A cursor comes without order_by, rejected above otherwise
+    orders_query = orders_query.filter(next_filter)
+
+    if not order_by:
+        orders_query = orders_query.order_by("created_at", "id")
+
+    # One order more than the page tells whether another page follows
+    orders_query = paginate(orders_query, offset, limit + 1)
+    orders = await orders_query.prefetch_related(
+        *plan_prefetch(ORDER_PREFETCH_PLAN, include)
+    )
+    has_next_page = len(orders) > limit
+    orders = orders[:limit]
+
+    next_cursor = None
+    if not order_by and has_next_page:
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
+
+    return json_response(
+        {
+            **BASE_RESPONSE,
+            "total_count": total_count,
+            "next_cursor": next_cursor,
+            "orders": [serialize_order(order, include) for order in orders],
+        }
     )
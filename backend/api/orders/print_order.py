@@ -8,6 +8,7 @@ from backend.models.error import NotFound
 from backend.models import BaseResponse
 from backend.models.orders import PrintOrderItem
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.print_manager import ORDER_PREFETCH_VALUES
 
 print_order_router = APIRouter()
 
@@ -25,19 +26,10 @@ async def print_order(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         order = (
             await Order.filter(id=order_id)
-            .prefetch_related(
-                "order_menus__order_menu_fields__order_menu_field_products__order_product_ingredients__product_ingredient",
-                "order_menus__menu",
-                "order_products__order_product_ingredients__product_ingredient",
-                "order_products__variant",
-                "user__role__printers__printer",
-                "user__role__order_confirmer__printers__printer",
-                "order_printers__role_printer__printer",
-                "confirmed_by__role__printers__printer",
-            )
+            .prefetch_related(*ORDER_PREFETCH_VALUES)
             .using_db(connection)
             .first()
         )
@@ -5,6 +5,13 @@ from backend.database.models import Order
 from backend.decorators import check_role
 from backend.models import BaseResponse
 from backend.models.error import Unauthorized, NotFound
+from backend.services.pending_stream import (
+    PendingEvent,
+    get_pending_change,
+    publish,
+    share_changes,
+)
+from backend.services.statistics import serve_order_statistics
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
 
 serve_order_router = APIRouter()
@@ -22,8 +29,15 @@ async def serve_order(
     **Permission**: can_serve_orders
     """
 
-    async with in_transaction() as connection:
-        order = await Order.filter(id=order_id).using_db(connection).first()
+    async with in_transaction("default") as connection:
+        # Locked until the commit, so a concurrent serve or delete sees
+        # the order as left by this one
+        order = (
+            await Order.filter(id=order_id)
+            .select_for_update()
+            .using_db(connection)
+            .first()
+        )
 
         if not order:
             raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
@@ -34,8 +48,16 @@ async def serve_order(
         if not order.is_done or order.is_deleted:
             raise Unauthorized(code=ErrorCodes.NOT_ALLOWED)
 
+        pending_change = await get_pending_change(order, connection)
+        await serve_order_statistics(order.id, connection)
+
         order.is_served = True
 
         await order.save(using_db=connection)
 
+    if pending_change:
+        publish(pending_change.negate(only_items=True))
+
+    await share_changes(PendingEvent.SERVED, order.id)
+
     return BaseResponse()
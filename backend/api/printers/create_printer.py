@@ -28,7 +28,7 @@ async def create_printer(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         new_printer = Printer(name=item.name, ip_address=item.ip_address)
 
         try:
@@ -37,7 +37,9 @@ async def create_printer(
         except IntegrityError:
             raise Conflict(code=ErrorCodes.PRINTER_ALREADY_EXISTS)
 
-    Session.print_manager.add_printer(new_printer.id, new_printer.ip_address)
+    await Session.print_manager.update_printer(
+        new_printer.id, new_printer.ip_address
+    )
 
     return CreatePrinterResponse(
         printer=PrinterModel(**await new_printer.to_dict())
@@ -21,7 +21,7 @@ async def delete_printer(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         printer = await Printer.get_or_none(id=printer_id, using_db=connection)
 
         if not printer:
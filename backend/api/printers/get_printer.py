@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Printer
 from backend.decorators import check_role
 from backend.models.error import NotFound
 from backend.models.printers import GetPrinterResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import get_read_connection
 
 get_printer_router = APIRouter()
 
@@ -21,10 +21,10 @@ async def get_printer(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        printer = await Printer.get_or_none(id=printer_id, using_db=connection)
+    connection = get_read_connection()
+    printer = await Printer.get_or_none(id=printer_id, using_db=connection)
 
-        if not printer:
-            raise NotFound(code=ErrorCodes.PRINTER_NOT_FOUND)
+    if not printer:
+        raise NotFound(code=ErrorCodes.PRINTER_NOT_FOUND)
 
     return GetPrinterResponse(**await printer.to_dict())
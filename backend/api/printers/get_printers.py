@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from tortoise.exceptions import ParamsError
 from tortoise.expressions import Q
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Printer
 from backend.decorators import check_role
@@ -13,6 +12,7 @@ from backend.models.printers import (
 )
 from backend.utils import Permission, TokenJwt, validate_token, ErrorCodes
 from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.transaction_utils import get_read_connection
 
 get_printers_router = APIRouter()
 
@@ -32,19 +32,19 @@ async def get_printers(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        (
-            printer_query,
-            total_count,
-            limit,
-        ) = await process_query_with_pagination(
-            Printer, Q(), connection, offset, limit, order_by
-        )
-
-        try:
-            printers = await printer_query.offset(offset).limit(limit)
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+    connection = get_read_connection()
+    (
+        printer_query,
+        total_count,
+        limit,
+    ) = await process_query_with_pagination(
+        Printer, Q(), connection, offset, limit, order_by
+    )
+
+    try:
+        printers = await printer_query.offset(offset).limit(limit)
+    except ParamsError:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
 
     return GetPrintersResponse(
         total_count=total_count,
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
+from backend.config import Session
 from backend.database.models import Printer
 from backend.decorators import check_role
 from backend.models import BaseResponse
@@ -27,7 +28,7 @@ async def update_printer_ip_address(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         printer = await Printer.get_or_none(id=printer_id, using_db=connection)
 
         if not printer:
@@ -41,4 +42,6 @@ async def update_printer_ip_address(
         except IntegrityError:
             raise Conflict(code=ErrorCodes.PRINTER_ALREADY_EXISTS)
 
+    await Session.print_manager.update_printer(printer.id, printer.ip_address)
+
     return BaseResponse()
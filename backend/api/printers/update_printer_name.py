@@ -27,7 +27,7 @@ async def update_printer_name(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         printer = await Printer.get_or_none(id=printer_id, using_db=connection)
 
         if not printer:
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product, ProductIngredient
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound
 from backend.models.products import (
     AddProductIngredientItem,
@@ -18,6 +18,7 @@ add_product_ingredient_router = APIRouter()
     "/{product_id}/ingredient", response_model=AddProductIngredientResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def add_product_ingredient(
     product_id: int,
     item: AddProductIngredientItem,
@@ -29,7 +30,7 @@ async def add_product_ingredient(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
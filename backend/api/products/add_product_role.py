@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product, ProductRole, Role
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound, Unauthorized
 from backend.models.products import AddProductRoleItem, AddProductRoleResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -15,6 +15,7 @@ add_product_role_router = APIRouter()
     "/{product_id}/role", response_model=AddProductRoleResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def add_product_role(
     product_id: int,
     item: AddProductRoleItem,
@@ -26,7 +27,7 @@ async def add_product_role(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
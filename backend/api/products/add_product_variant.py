@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product, ProductVariant
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound
 from backend.models.products import (
     AddProductVariantItem,
@@ -18,6 +18,7 @@ add_product_variant_router = APIRouter()
     "/{product_id}/variant", response_model=AddProductVariantResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def add_product_variant(
     product_id: int,
     item: AddProductVariantItem,
@@ -29,7 +30,7 @@ async def add_product_variant(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
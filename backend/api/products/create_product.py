@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product, Subcategory
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict, NotFound
 from backend.models.products import CreateProductItem, CreateProductResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -13,6 +13,7 @@ create_product_router = APIRouter()
 
 @create_product_router.post("/", response_model=CreateProductResponse)
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def create_product(
     item: CreateProductItem,
     token: TokenJwt = Depends(validate_token),
@@ -23,7 +24,7 @@ async def create_product(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         subcategory = await Subcategory.get_or_none(
             id=item.subcategory_id, using_db=connection
         )
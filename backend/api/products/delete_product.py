@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -12,6 +12,7 @@ delete_product_router = APIRouter()
 
 @delete_product_router.delete("/{product_id}", response_model=BaseResponse)
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def delete_product(
     product_id: int, token: TokenJwt = Depends(validate_token)
 ):
@@ -21,7 +22,7 @@ async def delete_product(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
@@ -1,26 +1,30 @@
-from fastapi import APIRouter, Depends
-from tortoise.exceptions import ParamsError
+from fastapi import APIRouter, Depends, Request
 from tortoise.expressions import Q
-from tortoise.query_utils import Prefetch
-from tortoise.transactions import in_transaction
 
-from backend.database.models import Product, ProductIngredient, ProductVariant
-from backend.models.error import BadRequest
+from backend.database.models import Product
+from backend.decorators import cache_catalog
 from backend.models.products import (
     GetProductsResponse,
     Product as ProductModel,
     ProductName,
 )
 from backend.services.orders import get_today_quantities
-from backend.utils import ErrorCodes, TokenJwt, validate_token
+from backend.utils import TokenJwt, validate_token
+from backend.utils.prefetch_utils import PRODUCT_PREFETCH_PLAN, plan_prefetch
 from backend.utils.query_filters import build_multiple_query_filter
-from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.query_utils import (
+    paginate,
+    process_query_with_pagination,
+)
+from backend.utils.transaction_utils import get_read_connection
 
 get_products_router = APIRouter()
 
 
 @get_products_router.get("/", response_model=GetProductsResponse)
+@cache_catalog
 async def get_products(
+    request: Request,
     offset: int = 0,
     limit: int | None = None,
     only_name: bool = False,
@@ -36,68 +40,58 @@ async def get_products(
     Get list of products.
     """
 
-    async with in_transaction() as connection:
-        products_query_filter = build_multiple_query_filter(
-            token, include_dates, include_roles
-        )
+    include = {
+        "include_dates": include_dates,
+        "include_ingredients": include_ingredients,
+        "include_roles": include_roles,
+        "include_variants": include_variants,
+    }
 
-        if subcategory_id:
-            products_query_filter &= Q(subcategory_id=subcategory_id)
+    connection = get_read_connection()
+    products_query_filter = build_multiple_query_filter(
+        token, include_dates, include_roles
+    )
 
-        (products_query, _, limit,) = await process_query_with_pagination(
-            Product,
-            products_query_filter,
-            connection,
-            offset,
-            limit,
-            order_by,
-        )
+    if subcategory_id:
+        products_query_filter &= Q(subcategory_id=subcategory_id)
 
-        try:
-            products = (
-                await products_query.prefetch_related(
-                    "dates",
-                    "roles",
-                    Prefetch(
-                        "ingredients",
-                        queryset=ProductIngredient.filter(is_deleted=False),
-                    ),
-                    Prefetch(
-                        "variants",
-                        queryset=ProductVariant.filter(is_deleted=False),
-                    ),
-                )
-                .offset(offset)
-                .limit(limit)
-            )
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+    (
+        products_query,
+        _,
+        limit,
+    ) = await process_query_with_pagination(
+        Product,
+        products_query_filter,
+        connection,
+        offset,
+        limit,
+        order_by,
+        include_total_count=False,
+    )
 
-        if not token.permissions["can_administer"]:
-            product_ids = {p.id for p in products if p.daily_max_sales}
-            today_quantities = await get_today_quantities(
-                product_ids, connection
-            )
+    products_query = paginate(products_query, offset, limit)
+    products = await products_query.prefetch_related(
+        *plan_prefetch(PRODUCT_PREFETCH_PLAN, include if not only_name else {})
+    )
+
+    if not token.permissions["can_administer"]:
+        product_ids = {p.id for p in products if p.daily_max_sales}
+        today_quantities = await get_today_quantities(product_ids, connection)
 
-            products = [
-                p
-                for p in products
-                if not p.daily_max_sales
-                or today_quantities.get(p.id, 0) < p.daily_max_sales
-            ]
+        products = [
+            p
+            for p in products
+            if not p.daily_max_sales
+            or today_quantities.get(p.id, 0) < p.daily_max_sales
+        ]
 
     return GetProductsResponse(
         total_count=len(products),
         products=[
-            ProductName(**await product.to_dict_name())
-            if only_name
-            else ProductModel(
-                **await product.to_dict(
-                    include_dates,
-                    include_ingredients,
-                    include_roles,
-                    include_variants,
-                )
+            (
+                ProductName(**await product.to_dict_name())
+                if only_name
+                else ProductModel(**await product.to_dict(**include))
             )
             for product in products
         ],
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import Conflict, NotFound
 from backend.models.products import UpdateProductDailyMaxSalesItem
@@ -16,6 +16,7 @@ update_product_daily_max_sales_router = APIRouter()
     "/{product_id}/daily_max_sales", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_product_daily_max_sales(
     product_id: int,
     item: UpdateProductDailyMaxSalesItem,
@@ -27,7 +28,7 @@ async def update_product_daily_max_sales(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
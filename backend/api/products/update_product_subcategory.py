@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Product, Subcategory
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.models.products import UpdateProductSubcategoryItem
@@ -15,6 +15,7 @@ update_product_subcategory_router = APIRouter()
     "/{product_id}/subcategory", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_product_subcategory(
     product_id: int,
     item: UpdateProductSubcategoryItem,
@@ -26,7 +27,7 @@ async def update_product_subcategory(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         product = await Product.get_or_none(id=product_id, using_db=connection)
 
         if not product:
@@ -27,7 +27,7 @@ async def create_role(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         new_role = Role(name=item.name)
 
         try:
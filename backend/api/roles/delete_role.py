@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
+from backend.config import Session
 from backend.database.models import Role
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound, Unauthorized
+from backend.services.permissions import invalidate_role_permissions
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
 
 delete_role_router = APIRouter()
@@ -12,6 +14,7 @@ delete_role_router = APIRouter()
 
 @delete_role_router.delete("/{role_id}", response_model=BaseResponse)
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def delete_role(role_id: int, token: TokenJwt = Depends(validate_token)):
     """
     Delete a role from the id.
@@ -19,7 +22,7 @@ async def delete_role(role_id: int, token: TokenJwt = Depends(validate_token)):
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         role = await Role.get_or_none(id=role_id, using_db=connection)
 
         if not role:
@@ -33,4 +36,7 @@ async def delete_role(role_id: int, token: TokenJwt = Depends(validate_token)):
 
         await role.delete(using_db=connection)
 
+    invalidate_role_permissions(role_id)
+    await Session.cluster.publish("roles", role_id=role_id)
+
     return BaseResponse()
@@ -25,7 +25,7 @@ async def delete_role_table(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         role = await Role.get_or_none(id=role_id, using_db=connection)
 
         if not role:
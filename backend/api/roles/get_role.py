@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Role
 from backend.decorators import check_role
 from backend.models.error import NotFound
 from backend.models.roles import GetRoleResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import get_read_connection
 
 get_role_router = APIRouter()
 
@@ -25,13 +25,13 @@ async def get_role(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        role = await Role.get_or_none(
-            id=role_id, using_db=connection
-        ).prefetch_related("printers", "order_confirmer", "tables")
+    connection = get_read_connection()
+    role = await Role.get_or_none(
+        id=role_id, using_db=connection
+    ).prefetch_related("printers", "order_confirmer", "tables")
 
-        if not role:
-            raise NotFound(code=ErrorCodes.ROLE_NOT_FOUND)
+    if not role:
+        raise NotFound(code=ErrorCodes.ROLE_NOT_FOUND)
 
     return GetRoleResponse(
         **await role.to_dict(
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from tortoise.exceptions import ParamsError
 from tortoise.expressions import Q
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Role
 from backend.decorators import check_role
@@ -9,6 +8,10 @@ from backend.models.error import BadRequest
 from backend.models.roles import GetRolesResponse, Role as RoleModel, RoleName
 from backend.utils import Permission, TokenJwt, validate_token, ErrorCodes
 from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.transaction_utils import get_read_connection
+
+# Seconds of replica lag the listing tolerates
+MAX_STALENESS = 5
 
 get_roles_router = APIRouter()
 
@@ -36,29 +39,29 @@ async def get_roles(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        query = ~Q(id=token.role_id)
+    connection = get_read_connection(MAX_STALENESS)
+    query = ~Q(id=token.role_id)
 
-        if can_order is not None:
-            query &= Q(can_order=can_order)
+    if can_order is not None:
+        query &= Q(can_order=can_order)
 
-        if can_confirm_orders is not None:
-            query &= Q(can_confirm_orders=can_confirm_orders)
+    if can_confirm_orders is not None:
+        query &= Q(can_confirm_orders=can_confirm_orders)
 
-        roles_query, total_count, limit = await process_query_with_pagination(
-            Role, query, connection, offset, limit, ""
-        )
+    roles_query, total_count, limit = await process_query_with_pagination(
+        Role, query, connection, offset, limit, ""
+    )
 
-        try:
-            roles = (
-                await roles_query.prefetch_related(
-                    "printers", "order_confirmer", "tables"
-                )
-                .offset(offset)
-                .limit(limit)
+    try:
+        roles = (
+            await roles_query.prefetch_related(
+                "printers", "order_confirmer", "tables"
             )
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+            .offset(offset)
+            .limit(limit)
+        )
+    except ParamsError:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
 
     return GetRolesResponse(
         total_count=total_count,
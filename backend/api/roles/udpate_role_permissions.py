@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
+from backend.config import Session
 from backend.database.models import Role
 from backend.decorators import check_role
 from backend.models import BaseResponse
 from backend.models.error import Conflict, NotFound, Unauthorized
 from backend.models.roles import UpdateRolePermissionsItem
+from backend.services.permissions import invalidate_role_permissions
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
 
 update_role_permissions_router = APIRouter()
@@ -26,7 +28,7 @@ async def update_role_permissions(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         role = await Role.get_or_none(id=role_id, using_db=connection)
 
         if not role:
@@ -47,4 +49,7 @@ async def update_role_permissions(
         except ValueError as e:
             raise Conflict(code=e.args[0])
 
+    invalidate_role_permissions(role_id)
+    await Session.cluster.publish("roles", role_id=role_id)
+
     return BaseResponse()
@@ -1,9 +1,9 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Setting
 from backend.models.settings import GetSettingsResponse, Settings, SettingsUser
 from backend.utils import TokenJwt, validate_token
+from backend.utils.transaction_utils import get_read_connection
 
 get_settings_router = APIRouter()
 
@@ -16,8 +16,8 @@ async def get_settings(token: TokenJwt = Depends(validate_token)):
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        setting = await Setting.first(using_db=connection)
+    connection = get_read_connection()
+    setting = await Setting.first(using_db=connection)
 
     return GetSettingsResponse(
         settings=Settings(**await setting.to_dict())
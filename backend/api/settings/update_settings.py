@@ -24,11 +24,13 @@ async def update_settings(
 
     item_data = {k: v for k, v in item.model_dump().items() if v is not None}
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         setting = await Setting.first(using_db=connection)
 
         await setting.update_from_dict(item_data).save(using_db=connection)
 
         Session.settings = Session.settings.model_copy(update=item_data)
 
+    await Session.cluster.publish("settings")
+
     return BaseResponse()
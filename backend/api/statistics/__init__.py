@@ -1,13 +1,16 @@
 __all__ = (
     "get_pending_statistic_router",
     "get_statistic_router",
+    "stream_pending_statistic_router",
 )
 
 from fastapi import APIRouter
 
 from .get_pending_statistic import get_pending_statistic_router
 from .get_statistic import get_statistic_router
+from .stream_pending_statistic import stream_pending_statistic_router
 
 statistics = APIRouter(prefix="/statistics", tags=["statistics"])
 statistics.include_router(get_pending_statistic_router)
 statistics.include_router(get_statistic_router)
+statistics.include_router(stream_pending_statistic_router)
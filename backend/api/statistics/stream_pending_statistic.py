@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from backend.decorators import check_role
+from backend.models.error import UnprocessableEntity
+from backend.models.statistics import PendingStatistic
+from backend.services.pending_stream import (
+    build_pending_statistic,
+    subscribe,
+    unsubscribe,
+)
+from backend.services.statistics import get_pending_summary
+from backend.utils import Permission, TokenJwt, validate_token, ErrorCodes
+from backend.utils.costants import ROLE_ID_REGEX
+from backend.utils.datetime_utils import get_day_bounds
+from backend.utils.transaction_utils import get_read_connection
+
+KEEPALIVE_INTERVAL = 15
+# A change committed while a snapshot is read may be counted twice, a
+# periodic snapshot bounds how long such a drift lasts
+RESYNC_INTERVAL = 300
+
+stream_pending_statistic_router = APIRouter()
+
+
+def _format_event(event: str, statistic: PendingStatistic) -> str:
+    return f"event: {event}\ndata: {statistic.model_dump_json()}\n\n"
+
+
+async def _stream_events(
+    role_ids: list[int] | None, only_confirmed: bool, only_priority: bool
+):
+    subscription = subscribe(role_ids, only_confirmed, only_priority)
+
+    try:
+        while True:
+            subscription.reset()
+
+            connection = get_read_connection()
+            summary = await get_pending_summary(
+                role_ids, only_confirmed, only_priority, connection
+            )
+
+            yield _format_event("snapshot", build_pending_statistic(summary))
+
+            resync_at = time.monotonic() + RESYNC_INTERVAL
+
+            while (
+                not subscription.is_stale
+                and time.monotonic() < resync_at
+                and subscription.day_bounds == get_day_bounds()
+            ):
+                try:
+                    changes = [
+                        await asyncio.wait_for(
+                            subscription.changes.get(), KEEPALIVE_INTERVAL
+                        )
+                    ]
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                while not subscription.changes.empty():
+                    changes.append(subscription.changes.get_nowait())
+
+                delta = build_pending_statistic(
+                    subscription.merge(changes), skip_unchanged=True
+                )
+
+                if (
+                    delta.total_orders
+                    or delta.total_seated
+                    or delta.total_take_away
+                    or delta.products
+                ):
+                    yield _format_event("delta", delta)
+    finally:
+        unsubscribe(subscription)
+
+
+@stream_pending_statistic_router.get("/pending/stream")
+@check_role(Permission.CAN_STATISTICS, Permission.CAN_PRIORITY_STATISTICS)
+async def stream_pending_statistic(
+    role_ids: str | None = None,
+    only_confirmed_order: bool = False,
+    token: TokenJwt = Depends(validate_token),
+):
+    """
+    Stream the pending statistic as Server-Sent Events.
+
+    A `snapshot` event carries the whole pending statistic, then `delta`
+    events carry the changes of the totals and of the pending quantities.
+    A new snapshot is sent at the start of each day and periodically.
+
+    **Permission**: can_statistics || can_priority_statistics
+    """
+
+    if role_ids:
+        if not ROLE_ID_REGEX.fullmatch(role_ids):
+            raise UnprocessableEntity(code=ErrorCodes.REQUEST_VALIDATION_ERROR)
+
+        role_ids = list(map(int, role_ids.split(",")))
+
+    return StreamingResponse(
+        _stream_events(
+            role_ids,
+            only_confirmed_order,
+            token.permissions["can_priority_statistics"],
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Subcategory
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models.error import Conflict
 from backend.models.subcategories import (
     CreateSubcategoryItem,
@@ -16,6 +16,7 @@ create_subcategory_router = APIRouter()
 
 @create_subcategory_router.post("/", response_model=CreateSubcategoryResponse)
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def create_subcategory(
     item: CreateSubcategoryItem,
     token: TokenJwt = Depends(validate_token),
@@ -26,7 +27,7 @@ async def create_subcategory(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         new_subcategory = Subcategory(name=item.name)
 
         try:
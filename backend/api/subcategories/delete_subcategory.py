@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Subcategory
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import NotFound
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
@@ -14,6 +14,7 @@ delete_subcategories_router = APIRouter()
     "/{subcategory_id}", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def delete_subcategory(
     subcategory_id: int, token: TokenJwt = Depends(validate_token)
 ):
@@ -23,7 +24,7 @@ async def delete_subcategory(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         subcategory = await Subcategory.get_or_none(
             id=subcategory_id, using_db=connection
         )
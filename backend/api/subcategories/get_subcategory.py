@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Subcategory
 from backend.decorators import check_role
 from backend.models.error import NotFound
 from backend.models.subcategories import GetSubcategoryResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import get_read_connection
 
 get_subcategory_router = APIRouter()
 
@@ -23,13 +23,13 @@ async def get_subcategory(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        subcategory = await Subcategory.get_or_none(
-            id=subcategory_id, using_db=connection
-        )
+    connection = get_read_connection()
+    subcategory = await Subcategory.get_or_none(
+        id=subcategory_id, using_db=connection
+    )
 
-        if not subcategory:
-            raise NotFound(code=ErrorCodes.SUBCATEGORY_NOT_FOUND)
+    if not subcategory:
+        raise NotFound(code=ErrorCodes.SUBCATEGORY_NOT_FOUND)
 
     return GetSubcategoryResponse(
         id=subcategory_id,
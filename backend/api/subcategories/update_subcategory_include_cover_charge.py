@@ -3,7 +3,7 @@ from tortoise.exceptions import IntegrityError
 from tortoise.transactions import in_transaction
 
 from backend.database.models import Subcategory
-from backend.decorators import check_role
+from backend.decorators import check_role, refresh_catalog
 from backend.models import BaseResponse
 from backend.models.error import Conflict, NotFound
 from backend.models.subcategories import (
@@ -18,6 +18,7 @@ update_subcategory_include_cover_charge_router = APIRouter()
     "/{subcategory_id}/include_cover_charge", response_model=BaseResponse
 )
 @check_role(Permission.CAN_ADMINISTER)
+@refresh_catalog
 async def update_subcategory_include_cover_charge(
     subcategory_id: int,
     item: UpdateSubcategoryIncludeCoverChargeItem,
@@ -29,7 +30,7 @@ async def update_subcategory_include_cover_charge(
      **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         subcategory = await Subcategory.get_or_none(
             id=subcategory_id, using_db=connection
         )
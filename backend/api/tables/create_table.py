@@ -27,7 +27,7 @@ async def create_table(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         new_table = Table(
             name=item.name, seat_start=item.seat_start, seat_end=item.seat_end
         )
@@ -22,7 +22,7 @@ async def delete_table(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         table = await Table.get_or_none(id=table_id, using_db=connection)
 
         if not table:
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Table
 from backend.decorators import check_role
 from backend.models.error import NotFound
 from backend.models.tables import GetTableResponse
 from backend.utils import ErrorCodes, Permission, TokenJwt, validate_token
+from backend.utils.transaction_utils import get_read_connection
 
 get_table_router = APIRouter()
 
@@ -19,10 +19,10 @@ async def get_table(table_id: int, token: TokenJwt = Depends(validate_token)):
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        table = await Table.get_or_none(id=table_id, using_db=connection)
+    connection = get_read_connection()
+    table = await Table.get_or_none(id=table_id, using_db=connection)
 
-        if not table:
-            raise NotFound(code=ErrorCodes.TABLE_NOT_FOUND)
+    if not table:
+        raise NotFound(code=ErrorCodes.TABLE_NOT_FOUND)
 
     return GetTableResponse(**await table.to_dict())
@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from tortoise.exceptions import ParamsError
 from tortoise.expressions import Q
-from tortoise.transactions import in_transaction
 
 from backend.database.models import Table
 from backend.decorators import check_role
@@ -13,6 +12,7 @@ from backend.models.tables import (
 )
 from backend.utils import Permission, TokenJwt, validate_token, ErrorCodes
 from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.transaction_utils import get_read_connection
 
 get_tables_router = APIRouter()
 
@@ -32,19 +32,19 @@ async def get_tables(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        (
-            table_query,
-            total_count,
-            limit,
-        ) = await process_query_with_pagination(
-            Table, Q(), connection, offset, limit, order_by
-        )
-
-        try:
-            tables = await table_query.offset(offset).limit(limit)
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+    connection = get_read_connection()
+    (
+        table_query,
+        total_count,
+        limit,
+    ) = await process_query_with_pagination(
+        Table, Q(), connection, offset, limit, order_by
+    )
+
+    try:
+        tables = await table_query.offset(offset).limit(limit)
+    except ParamsError:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
 
     return GetTablesResponse(
         total_count=total_count,
@@ -25,7 +25,7 @@ async def update_table_name(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         table = await Table.get_or_none(id=table_id, using_db=connection)
 
         if not table:
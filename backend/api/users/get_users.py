@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from tortoise.exceptions import ParamsError
 from tortoise.expressions import Q
-from tortoise.transactions import in_transaction
 
 from backend.config import Session
 from backend.database.models import User
@@ -10,6 +9,7 @@ from backend.models.error import BadRequest
 from backend.models.users import GetUsersResponse
 from backend.utils import Permission, TokenJwt, validate_token, ErrorCodes
 from backend.utils.query_utils import process_query_with_pagination
+from backend.utils.transaction_utils import get_read_connection
 
 get_users_router = APIRouter()
 
@@ -27,17 +27,17 @@ async def get_users(
     **Permission**: can_administer
     """
 
-    async with in_transaction() as connection:
-        query = ~Q(id=token.user_id)
+    connection = get_read_connection()
+    query = ~Q(id=token.user_id)
 
-        users_query, total_count, limit = await process_query_with_pagination(
-            User, query, connection, offset, limit, ""
-        )
+    users_query, total_count, limit = await process_query_with_pagination(
+        User, query, connection, offset, limit, ""
+    )
 
-        try:
-            users = await users_query.offset(offset).limit(limit)
-        except ParamsError:
-            raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+    try:
+        users = await users_query.offset(offset).limit(limit)
+    except ParamsError:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
 
     return GetUsersResponse(
         total_count=total_count, users=[await user.to_dict() for user in users]
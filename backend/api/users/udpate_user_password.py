@@ -25,7 +25,7 @@ async def update_user_password(
     Update password of user.
     """
 
-    async with in_transaction() as connection:
+    async with in_transaction("default") as connection:
         user = await User.get_or_none(id=user_id, using_db=connection)
 
         if not user:
@@ -9,13 +9,46 @@ class Config(BaseSettings, case_sensitive=True):
     DB_HOST: str = Field(alias="DB_HOST")
     DB_PORT: str = Field("5432", alias="DB_PORT")
     DB_NAME: str = Field(alias="DB_NAME")
+    DB_POOL_MIN_SIZE: int = Field(1, alias="DB_POOL_MIN_SIZE")
+    DB_POOL_MAX_SIZE: int = Field(20, alias="DB_POOL_MAX_SIZE")
+    # Seconds a request waits for a free connection before failing
+    DB_POOL_ACQUIRE_TIMEOUT: float = Field(10, alias="DB_POOL_ACQUIRE_TIMEOUT")
+    # Seconds after which an idle connection above the minimum is closed
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = Field(
+        300, alias="DB_POOL_MAX_INACTIVE_LIFETIME"
+    )
+    # Prepared statements kept per connection, 0 behind a pooler in
+    # transaction mode
+    DB_STATEMENT_CACHE_SIZE: int = Field(100, alias="DB_STATEMENT_CACHE_SIZE")
+    DB_MAX_CACHED_STATEMENT_LIFETIME: int = Field(
+        300, alias="DB_MAX_CACHED_STATEMENT_LIFETIME"
+    )
+    # Read replica, used when a host or a database is set. The settings
+    # not set are those of the primary
+    DB_REPLICA_HOST: str | None = Field(None, alias="DB_REPLICA_HOST")
+    DB_REPLICA_PORT: str | None = Field(None, alias="DB_REPLICA_PORT")
+    DB_REPLICA_NAME: str | None = Field(None, alias="DB_REPLICA_NAME")
+    DB_REPLICA_USERNAME: str | None = Field(None, alias="DB_REPLICA_USERNAME")
+    DB_REPLICA_PASSWORD: str | None = Field(None, alias="DB_REPLICA_PASSWORD")
 
     # Token jwt
     JWT_SECRET: str = Field(alias="JWT_SECRET")
     JWT_TOKEN_EXPIRES: int = Field(alias="JWT_TOKEN_EXPIRES")
+    # Seconds after issue during which token permissions are trusted
+    AUTH_TOKEN_TRUST_SECONDS: int = Field(0, alias="AUTH_TOKEN_TRUST_SECONDS")
 
     # Project
     APP_HOST: str = Field(alias="APP_HOST")
+    # Processes serving the API. The printers are driven by one of them,
+    # so the database must be reached without a transaction pooler
+    APP_WORKERS: int = Field(1, alias="APP_WORKERS")
     DEFAULT_LIMIT_VALUE: int = Field(100, alias="DEFAULT_LIMIT_VALUE")
+    # Bearer token of the scrapes of /metrics, the endpoint is disabled
+    # when it is not set
+    METRICS_TOKEN: str | None = Field(None, alias="METRICS_TOKEN")
+    # Directory where each worker writes its metrics, so a scrape of any
+    # worker exports those of all of them. Local to the host and emptied
+    # at startup, a temporary one is used with several workers if unset
+    METRICS_DIR: str | None = Field(None, alias="METRICS_DIR")
 
     model_config = SettingsConfigDict(env_file=".env")
@@ -8,11 +8,15 @@ from backend.config import Config
 
 if typing.TYPE_CHECKING:
     from backend.models.settings import Settings
+    from backend.services.catalog import Catalog
+    from backend.utils.cluster import Cluster
     from backend.utils.print_manager import PrintManager
 
 
 class Session:
     config: Config = None
+    catalog: Catalog
+    cluster: Cluster
     settings: Settings
     print_manager: PrintManager
     password_hasher: PasswordHasher
@@ -1,3 +1,12 @@
-__all__ = ("init_db", "stop_db")
+__all__ = (
+    "get_config",
+    "has_replica",
+    "init_db",
+    "monitor_replica",
+    "run_migrations",
+    "stop_db",
+)
 
-from .db_connect import init_db, stop_db
+from .db_connect import get_config, has_replica, init_db, stop_db
+from .migrations import run_migrations
+from .replica import monitor_replica
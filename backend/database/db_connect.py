@@ -7,29 +7,76 @@ from tortoise.contrib.fastapi import RegisterTortoise
 from backend.config import Session
 from backend.database import models
 
+REPLICA_CONNECTION = "replica"
+
 
 def is_snake_case(string):
     pattern = r"^[a-z]+(_[a-z]+)*$"
     return bool(re.match(pattern, string))
 
 
-def init_db():
+def _get_connection(
+    host: str, port: str, user: str, password: str, database: str
+) -> dict:
     conf = Session.config
-    config = {
-        "connections": {
-            "default": {
-                "engine": "tortoise.backends.asyncpg",
-                "credentials": {
-                    "host": conf.DB_HOST,
-                    "port": conf.DB_PORT,
-                    "user": conf.DB_USERNAME,
-                    "password": conf.DB_PASSWORD,
-                    "database": conf.DB_NAME,
-                    "minsize": 1,
-                    "maxsize": 20,
-                },
-            }
+
+    return {
+        "engine": "backend.database.pool",
+        "credentials": {
+            "host": host,
+            "port": port,
+            "user": user,
+            "password": password,
+            "database": database,
+            "minsize": conf.DB_POOL_MIN_SIZE,
+            "maxsize": conf.DB_POOL_MAX_SIZE,
+            "acquire_timeout": conf.DB_POOL_ACQUIRE_TIMEOUT,
+            "max_inactive_connection_lifetime": (
+                conf.DB_POOL_MAX_INACTIVE_LIFETIME
+            ),
+            "statement_cache_size": conf.DB_STATEMENT_CACHE_SIZE,
+            "max_cached_statement_lifetime": (
+                conf.DB_MAX_CACHED_STATEMENT_LIFETIME
+            ),
         },
+    }
+
+
+def has_replica() -> bool:
+    conf = Session.config
+
+    return bool(conf.DB_REPLICA_HOST or conf.DB_REPLICA_NAME)
+
+
+def get_config() -> dict:
+    conf = Session.config
+    db_connections = {
+        "default": _get_connection(
+            conf.DB_HOST,
+            conf.DB_PORT,
+            conf.DB_USERNAME,
+            conf.DB_PASSWORD,
+            conf.DB_NAME,
+        )
+    }
+
+    # Only the models of the default connection get their tables, the
+    # replica receives them from the primary
+    if has_replica():
+        db_connections[REPLICA_CONNECTION] = _get_connection(
+            conf.DB_REPLICA_HOST or conf.DB_HOST,
+            conf.DB_REPLICA_PORT or conf.DB_PORT,
+            conf.DB_REPLICA_USERNAME or conf.DB_USERNAME,
+            (
+                conf.DB_REPLICA_PASSWORD
+                if conf.DB_REPLICA_PASSWORD is not None
+                else conf.DB_PASSWORD
+            ),
+            conf.DB_REPLICA_NAME or conf.DB_NAME,
+        )
+
+    return {
+        "connections": db_connections,
         "apps": {
             "models": {
                 "models": list(
@@ -45,10 +92,13 @@ def init_db():
         "timezone": "Europe/Rome",
     }
 
+
+def init_db():
     return partial(
         RegisterTortoise,
-        config=config,
-        generate_schemas=True,
+        config=get_config(),
+        # Created with the migrations
+        generate_schemas=False,
     )
 
 
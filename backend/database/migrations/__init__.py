@@ -0,0 +1,3 @@
+__all__ = ("MIGRATIONS", "run_migrations")
+
+from .runner import MIGRATIONS, run_migrations
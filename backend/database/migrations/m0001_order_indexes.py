@@ -0,0 +1,48 @@
+"""
+Indexes for the predicates of the print sweep, the statistics, the order
+listing and the order view prefetches.
+"""
+
+STATEMENTS = (
+    # Print sweep, only the orders not printed yet are indexed
+    """
+    CREATE INDEX IF NOT EXISTS order_not_done_idx
+    ON "order" (id) WHERE NOT is_done;
+    """,
+    # Statistics windows and the cursor pagination of the order listing
+    """
+    CREATE INDEX IF NOT EXISTS order_created_at_idx
+    ON "order" (created_at, id) WHERE NOT is_deleted;
+    """,
+    # Statistics of some roles, reached through the users of the roles
+    """
+    CREATE INDEX IF NOT EXISTS order_user_id_created_at_idx
+    ON "order" (user_id, created_at) WHERE NOT is_deleted;
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS user_role_id_idx ON "user" (role_id);
+    """,
+    # Items of an order, joined to the orders of a window or of one order.
+    # The columns summed by the statistics are included, so a day of
+    # orders is read from the index alone
+    """
+    CREATE INDEX IF NOT EXISTS order_product_order_id_idx
+    ON order_product (order_id)
+    INCLUDE (product_id, order_menu_field_id, quantity, price);
+    """,
+    """
+    CREATE INDEX IF NOT EXISTS order_menu_order_id_idx
+    ON order_menu (order_id) INCLUDE (menu_id, quantity, price);
+    """,
+    # Jobs of an order, filtered by status with an IS NULL alternative
+    # that a partial index cannot serve
+    """
+    CREATE INDEX IF NOT EXISTS print_job_order_id_idx
+    ON print_job (order_id);
+    """,
+    # Jobs claimed by a printer worker, in queue order
+    """
+    CREATE INDEX IF NOT EXISTS print_job_claim_idx
+    ON print_job (printer_id, id) WHERE status <> 'printed';
+    """,
+)
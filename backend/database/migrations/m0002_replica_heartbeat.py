@@ -0,0 +1,13 @@
+"""
+Heartbeat written on the primary and read on the replica, to measure the
+replication lag.
+"""
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS replica_heartbeat (
+        id INT PRIMARY KEY,
+        beat_at TIMESTAMPTZ NOT NULL
+    );
+    """,
+)
@@ -0,0 +1,17 @@
+"""
+Version of the catalog shared by the workers, taken by the ETags of the
+catalog listings.
+"""
+
+STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS catalog_version (
+        id INT PRIMARY KEY,
+        version BIGINT NOT NULL
+    );
+    """,
+    """
+    INSERT INTO catalog_version (id, version) VALUES (1, 1)
+    ON CONFLICT (id) DO NOTHING;
+    """,
+)
@@ -0,0 +1,71 @@
+from types import ModuleType
+
+from loguru import logger
+from tortoise.transactions import in_transaction
+from tortoise.utils import generate_schema_for_client
+
+from . import (
+    m0001_order_indexes,
+    m0002_replica_heartbeat,
+    m0003_catalog_version,
+)
+
+# Applied in order, each one once. A migration is never edited after it
+# has been released, a new one is appended instead
+MIGRATIONS: tuple[ModuleType, ...] = (
+    m0001_order_indexes,
+    m0002_replica_heartbeat,
+    m0003_catalog_version,
+)
+
+# Key of the advisory lock taken while migrating, so that the processes
+# started together apply each migration once
+MIGRATIONS_LOCK_KEY = 7_214_003
+
+CREATE_MIGRATIONS_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS schema_migration (
+    name VARCHAR(64) PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+"""
+
+
+def _get_name(migration: ModuleType) -> str:
+    return migration.__name__.rsplit(".", 1)[-1]
+
+
+async def run_migrations() -> None:
+    """
+    Create the missing tables of the models and apply the migrations not
+    applied yet. Every pending migration is applied in one transaction,
+    so a failure leaves the schema as it was.
+    """
+
+    async with in_transaction("default") as connection:
+        await connection.execute_query(
+            "SELECT pg_advisory_xact_lock($1);", [MIGRATIONS_LOCK_KEY]
+        )
+        # Under the lock, the workers started together on an empty
+        # database would create the same tables
+        await generate_schema_for_client(connection, safe=True)
+        await connection.execute_script(CREATE_MIGRATIONS_TABLE_QUERY)
+
+        _, rows = await connection.execute_query(
+            "SELECT name FROM schema_migration;"
+        )
+        applied = {x["name"] for x in rows}
+
+        for migration in MIGRATIONS:
+            name = _get_name(migration)
+
+            if name in applied:
+                continue
+
+            logger.info(f"Applicazione della migrazione {name}")
+
+            for statement in migration.STATEMENTS:
+                await connection.execute_script(statement)
+
+            await connection.execute_query(
+                "INSERT INTO schema_migration (name) VALUES ($1);", [name]
+            )
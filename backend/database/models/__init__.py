@@ -1,20 +1,27 @@
 __all__ = (
     "Menu",
+    "MenuDailySale",
     "MenuDate",
     "MenuField",
     "MenuFieldProduct",
     "MenuRole",
+    "MenuStatistic",
     "Order",
     "OrderMenu",
+    "OrderIdempotencyKey",
     "OrderMenuField",
     "OrderPrinter",
     "OrderProduct",
     "OrderProductIngredient",
+    "OrderStatistic",
+    "PrintJob",
     "Printer",
     "Product",
+    "ProductDailySale",
     "ProductDate",
     "ProductIngredient",
     "ProductRole",
+    "ProductStatistic",
     "ProductVariant",
     "Role",
     "RolePrinter",
@@ -26,21 +33,28 @@ __all__ = (
 )
 
 from .menu import Menu
+from .menu_daily_sale import MenuDailySale
 from .menu_date import MenuDate
 from .menu_field import MenuField
 from .menu_field_product import MenuFieldProduct
 from .menu_role import MenuRole
+from .menu_statistic import MenuStatistic
 from .order import Order
+from .order_idempotency_key import OrderIdempotencyKey
 from .order_menu import OrderMenu
 from .order_menu_field import OrderMenuField
 from .order_printer import OrderPrinter
 from .order_product import OrderProduct
 from .order_product_ingredient import OrderProductIngredient
+from .order_statistic import OrderStatistic
+from .print_job import PrintJob
 from .printer import Printer
 from .product import Product
+from .product_daily_sale import ProductDailySale
 from .product_date import ProductDate
 from .product_ingredient import ProductIngredient
 from .product_role import ProductRole
+from .product_statistic import ProductStatistic
 from .product_variant import ProductVariant
 from .role import Role
 from .role_printer import RolePrinter
@@ -4,7 +4,13 @@ from tortoise import fields
 from tortoise.models import Model
 
 if typing.TYPE_CHECKING:
-    from backend.database.models import MenuDate, MenuField, MenuRole
+    from backend.database.models import (
+        MenuDailySale,
+        MenuDate,
+        MenuField,
+        MenuRole,
+        MenuStatistic,
+    )
 
 
 class Menu(Model):
@@ -18,9 +24,11 @@ class Menu(Model):
     price = fields.DecimalField(max_digits=10, decimal_places=2)
     daily_max_sales = fields.IntField(null=True)
 
+    daily_sales: fields.ReverseRelation["MenuDailySale"]
     dates: fields.ReverseRelation["MenuDate"]
     menu_fields: fields.ReverseRelation["MenuField"]
     roles: fields.ReverseRelation["MenuRole"]
+    statistics: fields.ReverseRelation["MenuStatistic"]
 
     class Meta:
         table = "menu"
@@ -0,0 +1,19 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class MenuDailySale(Model):
+    """
+    The MenuDailySale model
+    """
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    quantity = fields.IntField(default=0)
+    menu = fields.ForeignKeyField("models.Menu", "daily_sales")
+
+    menu_id: int
+
+    class Meta:
+        table = "menu_daily_sale"
+        unique_together = ("day", "menu_id")
@@ -0,0 +1,26 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class MenuStatistic(Model):
+    """
+    The MenuStatistic model
+    """
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    user = fields.ForeignKeyField("models.User", "menu_statistics")
+    menu = fields.ForeignKeyField("models.Menu", "statistics")
+    quantity = fields.IntField(default=0)
+    voucher_quantity = fields.IntField(default=0)
+    pending_quantity = fields.IntField(default=0)
+    total_price = fields.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    user_id: int
+    menu_id: int
+
+    class Meta:
+        table = "menu_statistic"
+        unique_together = ("day", "user_id", "menu_id")
@@ -0,0 +1,21 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class OrderIdempotencyKey(Model):
+    """
+    The OrderIdempotencyKey model
+    """
+
+    id = fields.IntField(pk=True)
+    key = fields.CharField(64)
+    user = fields.ForeignKeyField("models.User", "order_idempotency_keys")
+    order = fields.ForeignKeyField("models.Order", "idempotency_keys")
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    user_id: int
+    order_id: int
+
+    class Meta:
+        table = "order_idempotency_key"
+        unique_together = ("user_id", "key")
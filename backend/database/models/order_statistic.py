@@ -0,0 +1,25 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class OrderStatistic(Model):
+    """
+    The OrderStatistic model
+    """
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    user = fields.ForeignKeyField("models.User", "order_statistics")
+    orders = fields.IntField(default=0)
+    seated = fields.IntField(default=0)
+    take_away = fields.IntField(default=0)
+    vouchers = fields.IntField(default=0)
+    total_price = fields.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    user_id: int
+
+    class Meta:
+        table = "order_statistic"
+        unique_together = ("day", "user_id")
@@ -0,0 +1,47 @@
+from tortoise import fields
+from tortoise.models import Model
+
+from backend.utils import PrintJobStatus, PrinterType
+
+
+class PrintJob(Model):
+    """
+    The PrintJob model
+    """
+
+    id = fields.IntField(pk=True)
+    order = fields.ForeignKeyField("models.Order", "print_jobs")
+    role_printer = fields.ForeignKeyField("models.RolePrinter", "print_jobs")
+    printer = fields.ForeignKeyField("models.Printer", "print_jobs")
+    printer_type = fields.CharEnumField(PrinterType)
+    status = fields.CharEnumField(
+        PrintJobStatus, default=PrintJobStatus.QUEUED, index=True
+    )
+    attempts = fields.IntField(default=0)
+    next_retry = fields.DatetimeField(auto_now_add=True)
+    payload = fields.BinaryField()
+    last_error = fields.TextField(null=True)
+    # Null for reprints, which may be queued any number of times
+    dedupe_key = fields.CharField(32, null=True, unique=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    printed_at = fields.DatetimeField(null=True)
+
+    order_id: int
+    role_printer_id: int
+    printer_id: int
+
+    class Meta:
+        table = "print_job"
+
+    async def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "order_id": self.order_id,
+            "printer_id": self.printer_id,
+            "printer_type": self.printer_type,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_retry": self.next_retry,
+            "created_at": self.created_at,
+            "printed_at": self.printed_at,
+        }
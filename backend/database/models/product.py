@@ -7,10 +7,12 @@ from backend.utils import Category
 
 if typing.TYPE_CHECKING:
     from backend.database.models import (
+        ProductDailySale,
         ProductVariant,
         ProductRole,
         ProductDate,
         ProductIngredient,
+        ProductStatistic,
     )
 
 
@@ -31,9 +33,11 @@ class Product(Model):
 
     subcategory_id: int
 
+    daily_sales: fields.ReverseRelation["ProductDailySale"]
     dates: fields.ReverseRelation["ProductDate"]
     ingredients: fields.ReverseRelation["ProductIngredient"]
     roles: fields.ReverseRelation["ProductRole"]
+    statistics: fields.ReverseRelation["ProductStatistic"]
     variants: fields.ReverseRelation["ProductVariant"]
 
     class Meta:
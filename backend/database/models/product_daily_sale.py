@@ -0,0 +1,19 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ProductDailySale(Model):
+    """
+    The ProductDailySale model
+    """
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    quantity = fields.IntField(default=0)
+    product = fields.ForeignKeyField("models.Product", "daily_sales")
+
+    product_id: int
+
+    class Meta:
+        table = "product_daily_sale"
+        unique_together = ("day", "product_id")
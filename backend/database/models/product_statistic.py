@@ -0,0 +1,26 @@
+from tortoise import fields
+from tortoise.models import Model
+
+
+class ProductStatistic(Model):
+    """
+    The ProductStatistic model
+    """
+
+    id = fields.IntField(pk=True)
+    day = fields.DateField()
+    user = fields.ForeignKeyField("models.User", "product_statistics")
+    product = fields.ForeignKeyField("models.Product", "statistics")
+    quantity = fields.IntField(default=0)
+    voucher_quantity = fields.IntField(default=0)
+    pending_quantity = fields.IntField(default=0)
+    total_price = fields.DecimalField(
+        max_digits=12, decimal_places=2, default=0
+    )
+
+    user_id: int
+    product_id: int
+
+    class Meta:
+        table = "product_statistic"
+        unique_together = ("day", "user_id", "product_id")
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import asyncpg
+from loguru import logger
+from tortoise import connections
+from tortoise.backends.asyncpg import AsyncpgDBClient
+
+from backend.models.error import ServiceUnavailable
+from backend.utils import ErrorCodes
+from backend.utils.metrics import Counter, Gauge, Histogram
+
+pool_wait_duration = Histogram(
+    "festival_db_pool_wait_seconds",
+    "Time spent waiting for a free connection of the pool.",
+    ("connection",),
+    (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+pool_acquire_timeouts = Counter(
+    "festival_db_pool_acquire_timeouts_total",
+    "Connections not acquired within the acquire timeout.",
+    ("connection",),
+)
+pool_connections = Gauge(
+    "festival_db_pool_connections",
+    "Connections of the pool, by state.",
+    ("connection", "state"),
+)
+pool_max_connections = Gauge(
+    "festival_db_pool_max_connections",
+    "Connections the pool may open.",
+    ("connection",),
+)
+
+
+class MeteredPool:
+    """
+    asyncpg pool that bounds and records the wait for a free connection.
+    Everything else is delegated to the pool.
+    """
+
+    def __init__(
+        self, pool: asyncpg.Pool, name: str, acquire_timeout: float | None
+    ):
+        self.pool = pool
+        self.name = name
+        self.acquire_timeout = acquire_timeout
+
+    def __getattr__(self, name: str):
+        return getattr(self.pool, name)
+
+    async def acquire(self, *, timeout: float | None = None):
+        start = time.perf_counter()
+
+        try:
+            return await self.pool.acquire(
+                timeout=timeout or self.acquire_timeout
+            )
+        except asyncio.TimeoutError as e:
+            pool_acquire_timeouts.inc(self.name)
+            logger.warning(
+                f"Nessuna connessione libera per {self.name} "
+                f"dopo {time.perf_counter() - start:.1f} s"
+            )
+            raise ServiceUnavailable(
+                code=ErrorCodes.INTERNAL_ERROR_SERVER
+            ) from e
+        finally:
+            pool_wait_duration.observe(
+                self.name, value=time.perf_counter() - start
+            )
+
+
+class MeteredAsyncpgDBClient(AsyncpgDBClient):
+    async def create_pool(self, **kwargs) -> MeteredPool:
+        acquire_timeout = kwargs.pop("acquire_timeout", None)
+
+        return MeteredPool(
+            await super().create_pool(**kwargs),
+            self.connection_name,
+            acquire_timeout,
+        )
+
+
+# Engine of the connections, loaded by Tortoise from this module
+client_class = MeteredAsyncpgDBClient
+
+
+def update_pool_metrics() -> None:
+    pool_connections.clear()
+
+    for connection in connections.all():
+        pool = getattr(connection, "_pool", None)
+
+        if not isinstance(pool, MeteredPool):
+            continue
+
+        idle = pool.get_idle_size()
+        pool_connections.set(pool.name, "idle", value=idle)
+        pool_connections.set(pool.name, "busy", value=pool.get_size() - idle)
+        pool_max_connections.set(pool.name, value=pool.get_max_size())
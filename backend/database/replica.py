@@ -0,0 +1,115 @@
+import asyncio
+import dataclasses
+import time
+
+from loguru import logger
+from tortoise import connections, timezone
+
+from backend.database.db_connect import REPLICA_CONNECTION
+from backend.utils.metrics import Counter, Gauge
+
+HEARTBEAT_ID = 1
+HEARTBEAT_INTERVAL = 1
+HEARTBEAT_TIMEOUT = 2
+
+# Written with the clock of the app and read back with the same clock, so
+# the lag does not depend on the clocks of the database servers
+WRITE_HEARTBEAT_QUERY = """
+INSERT INTO replica_heartbeat (id, beat_at)
+VALUES ($1, $2)
+ON CONFLICT (id) DO UPDATE SET beat_at = excluded.beat_at;
+"""
+
+READ_HEARTBEAT_QUERY = """
+SELECT beat_at FROM replica_heartbeat WHERE id = $1;
+"""
+
+replica_lag = Gauge(
+    "festival_db_replica_lag_seconds",
+    "Age of the last heartbeat of the primary seen on the replica.",
+)
+reads = Counter(
+    "festival_db_reads_total",
+    "Reads run outside of a transaction, by connection.",
+    ("connection",),
+)
+
+
+@dataclasses.dataclass(slots=True)
+class ReplicaState:
+    # None while the lag is unknown, so the reads go to the primary
+    lag: float | None = None
+    checked_at: float = 0.0
+
+
+_state = ReplicaState()
+
+
+def _set_lag(lag: float | None):
+    # Logged on the first check and when the replica comes and goes
+    if not _state.checked_at or (lag is None) != (_state.lag is None):
+        if lag is None:
+            logger.warning("Replica non disponibile, letture sul primario")
+        else:
+            logger.info(f"Replica disponibile, ritardo {lag:.3f} s")
+
+    _state.lag = lag
+    _state.checked_at = time.monotonic()
+
+    if lag is None:
+        replica_lag.clear()
+    else:
+        replica_lag.set(value=lag)
+
+
+async def _check_replica():
+    now = timezone.now()
+
+    await connections.get("default").execute_query(
+        WRITE_HEARTBEAT_QUERY, [HEARTBEAT_ID, now]
+    )
+    _, rows = await connections.get(REPLICA_CONNECTION).execute_query(
+        READ_HEARTBEAT_QUERY, [HEARTBEAT_ID]
+    )
+
+    if not rows:
+        # No heartbeat replicated yet
+        _set_lag(None)
+        return
+
+    # A heartbeat newer than this one, written by another worker, is not
+    # a negative lag
+    _set_lag(max(0.0, (timezone.now() - rows[0]["beat_at"]).total_seconds()))
+
+
+async def monitor_replica():
+    """
+    Measure the lag of the replica every HEARTBEAT_INTERVAL seconds,
+    until cancelled.
+    """
+
+    while True:
+        try:
+            await asyncio.wait_for(_check_replica(), HEARTBEAT_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Controllo della replica fallito: {e}")
+            _set_lag(None)
+
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+
+def is_replica_fresh(max_staleness: float) -> bool:
+    """
+    Whether the data of the replica is at most max_staleness seconds
+    behind the primary. The time since the last check is counted as lag,
+    so a stalled monitor sends the reads back to the primary.
+    """
+
+    if _state.lag is None:
+        return False
+
+    elapsed = time.monotonic() - _state.checked_at
+
+    return _state.lag + elapsed <= max_staleness
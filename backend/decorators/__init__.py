@@ -1,3 +1,5 @@
-__all__ = ("check_role",)
+__all__ = ("cache_catalog", "check_role", "refresh_catalog")
 
+from .cache_catalog import cache_catalog
 from .check_role import check_role
+from .refresh_catalog import refresh_catalog
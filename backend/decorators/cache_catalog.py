@@ -0,0 +1,52 @@
+import functools
+
+from fastapi import Request, Response
+
+from backend.services.catalog_cache import (
+    get_cached_response,
+    get_catalog_key,
+    get_etag,
+    set_cached_response,
+)
+from backend.utils import TokenJwt
+
+
+def _matches_etag(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if not if_none_match:
+        return False
+
+    return any(
+        x.strip().removeprefix("W/") in (etag, "*")
+        for x in if_none_match.split(",")
+    )
+
+
+def cache_catalog(func):
+    """
+    Serve a catalog listing with an ETag of the catalog version, answering
+    304 to clients that already have it and memoizing the full response.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(request: Request, token: TokenJwt, *args, **kwargs):
+        key = await get_catalog_key(
+            request.url.path, request.query_params.multi_items(), token
+        )
+        etag = get_etag(key)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if _matches_etag(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        body = get_cached_response(key)
+
+        if body is None:
+            result = await func(request=request, token=token, *args, **kwargs)
+            body = result.model_dump_json().encode()
+            set_cached_response(key, body)
+
+        return Response(body, media_type="application/json", headers=headers)
+
+    return wrapper
@@ -1,7 +1,7 @@
 import functools
 
-from backend.database.models import Role
 from backend.models.error import Forbidden
+from backend.services.permissions import get_role_permissions, is_token_trusted
 from backend.utils import Permission, TokenJwt, ErrorCodes
 
 
@@ -9,13 +9,19 @@ def check_role(*permission: Permission):
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(token: TokenJwt, *args, **kwargs):
-            role = await Role.get_or_none(id=token.role_id)
             error = Forbidden(code=ErrorCodes.NOT_ALLOWED)
 
-            if not role:
+            if is_token_trusted(token):
+                role_permissions = {
+                    x for x, value in token.permissions.items() if value
+                }
+            else:
+                role_permissions = await get_role_permissions(token.role_id)
+
+            if role_permissions is None:
                 raise error
 
-            if not any(map(lambda x: getattr(role, x, False), permission)):
+            if not any(map(lambda x: x in role_permissions, permission)):
                 raise error
 
             return await func(token=token, *args, **kwargs)
@@ -0,0 +1,17 @@
+import functools
+
+from backend.config import Session
+from backend.services.catalog import refresh_catalog as rebuild_catalog
+
+
+def refresh_catalog(func):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        result = await func(*args, **kwargs)
+
+        await rebuild_catalog(is_changed=True)
+        await Session.cluster.publish("catalog")
+
+        return result
+
+    return wrapper
@@ -52,3 +52,8 @@ class Conflict(UnicornException):
 class UnprocessableEntity(UnicornException):
     def __init__(self, message: str = "", code: ErrorCodes = None):
         super().__init__(status.HTTP_422_UNPROCESSABLE_ENTITY, message, code)
+
+
+class ServiceUnavailable(UnicornException):
+    def __init__(self, message: str = "", code: ErrorCodes = None):
+        super().__init__(status.HTTP_503_SERVICE_UNAVAILABLE, message, code)
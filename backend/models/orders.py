@@ -99,6 +99,9 @@ class CreateOrderItem(BaseModel):
     parent_order_id: int | None = None
     products: list[CreateOrderProductItem] = Field(default=[])
     menus: list[CreateOrderMenuItem] = Field(default=[])
+    idempotency_key: str | None = Field(
+        default=None, min_length=1, max_length=64
+    )
 
     @field_validator("customer")
     @classmethod
@@ -110,12 +113,26 @@ class CreateOrderResponse(BaseResponse):
     order: Order
 
 
+class CreateOrdersItem(BaseModel):
+    orders: list[CreateOrderItem] = Field(min_length=1, max_length=100)
+
+
+class CreateOrdersResult(BaseResponse):
+    idempotency_key: str | None = None
+    order: Order | None = None
+
+
+class CreateOrdersResponse(BaseResponse):
+    results: list[CreateOrdersResult]
+
+
 class GetOrderResponse(BaseResponse, Order):
     pass
 
 
 class GetOrdersResponse(BaseResponse):
-    total_count: int
+    total_count: int | None = None
+    next_cursor: str | None = None
     orders: list[Order]
 
 
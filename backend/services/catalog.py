@@ -0,0 +1,232 @@
+import asyncio
+import dataclasses
+import datetime
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Mapping
+
+from loguru import logger
+from tortoise import connections
+
+from backend.config import Session
+from backend.database.models import Menu, Product
+from backend.database.utils import is_valid_date
+from backend.utils import Category
+
+_catalog_lock = asyncio.Lock()
+
+# The version is kept in the database, so the workers serve the same
+# ETags for a catalog and a restart does not reuse the ETags of another
+READ_VERSION_QUERY = "SELECT version FROM catalog_version WHERE id = 1;"
+BUMP_VERSION_QUERY = """
+UPDATE catalog_version SET version = version + 1 WHERE id = 1
+RETURNING version;
+"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogDate:
+    start_date: datetime.datetime
+    end_date: datetime.datetime
+
+    def is_valid(self) -> bool:
+        return is_valid_date(self.start_date, self.end_date)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogIngredient:
+    id: int
+    name: str
+    price: Decimal
+    is_deleted: bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogVariant:
+    id: int
+    name: str
+    price: Decimal
+    is_deleted: bool
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogProduct:
+    id: int
+    name: str
+    short_name: str
+    is_priority: bool
+    price: Decimal
+    category: Category
+    order: int
+    daily_max_sales: int | None
+    subcategory_id: int
+    subcategory_order: int
+    include_cover_charge: bool
+    dates: tuple[CatalogDate, ...]
+    role_ids: frozenset[int]
+    ingredients: Mapping[int, CatalogIngredient]
+    variants: Mapping[int, CatalogVariant]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogMenuFieldProduct:
+    id: int
+    price: Decimal
+    product: CatalogProduct
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogMenuField:
+    id: int
+    name: str
+    max_sortable_elements: int
+    additional_cost: float
+    is_optional: bool
+    can_exceed_max_sortable: bool
+    field_products: Mapping[int, CatalogMenuFieldProduct]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CatalogMenu:
+    id: int
+    name: str
+    short_name: str
+    price: Decimal
+    daily_max_sales: int | None
+    dates: tuple[CatalogDate, ...]
+    role_ids: frozenset[int]
+    menu_fields: Mapping[int, CatalogMenuField]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Catalog:
+    """
+    Immutable snapshot of products and menus used to validate and price
+    orders without querying the database.
+    """
+
+    version: int
+    products: Mapping[int, CatalogProduct]
+    menus: Mapping[int, CatalogMenu]
+
+
+def _build_product(product: Product) -> CatalogProduct:
+    return CatalogProduct(
+        id=product.id,
+        name=product.name,
+        short_name=product.short_name,
+        is_priority=product.is_priority,
+        price=product.price,
+        category=product.category,
+        order=product.order,
+        daily_max_sales=product.daily_max_sales,
+        subcategory_id=product.subcategory_id,
+        subcategory_order=product.subcategory.order,
+        include_cover_charge=product.subcategory.include_cover_charge,
+        dates=tuple(
+            CatalogDate(date.start_date, date.end_date)
+            for date in product.dates
+        ),
+        role_ids=frozenset(role.role_id for role in product.roles),
+        ingredients=MappingProxyType(
+            {
+                ingredient.id: CatalogIngredient(
+                    ingredient.id,
+                    ingredient.name,
+                    ingredient.price,
+                    ingredient.is_deleted,
+                )
+                for ingredient in product.ingredients
+            }
+        ),
+        variants=MappingProxyType(
+            {
+                variant.id: CatalogVariant(
+                    variant.id,
+                    variant.name,
+                    variant.price,
+                    variant.is_deleted,
+                )
+                for variant in product.variants
+            }
+        ),
+    )
+
+
+def _build_menu(
+    menu: Menu, products: Mapping[int, CatalogProduct]
+) -> CatalogMenu:
+    return CatalogMenu(
+        id=menu.id,
+        name=menu.name,
+        short_name=menu.short_name,
+        price=menu.price,
+        daily_max_sales=menu.daily_max_sales,
+        dates=tuple(
+            CatalogDate(date.start_date, date.end_date) for date in menu.dates
+        ),
+        role_ids=frozenset(role.role_id for role in menu.roles),
+        menu_fields=MappingProxyType(
+            {
+                field.id: CatalogMenuField(
+                    id=field.id,
+                    name=field.name,
+                    max_sortable_elements=field.max_sortable_elements,
+                    additional_cost=field.additional_cost,
+                    is_optional=field.is_optional,
+                    can_exceed_max_sortable=field.can_exceed_max_sortable,
+                    field_products=MappingProxyType(
+                        {
+                            field_product.product_id: CatalogMenuFieldProduct(
+                                field_product.id,
+                                field_product.price,
+                                products[field_product.product_id],
+                            )
+                            for field_product in field.field_products
+                        }
+                    ),
+                )
+                for field in menu.menu_fields
+            }
+        ),
+    )
+
+
+async def load_catalog(version: int) -> Catalog:
+    products_db = await Product.all().prefetch_related(
+        "dates", "ingredients", "roles", "variants", "subcategory"
+    )
+    menus_db = await Menu.all().prefetch_related(
+        "dates", "menu_fields__field_products", "roles"
+    )
+
+    products = MappingProxyType(
+        {product.id: _build_product(product) for product in products_db}
+    )
+    menus = MappingProxyType(
+        {menu.id: _build_menu(menu, products) for menu in menus_db}
+    )
+
+    return Catalog(version=version, products=products, menus=menus)
+
+
+async def refresh_catalog(is_changed: bool = False) -> Catalog:
+    """
+    Rebuild the catalog snapshot and publish it on the session.
+
+    Rebuilds are serialized so that a snapshot is never replaced by one
+    loaded before it. The process that changed the catalog takes a new
+    version, the others read it. The version is read before the catalog,
+    so a snapshot is never older than its version.
+    """
+
+    async with _catalog_lock:
+        rows = await connections.get("default").execute_query_dict(
+            BUMP_VERSION_QUERY if is_changed else READ_VERSION_QUERY
+        )
+        catalog = await load_catalog(rows[0]["version"])
+        Session.catalog = catalog
+
+    logger.debug(f"Catalog snapshot v{catalog.version} loaded")
+
+    return catalog
@@ -0,0 +1,116 @@
+import hashlib
+from collections import OrderedDict
+from typing import Hashable, Mapping
+
+from backend.config import Session
+from backend.services.catalog import CatalogMenu, CatalogProduct
+from backend.services.orders import get_today_quantities
+from backend.utils import TokenJwt
+from backend.utils.transaction_utils import get_read_connection
+
+# Responses kept for the current catalog version, the least recently used
+# are dropped first
+MAX_CACHED_RESPONSES = 256
+
+_cached_version: int | None = None
+_responses: OrderedDict[Hashable, bytes] = OrderedDict()
+
+
+def _get_visible_ids(
+    items: Mapping[int, CatalogProduct | CatalogMenu], role_id: int
+) -> set[int]:
+    return {
+        item.id
+        for item in items.values()
+        if role_id in item.role_ids
+        and any(date.is_valid() for date in item.dates)
+    }
+
+
+async def _get_sold_out_ids(
+    items: Mapping[int, CatalogProduct | CatalogMenu],
+    ids: set[int],
+    is_menu: bool,
+) -> set[int]:
+    limited_ids = {x for x in ids if items[x].daily_max_sales}
+
+    if not limited_ids:
+        return set()
+
+    today_quantities = await get_today_quantities(
+        limited_ids, get_read_connection(), is_menu
+    )
+
+    return {
+        x
+        for x in limited_ids
+        if today_quantities.get(x, 0) >= items[x].daily_max_sales
+    }
+
+
+async def get_catalog_key(
+    path: str, query: list[tuple[str, str]], token: TokenJwt
+) -> tuple:
+    """
+    Build the key of a catalog response: the catalog version, the request
+    and, for the roles whose listings are filtered, the products and menus
+    that are currently valid and not sold out.
+    """
+
+    catalog = Session.catalog
+    is_admin = token.permissions["can_administer"]
+    visible = None
+
+    if not is_admin:
+        products = _get_visible_ids(catalog.products, token.role_id)
+        menus = _get_visible_ids(catalog.menus, token.role_id)
+
+        products -= await _get_sold_out_ids(catalog.products, products, False)
+        menus -= await _get_sold_out_ids(catalog.menus, menus, True)
+
+        visible = (tuple(sorted(products)), tuple(sorted(menus)))
+
+    return (
+        catalog.version,
+        path,
+        tuple(sorted(query)),
+        None if is_admin else token.role_id,
+        visible,
+    )
+
+
+def get_etag(key: tuple) -> str:
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=16)
+
+    return f'"{digest.hexdigest()}"'
+
+
+def get_cached_response(key: tuple) -> bytes | None:
+    body = _responses.get(key)
+
+    if body is not None:
+        _responses.move_to_end(key)
+
+    return body
+
+
+def set_cached_response(key: tuple, body: bytes) -> None:
+    """
+    Memoize a response, unless the catalog changed while it was built.
+    """
+
+    global _cached_version
+
+    version = Session.catalog.version
+
+    if key[0] != version:
+        return
+
+    if _cached_version != version:
+        _responses.clear()
+        _cached_version = version
+
+    _responses[key] = body
+
+    while len(_responses) > MAX_CACHED_RESPONSES:
+        _responses.popitem(last=False)
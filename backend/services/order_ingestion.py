@@ -0,0 +1,172 @@
+from tortoise import BaseDBAsyncClient
+
+from backend.config import Session
+from backend.database.models import Order, OrderIdempotencyKey
+from backend.models.error import BadRequest, Conflict, NotFound, Unauthorized
+from backend.models.orders import CreateOrderItem
+from backend.services.orders import reserve_today_quantities
+from backend.services.statistics import add_order_statistics
+from backend.utils import ErrorCodes, TokenJwt
+from backend.utils.order_utils import (
+    check_menus,
+    check_products,
+    create_order_items,
+    get_order_price,
+    is_table_allowed_for_role,
+)
+
+
+def check_order_item(item: CreateOrderItem, token: TokenJwt) -> None:
+    """
+    Check the fields of an order that do not need the database.
+    """
+
+    if not item.products and not item.menus:
+        raise BadRequest(code=ErrorCodes.NO_PRODUCTS_AND_MENUS)
+
+    if item.is_takeaway_kiosk and item.is_take_away:
+        raise BadRequest(code=ErrorCodes.CANNOT_BE_BOTH_TAKEAWAY_AND_KIOSK)
+
+    if (
+        token.permissions["can_modify_completed_orders"]
+        and not item.parent_order_id
+    ):
+        raise BadRequest(code=ErrorCodes.PARENT_ORDER_ID_REQUIRED)
+
+    if token.permissions["can_order"]:
+        if item.parent_order_id:
+            raise BadRequest(code=ErrorCodes.PARENT_ORDER_ID_NOT_ALLOWED)
+
+        if item.is_takeaway_kiosk and not item.guests:
+            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
+
+        if (
+            not item.is_take_away
+            and not Session.settings.order_requires_confirmation
+            and (not item.guests or not item.table)
+        ):
+            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
+
+        if (
+            not item.is_take_away
+            and Session.settings.order_requires_confirmation
+            and not item.guests
+        ):
+            raise BadRequest(code=ErrorCodes.SET_GUESTS_NUMBER)
+
+
+async def place_order(
+    item: CreateOrderItem, token: TokenJwt, connection: BaseDBAsyncClient
+) -> Order:
+    """
+    Validate an order against the database and create it, together with
+    its idempotency key when given.
+    """
+
+    if item.parent_order_id:
+        parent_order = await Order.get_or_none(
+            id=item.parent_order_id, using_db=connection
+        )
+
+        if not parent_order:
+            raise NotFound(code=ErrorCodes.ORDER_NOT_FOUND)
+
+        if not parent_order.is_confirm:
+            raise BadRequest(code=ErrorCodes.PARENT_ORDER_NOT_CONFIRMED)
+
+    if (
+        not Session.settings.order_requires_confirmation
+        and not (item.is_take_away or item.is_takeaway_kiosk)
+        and not await is_table_allowed_for_role(
+            token.role_id, item.table, connection
+        )
+    ):
+        raise Unauthorized(code=ErrorCodes.TABLE_NOT_ALLOWED_FOR_ROLE)
+
+    has_error_products, error_code_products = await check_products(
+        item.products, token.role_id
+    )
+
+    if has_error_products:
+        raise Conflict(code=error_code_products)
+
+    has_error_menus, error_code_menus = await check_menus(
+        item.menus, token.role_id
+    )
+
+    if has_error_menus:
+        raise Conflict(code=error_code_menus)
+
+    order_price = await get_order_price(item)
+
+    order = await Order.create(
+        customer=item.customer,
+        guests=(
+            item.guests
+            if not item.is_take_away and not item.parent_order_id
+            else None
+        ),
+        is_take_away=(
+            item.is_take_away if not item.parent_order_id else False
+        ),
+        table=(
+            item.table
+            if not item.is_take_away
+            and not Session.settings.order_requires_confirmation
+            and not item.parent_order_id
+            and not item.is_takeaway_kiosk
+            else None
+        ),
+        is_confirm=(
+            True if not Session.settings.order_requires_confirmation else False
+        ),
+        is_voucher=item.is_voucher,
+        is_takeaway_kiosk=item.is_takeaway_kiosk,
+        price=order_price,
+        user_id=token.user_id,
+        parent_order_id=item.parent_order_id,
+        using_db=connection,
+    )
+
+    await create_order_items(item.products, item.menus, order, connection)
+    error_code = await reserve_today_quantities(
+        item.products, item.menus, connection
+    )
+
+    if error_code:
+        raise Conflict(code=error_code)
+
+    await add_order_statistics(order.id, connection)
+
+    if item.idempotency_key:
+        await OrderIdempotencyKey.create(
+            key=item.idempotency_key,
+            user_id=token.user_id,
+            order_id=order.id,
+            using_db=connection,
+        )
+
+    return order
+
+
+async def get_idempotent_orders(
+    keys: list[str | None],
+    user_id: int,
+    connection: BaseDBAsyncClient | None = None,
+) -> dict[str, Order]:
+    """
+    Return the orders already created by a user for the given keys.
+    """
+
+    keys = [x for x in keys if x]
+
+    if not keys:
+        return {}
+
+    idempotency_keys = (
+        await OrderIdempotencyKey.filter(user_id=user_id, key__in=keys)
+        .prefetch_related("order")
+        .using_db(connection)
+    )
+
+    return {x.key: x.order for x in idempotency_keys}
@@ -0,0 +1,154 @@
+import dataclasses
+import datetime
+from collections import defaultdict
+from decimal import Decimal
+
+from backend.database.models import Order, OrderProduct
+from backend.utils import Category
+
+# Menu field products are order products too, so they are grouped from
+# order_products instead of being fetched again through the menu fields
+ORDER_VIEW_PREFETCH_VALUES = (
+    "user",
+    "parent_order",
+    "order_products__product__subcategory",
+    "order_products__variant",
+    "order_products__order_product_ingredients__product_ingredient",
+    "order_menus__menu",
+    "order_menus__order_menu_fields",
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OrderViewProduct:
+    id: int
+    short_name: str
+    category: Category
+    order: int
+    subcategory_order: int
+    quantity: int
+    price: Decimal
+    variant_name: str | None
+    ingredient_names: tuple[str, ...]
+    order_menu_field_id: int | None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OrderViewMenu:
+    id: int
+    short_name: str
+    quantity: int
+    price: Decimal
+    fields: tuple[tuple[OrderViewProduct, ...], ...]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OrderViewParent:
+    id: int
+    customer: str
+    is_take_away: bool
+    table: int | None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class OrderView:
+    """
+    Plain data copy of an order with everything needed to print it.
+    """
+
+    id: int
+    customer: str
+    guests: int | None
+    is_take_away: bool
+    table: int | None
+    is_confirm: bool
+    is_voucher: bool
+    is_takeaway_kiosk: bool
+    price: Decimal
+    username: str
+    created_at: datetime.datetime
+    confirmed_at: datetime.datetime | None
+    parent_order: OrderViewParent | None
+    products: tuple[OrderViewProduct, ...]
+    menus: tuple[OrderViewMenu, ...]
+
+
+def _build_product(order_product: OrderProduct) -> OrderViewProduct:
+    product = order_product.product
+
+    return OrderViewProduct(
+        id=order_product.id,
+        short_name=product.short_name,
+        category=product.category,
+        order=product.order,
+        subcategory_order=product.subcategory.order,
+        quantity=order_product.quantity,
+        price=order_product.price,
+        variant_name=(
+            order_product.variant.name if order_product.variant else None
+        ),
+        ingredient_names=tuple(
+            x.product_ingredient.name
+            for x in order_product.order_product_ingredients
+        ),
+        order_menu_field_id=order_product.order_menu_field_id,
+    )
+
+
+def build_order_view(order: Order) -> OrderView:
+    """
+    Build the view of an order fetched with ORDER_VIEW_PREFETCH_VALUES.
+    """
+
+    products = tuple(
+        _build_product(x)
+        for x in sorted(order.order_products, key=lambda x: x.id)
+    )
+
+    field_products = defaultdict(list)
+    for product in products:
+        if product.order_menu_field_id:
+            field_products[product.order_menu_field_id].append(product)
+
+    menus = tuple(
+        OrderViewMenu(
+            id=order_menu.id,
+            short_name=order_menu.menu.short_name,
+            quantity=order_menu.quantity,
+            price=order_menu.price,
+            fields=tuple(
+                tuple(field_products[x.id])
+                for x in sorted(
+                    order_menu.order_menu_fields, key=lambda x: x.id
+                )
+            ),
+        )
+        for order_menu in sorted(order.order_menus, key=lambda x: x.id)
+    )
+
+    parent_order = None
+    if order.parent_order:
+        parent_order = OrderViewParent(
+            id=order.parent_order.id,
+            customer=order.parent_order.customer,
+            is_take_away=order.parent_order.is_take_away,
+            table=order.parent_order.table,
+        )
+
+    return OrderView(
+        id=order.id,
+        customer=order.customer,
+        guests=order.guests,
+        is_take_away=order.is_take_away,
+        table=order.table,
+        is_confirm=order.is_confirm,
+        is_voucher=order.is_voucher,
+        is_takeaway_kiosk=order.is_takeaway_kiosk,
+        price=order.price,
+        username=order.user.username,
+        created_at=order.created_at,
+        confirmed_at=order.confirmed_at,
+        parent_order=parent_order,
+        products=products,
+        menus=menus,
+    )
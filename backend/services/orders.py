@@ -1,32 +1,177 @@
 from collections import defaultdict
+from datetime import date
 
 from tortoise import BaseDBAsyncClient
 
-from backend.database.models import OrderMenu, OrderProduct
+from backend.config import Session
+from backend.database.models import MenuDailySale, ProductDailySale
+from backend.models.orders import CreateOrderMenuItem, CreateOrderProductItem
+from backend.utils import ErrorCodes
 from backend.utils.datetime_utils import get_day_bounds
 
+# Counters are only raised when the checked quantity still fits the daily
+# limit of the item, so orders reserve the stock they sell while holding the
+# lock of the counter row alone. Rows left out of RETURNING were refused
+RESERVE_DAILY_SALES_QUERY = """
+WITH requested AS (
+    SELECT *
+    FROM unnest($2::int[], $3::int[], $4::int[], $5::int[])
+        AS r(item_id, quantity, checked_quantity, max_sales)
+)
+INSERT INTO {table} AS sale (day, {field_name}, quantity)
+SELECT $1, r.item_id, r.quantity
+FROM requested r
+WHERE r.max_sales IS NULL OR r.checked_quantity <= r.max_sales
+ORDER BY r.item_id
+ON CONFLICT (day, {field_name}) DO UPDATE SET
+    quantity = sale.quantity + EXCLUDED.quantity
+WHERE EXISTS (
+    SELECT 1
+    FROM requested r
+    WHERE r.item_id = EXCLUDED.{field_name}
+        AND (
+            r.max_sales IS NULL
+            OR sale.quantity + r.checked_quantity <= r.max_sales
+        )
+)
+RETURNING sale.{field_name};
+"""
+
+SEED_DAILY_SALES_QUERY = """
+INSERT INTO {table} (day, {field_name}, quantity)
+SELECT $1, item.{field_name}, SUM(item.quantity)
+FROM {items_table} item
+JOIN "order" o ON o.id = item.order_id
+WHERE o.created_at >= $2 AND o.created_at < $3
+GROUP BY item.{field_name}
+ON CONFLICT (day, {field_name}) DO NOTHING;
+"""
+
+
+def _get_daily_sale_model(
+    is_menu: bool,
+) -> tuple[type[ProductDailySale | MenuDailySale], str]:
+    if is_menu:
+        return MenuDailySale, "menu_id"
+
+    return ProductDailySale, "product_id"
+
 
 async def get_today_quantities(
     ids: set[int],
     connection: BaseDBAsyncClient,
     is_menu: bool = False,
 ) -> dict[int, int]:
-    start_of_day, end_of_day = get_day_bounds()
+    if not ids:
+        return {}
+
+    model, field_name = _get_daily_sale_model(is_menu)
+
+    daily_sales = await model.filter(
+        **{"day": date.today(), f"{field_name}__in": ids}
+    ).using_db(connection)
+
+    return {getattr(x, field_name): x.quantity for x in daily_sales}
+
+
+async def reserve_today_quantities(
+    products: list[CreateOrderProductItem],
+    menus: list[CreateOrderMenuItem],
+    connection: BaseDBAsyncClient,
+) -> ErrorCodes | None:
+    """
+    Add the quantities of an order to the counters of today, refusing the
+    order when it exceeds the daily limit of a product or menu.
 
-    field_name = "menu_id" if is_menu else "product_id"
-    model = OrderMenu if is_menu else OrderProduct
+    Only the products ordered directly are checked against their limit,
+    those chosen in menus are counted without being checked.
+    """
 
-    filter_kwargs = {
-        f"{field_name}__in": ids,
-        "order__created_at__gte": start_of_day,
-        "order__created_at__lt": end_of_day,
-    }
+    product_quantities = defaultdict(int)
+    checked_product_quantities = defaultdict(int)
+    menu_quantities = defaultdict(int)
 
-    order_items = await model.filter(**filter_kwargs).using_db(connection)
+    for menu in menus:
+        menu_quantities[menu.menu_id] += menu.quantity
+
+        for field in menu.fields:
+            for product in field.products:
+                product_quantities[product.product_id] += product.quantity
+
+    for product in products:
+        product_quantities[product.product_id] += product.quantity
+        checked_product_quantities[product.product_id] += product.quantity
+
+    for quantities, checked_quantities, is_menu, error_code in (
+        (
+            product_quantities,
+            checked_product_quantities,
+            False,
+            ErrorCodes.PRODUCT_DAILY_LIMIT_EXCEEDED,
+        ),
+        (
+            menu_quantities,
+            menu_quantities,
+            True,
+            ErrorCodes.MENU_DAILY_LIMIT_EXCEEDED,
+        ),
+    ):
+        if not quantities:
+            continue
+
+        model, field_name = _get_daily_sale_model(is_menu)
+        catalog_items = (
+            Session.catalog.menus if is_menu else Session.catalog.products
+        )
+        # Sorted ids keep the row lock order stable across transactions
+        item_ids = sorted(quantities)
+
+        reserved = await connection.execute_query_dict(
+            RESERVE_DAILY_SALES_QUERY.format(
+                table=model._meta.db_table, field_name=field_name
+            ),
+            [
+                date.today(),
+                item_ids,
+                [quantities[x] for x in item_ids],
+                [checked_quantities.get(x, 0) for x in item_ids],
+                # A limit of 0, like no limit, leaves the item unlimited
+                [
+                    (
+                        catalog_items[x].daily_max_sales or None
+                        if checked_quantities.get(x)
+                        else None
+                    )
+                    for x in item_ids
+                ],
+            ],
+        )
+
+        if len(reserved) < len(item_ids):
+            return error_code
+
+    return None
+
+
+async def seed_today_quantities(connection: BaseDBAsyncClient) -> None:
+    """
+    Create the counters of today for the items sold before the counters
+    existed. Counters already present are authoritative and left untouched.
+    """
+
+    start_of_day, end_of_day = get_day_bounds()
 
-    item_quantity_map = defaultdict(int)
-    for item in order_items:
-        item_id = getattr(item, field_name)
-        item_quantity_map[item_id] += item.quantity
+    for items_table, is_menu in (
+        ("order_product", False),
+        ("order_menu", True),
+    ):
+        model, field_name = _get_daily_sale_model(is_menu)
 
-    return dict(item_quantity_map)
+        await connection.execute_query(
+            SEED_DAILY_SALES_QUERY.format(
+                table=model._meta.db_table,
+                field_name=field_name,
+                items_table=items_table,
+            ),
+            [start_of_day.date(), start_of_day, end_of_day],
+        )
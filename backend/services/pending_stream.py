@@ -0,0 +1,319 @@
+import asyncio
+import contextlib
+import dataclasses
+import datetime
+from collections import defaultdict
+from enum import StrEnum
+
+from tortoise import BaseDBAsyncClient, connections
+
+from backend.config import Session
+from backend.database.models import Order, User
+from backend.models.statistics import (
+    PendingStatistic,
+    PendingStatisticProduct,
+)
+from backend.services.statistics import (
+    ItemStatistic,
+    StatisticSummary,
+    get_named_items,
+    get_order_summary,
+)
+from backend.utils.datetime_utils import get_day_bounds
+
+# A subscriber further behind than this is sent a new snapshot instead
+MAX_PENDING_CHANGES = 1000
+
+_subscriptions: set["PendingSubscription"] = set()
+
+
+class PendingEvent(StrEnum):
+    CREATED = "created"
+    CONFIRMED = "confirmed"
+    SERVED = "served"
+    DELETED = "deleted"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PendingChange:
+    """
+    Signed contribution of an order to the pending statistic.
+    """
+
+    created_at: datetime.datetime
+    role_id: int
+    is_confirm: bool
+    summary: StatisticSummary
+
+    def negate(self, only_items: bool = False) -> "PendingChange":
+        summary = StatisticSummary(
+            orders=0 if only_items else -self.summary.orders,
+            seated=0 if only_items else -self.summary.seated,
+            take_away=0 if only_items else -self.summary.take_away,
+        )
+
+        for items, negated in (
+            (self.summary.products, summary.products),
+            (self.summary.menus, summary.menus),
+        ):
+            for item_id, values in items.items():
+                negated[item_id] = ItemStatistic(
+                    pending_quantity=-values.pending_quantity
+                )
+
+        return dataclasses.replace(self, summary=summary)
+
+    def confirm(self) -> "PendingChange":
+        return dataclasses.replace(self, is_confirm=True)
+
+
+class PendingSubscription:
+    """
+    Changes published for the orders of today matching the filters of a
+    pending statistic request.
+    """
+
+    def __init__(
+        self,
+        role_ids: list[int] | None,
+        only_confirmed: bool,
+        only_priority: bool,
+    ):
+        self.role_ids = frozenset(role_ids or ())
+        self.only_confirmed = only_confirmed
+        self.only_priority = only_priority
+        self.changes: asyncio.Queue[PendingChange] = asyncio.Queue(
+            MAX_PENDING_CHANGES
+        )
+        self.is_stale = False
+        self.day_bounds = get_day_bounds()
+
+    def matches(self, change: PendingChange) -> bool:
+        start_date, end_date = self.day_bounds
+
+        return (
+            start_date < change.created_at < end_date
+            and (not self.role_ids or change.role_id in self.role_ids)
+            and (not self.only_confirmed or change.is_confirm)
+        )
+
+    def put(self, change: PendingChange) -> None:
+        if self.is_stale or not self.matches(change):
+            return
+
+        try:
+            self.changes.put_nowait(change)
+        except asyncio.QueueFull:
+            self.is_stale = True
+
+    def reset(self) -> None:
+        """
+        Drop the queued changes, before taking a new snapshot.
+        """
+
+        while not self.changes.empty():
+            self.changes.get_nowait()
+
+        self.is_stale = False
+        self.day_bounds = get_day_bounds()
+
+    def resync(self) -> None:
+        """
+        Take a new snapshot, the changes sent in the meantime by the other
+        workers may have been lost.
+        """
+
+        self.is_stale = True
+
+        # An empty change wakes up the stream
+        with contextlib.suppress(asyncio.QueueFull):
+            self.changes.put_nowait(
+                PendingChange(
+                    created_at=self.day_bounds[0],
+                    role_id=0,
+                    is_confirm=False,
+                    summary=StatisticSummary(),
+                )
+            )
+
+    def merge(self, changes: list[PendingChange]) -> StatisticSummary:
+        catalog_products = Session.catalog.products
+        summary = StatisticSummary()
+
+        for change in changes:
+            summary.orders += change.summary.orders
+            summary.seated += change.summary.seated
+            summary.take_away += change.summary.take_away
+
+            items = [(change.summary.products, summary.products)]
+            if not self.only_priority:
+                items.append((change.summary.menus, summary.menus))
+
+            for change_items, merged in items:
+                for item_id, values in change_items.items():
+                    product = catalog_products.get(item_id)
+
+                    if self.only_priority and not (
+                        product and product.is_priority
+                    ):
+                        continue
+
+                    item = merged.setdefault(item_id, ItemStatistic())
+                    item.pending_quantity += values.pending_quantity
+
+        return summary
+
+
+def subscribe(
+    role_ids: list[int] | None, only_confirmed: bool, only_priority: bool
+) -> PendingSubscription:
+    subscription = PendingSubscription(role_ids, only_confirmed, only_priority)
+    _subscriptions.add(subscription)
+
+    return subscription
+
+
+def unsubscribe(subscription: PendingSubscription) -> None:
+    _subscriptions.discard(subscription)
+
+
+def publish(*changes: PendingChange) -> None:
+    """
+    Send changes to every subscriber. Must be called after the changes have
+    been committed.
+    """
+
+    for subscription in _subscriptions:
+        for change in changes:
+            subscription.put(change)
+
+
+async def _read_change(
+    order: Order, connection: BaseDBAsyncClient, include_deleted: bool = False
+) -> PendingChange:
+    role_id = (
+        await User.filter(id=order.user_id)
+        .using_db(connection)
+        .first()
+        .values_list("role_id", flat=True)
+    )
+
+    return PendingChange(
+        created_at=order.created_at,
+        role_id=role_id,
+        is_confirm=order.is_confirm,
+        summary=await get_order_summary(order.id, connection, include_deleted),
+    )
+
+
+async def get_pending_change(
+    order: Order, connection: BaseDBAsyncClient
+) -> PendingChange | None:
+    """
+    Read the current contribution of an order to the pending statistic,
+    None when nobody is subscribed.
+    """
+
+    if not _subscriptions:
+        return None
+
+    return await _read_change(order, connection)
+
+
+async def share_changes(event: PendingEvent, *order_ids: int) -> None:
+    """
+    Send the changes of orders to the subscribers of the other workers,
+    which read them from the database. Must be called after the changes
+    have been committed.
+    """
+
+    if order_ids:
+        await Session.cluster.publish(
+            "pending", kind=event.value, order_ids=list(order_ids)
+        )
+
+
+async def _get_shared_changes(
+    event: PendingEvent, order_id: int
+) -> list[PendingChange]:
+    connection = connections.get("default")
+    order = await Order.get_or_none(id=order_id, using_db=connection)
+
+    if not order:
+        return []
+
+    # Deleted orders are read too, each event carries the contribution
+    # the order had before it
+    change = await _read_change(order, connection, include_deleted=True)
+
+    if event == PendingEvent.CREATED:
+        return [change]
+
+    if event == PendingEvent.CONFIRMED:
+        change = dataclasses.replace(change, is_confirm=False)
+
+        return [change.negate(), change.confirm()]
+
+    if event == PendingEvent.SERVED:
+        # The items were pending until the order was served
+        for items in (change.summary.products, change.summary.menus):
+            for values in items.values():
+                values.pending_quantity = (
+                    values.quantity + values.voucher_quantity
+                )
+
+        return [change.negate(only_items=True)]
+
+    return [change.negate()]
+
+
+async def publish_shared_changes(data: dict) -> None:
+    """
+    Send to the local subscribers the changes shared by another worker.
+    With no data, after a reconnection, every subscriber takes a new
+    snapshot.
+    """
+
+    if not _subscriptions:
+        return
+
+    if not data:
+        for subscription in _subscriptions:
+            subscription.resync()
+
+        return
+
+    event = PendingEvent(data["kind"])
+    changes = []
+
+    for order_id in data["order_ids"]:
+        changes += await _get_shared_changes(event, order_id)
+
+    publish(*changes)
+
+
+def build_pending_statistic(
+    summary: StatisticSummary, skip_unchanged: bool = False
+) -> PendingStatistic:
+    """
+    Build the pending statistic of a summary, grouping items by name.
+    """
+
+    result_map: dict[str, int] = defaultdict(int)
+
+    for name, _, values in get_named_items(summary):
+        result_map[name] += values.pending_quantity
+
+    return PendingStatistic(
+        total_orders=summary.orders,
+        total_seated=summary.seated,
+        total_take_away=summary.take_away,
+        products=[
+            PendingStatisticProduct(
+                name=name,
+                pending_quantity=pending_quantity,
+            )
+            for name, pending_quantity in result_map.items()
+            if pending_quantity or not skip_unchanged
+        ],
+    )
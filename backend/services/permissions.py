@@ -0,0 +1,64 @@
+import time
+
+from backend.config import Session
+from backend.database.models import Role
+from backend.utils import Permission, TokenJwt
+
+# Bumped on every invalidation, so that a lookup started before it does
+# not store permissions read before the change
+_generation = 0
+_role_permissions: dict[int, frozenset[Permission] | None] = {}
+
+
+def invalidate_role_permissions(role_id: int | None = None) -> None:
+    """
+    Drop the cached permissions of a role, or of every role when no id is
+    given. Must be called after the change has been committed.
+    """
+
+    global _generation
+
+    _generation += 1
+
+    if role_id is None:
+        _role_permissions.clear()
+    else:
+        _role_permissions.pop(role_id, None)
+
+
+async def get_role_permissions(role_id: int) -> frozenset[Permission] | None:
+    """
+    Return the permissions granted to a role, None if it does not exist.
+    """
+
+    if role_id in _role_permissions:
+        return _role_permissions[role_id]
+
+    generation = _generation
+    role = await Role.get_or_none(id=role_id)
+    permissions = (
+        frozenset(x for x in Permission if getattr(role, x, False))
+        if role
+        else None
+    )
+
+    if generation == _generation:
+        _role_permissions[role_id] = permissions
+
+    return permissions
+
+
+def is_token_trusted(token: TokenJwt) -> bool:
+    """
+    Whether the permissions carried by the token are recent enough to be
+    used without looking up the role.
+    """
+
+    window = Session.config.AUTH_TOKEN_TRUST_SECONDS
+
+    if window <= 0 or token.exp is None:
+        return False
+
+    issued_at = token.exp - Session.config.JWT_TOKEN_EXPIRES
+
+    return time.time() - issued_at <= window
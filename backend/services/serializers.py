@@ -0,0 +1,293 @@
+from typing import Any, Mapping
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from backend.database.models import (
+    Menu,
+    MenuField,
+    Order,
+    OrderMenu,
+    OrderProduct,
+    Product,
+    User,
+)
+from backend.models import BaseResponse
+
+# Serializers turn prefetched models straight into the dicts the response
+# models would dump, with the same keys in the same order, so the trusted
+# data is neither awaited nor validated again
+
+BASE_RESPONSE = BaseResponse().model_dump()
+
+
+def json_response(content: dict[str, Any]) -> Response:
+    return Response(to_json(content), media_type="application/json")
+
+
+def _serialize_dates(dates) -> list[dict]:
+    return [
+        {"id": x.id, "start_date": x.start_date, "end_date": x.end_date}
+        for x in dates
+    ]
+
+
+def _serialize_roles(roles) -> list[dict]:
+    return [{"id": x.id, "role_id": x.role_id} for x in roles]
+
+
+def _serialize_priced(items) -> list[dict]:
+    return [
+        {"id": x.id, "name": x.name, "price": float(x.price)} for x in items
+    ]
+
+
+def serialize_user(user: User | None) -> dict | None:
+    if not user:
+        return None
+
+    return {
+        "id": user.id,
+        "username": user.username,
+        "role_id": user.role_id,
+        "created_at": user.created_at,
+    }
+
+
+def serialize_product(
+    product: Product,
+    include_dates: bool = False,
+    include_ingredients: bool = False,
+    include_roles: bool = False,
+    include_variants: bool = False,
+) -> dict:
+    return {
+        "id": product.id,
+        "name": product.name,
+        "short_name": product.short_name,
+        "is_priority": product.is_priority,
+        "price": float(product.price),
+        "category": product.category,
+        "order": product.order,
+        "daily_max_sales": product.daily_max_sales,
+        "subcategory_id": product.subcategory_id,
+        "dates": _serialize_dates(product.dates) if include_dates else None,
+        "ingredients": (
+            _serialize_priced(product.ingredients)
+            if include_ingredients
+            else None
+        ),
+        "roles": _serialize_roles(product.roles) if include_roles else None,
+        "variants": (
+            _serialize_priced(product.variants) if include_variants else None
+        ),
+    }
+
+
+def _serialize_menu_field(
+    menu_field: MenuField,
+    include_products: bool,
+    include_products_dates: bool,
+    include_products_ingredients: bool,
+    include_products_roles: bool,
+    include_products_variants: bool,
+) -> dict:
+    return {
+        "id": menu_field.id,
+        "name": menu_field.name,
+        "max_sortable_elements": menu_field.max_sortable_elements,
+        "additional_cost": float(menu_field.additional_cost),
+        "is_optional": menu_field.is_optional,
+        "can_exceed_max_sortable": menu_field.can_exceed_max_sortable,
+        "products": (
+            [
+                {
+                    "id": x.id,
+                    "price": float(x.price),
+                    "product": serialize_product(
+                        x.product,
+                        include_products_dates,
+                        include_products_ingredients,
+                        include_products_roles,
+                        include_products_variants,
+                    ),
+                }
+                for x in menu_field.field_products
+            ]
+            if include_products
+            else None
+        ),
+    }
+
+
+def serialize_menu(
+    menu: Menu,
+    include_dates: bool = False,
+    include_fields: bool = False,
+    include_fields_products: bool = False,
+    include_fields_products_dates: bool = False,
+    include_fields_products_ingredients: bool = False,
+    include_fields_products_roles: bool = False,
+    include_fields_products_variants: bool = False,
+    include_roles: bool = False,
+) -> dict:
+    return {
+        "id": menu.id,
+        "name": menu.name,
+        "short_name": menu.short_name,
+        "price": float(menu.price),
+        "daily_max_sales": menu.daily_max_sales,
+        "dates": _serialize_dates(menu.dates) if include_dates else None,
+        "fields": (
+            [
+                _serialize_menu_field(
+                    x,
+                    include_fields_products,
+                    include_fields_products_dates,
+                    include_fields_products_ingredients,
+                    include_fields_products_roles,
+                    include_fields_products_variants,
+                )
+                for x in menu.menu_fields
+            ]
+            if include_fields
+            else None
+        ),
+        "roles": _serialize_roles(menu.roles) if include_roles else None,
+    }
+
+
+def _serialize_order_product(
+    order_product: OrderProduct,
+    include_product: bool = False,
+    include_product_dates: bool = False,
+    include_product_ingredients: bool = False,
+    include_product_roles: bool = False,
+    include_product_variants: bool = False,
+    include_ingredients: bool = False,
+) -> dict:
+    return {
+        "id": order_product.id,
+        "product_id": order_product.product_id,
+        "price": float(order_product.price),
+        "quantity": order_product.quantity,
+        "variant_id": order_product.variant_id,
+        "order_menu_field_id": order_product.order_menu_field_id,
+        "product": (
+            serialize_product(
+                order_product.product,
+                include_product_dates,
+                include_product_ingredients,
+                include_product_roles,
+                include_product_variants,
+            )
+            if include_product
+            else None
+        ),
+        "ingredients": (
+            [
+                {"id": x.id, "product_ingredient_id": x.product_ingredient_id}
+                for x in order_product.order_product_ingredients
+            ]
+            if include_ingredients
+            else None
+        ),
+    }
+
+
+def _serialize_order_menu(
+    order_menu: OrderMenu, include: Mapping[str, bool]
+) -> dict:
+    return {
+        "id": order_menu.id,
+        "price": float(order_menu.price),
+        "quantity": order_menu.quantity,
+        "menu": (
+            serialize_menu(
+                order_menu.menu,
+                include["include_menus_menu_dates"],
+                include["include_menus_menu_fields"],
+                include["include_menus_menu_fields_products"],
+                include["include_menus_menu_fields_products_dates"],
+                include["include_menus_menu_fields_products_ingredients"],
+                include["include_menus_menu_fields_products_roles"],
+                include["include_menus_menu_fields_products_variants"],
+                include["include_menus_menu_roles"],
+            )
+            if include["include_menus_menu"]
+            else None
+        ),
+        "fields": (
+            [
+                {
+                    "id": x.id,
+                    "menu_field_id": x.menu_field_id,
+                    "products": (
+                        [
+                            _serialize_order_product(
+                                y,
+                                include_ingredients=include[
+                                    "include_menus_fields_products_ingredients"
+                                ],
+                            )
+                            for y in x.order_menu_field_products
+                        ]
+                        if include["include_menus_fields_products"]
+                        else None
+                    ),
+                }
+                for x in order_menu.order_menu_fields
+            ]
+            if include["include_menus_fields"]
+            else None
+        ),
+    }
+
+
+def serialize_order(order: Order, include: Mapping[str, bool]) -> dict:
+    """
+    Serialize an order prefetched with the plan of the same include flags.
+    """
+
+    return {
+        "id": order.id,
+        "customer": order.customer,
+        "guests": order.guests,
+        "is_take_away": order.is_take_away,
+        "table": order.table,
+        "is_confirm": order.is_confirm,
+        "is_done": order.is_done,
+        "is_voucher": order.is_voucher,
+        "price": float(order.price),
+        "user": (
+            serialize_user(order.user) if include["include_user"] else None
+        ),
+        "confirmed_by": (
+            serialize_user(order.confirmed_by)
+            if include["include_confirmer_user"]
+            else None
+        ),
+        "menus": (
+            [_serialize_order_menu(x, include) for x in order.order_menus]
+            if include["include_menus"]
+            else None
+        ),
+        "products": (
+            [
+                _serialize_order_product(
+                    x,
+                    include["include_products_product"],
+                    include["include_products_product_dates"],
+                    include["include_products_product_ingredients"],
+                    include["include_products_product_roles"],
+                    include["include_products_product_variants"],
+                    include["include_products_ingredients"],
+                )
+                for x in order.order_products
+                if not x.order_menu_field_id
+            ]
+            if include["include_products"]
+            else None
+        ),
+        "created_at": order.created_at,
+    }
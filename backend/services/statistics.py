@@ -0,0 +1,543 @@
+import dataclasses
+import datetime
+from decimal import Decimal
+
+from tortoise import BaseDBAsyncClient, timezone
+from tortoise.expressions import Q, Subquery
+from tortoise.functions import Count, Sum
+
+from backend.config import Session
+from backend.database.models import (
+    MenuStatistic,
+    OrderStatistic,
+    Product,
+    ProductStatistic,
+    User,
+)
+from backend.utils.datetime_utils import get_day_bounds
+
+# Statistic days follow get_day_bounds, which splits days in UTC
+ORDER_STATISTIC_QUERY = """
+INSERT INTO order_statistic
+    (day, user_id, orders, seated, take_away, vouchers, total_price)
+SELECT
+    (o.created_at AT TIME ZONE 'UTC')::date,
+    o.user_id,
+    $1 * COUNT(*),
+    $1 * COALESCE(SUM(o.guests) FILTER (WHERE NOT o.is_take_away), 0),
+    $1 * COUNT(*) FILTER (WHERE o.is_take_away),
+    $1 * COUNT(*) FILTER (WHERE o.is_voucher),
+    $1 * COALESCE(SUM(o.price) FILTER (WHERE NOT o.is_voucher), 0)
+FROM "order" o
+WHERE {where}
+GROUP BY 1, 2
+ON CONFLICT (day, user_id) DO UPDATE SET
+    orders = order_statistic.orders + EXCLUDED.orders,
+    seated = order_statistic.seated + EXCLUDED.seated,
+    take_away = order_statistic.take_away + EXCLUDED.take_away,
+    vouchers = order_statistic.vouchers + EXCLUDED.vouchers,
+    total_price = order_statistic.total_price + EXCLUDED.total_price;
+"""
+
+ITEM_STATISTIC_QUERY = """
+INSERT INTO {table} (
+    day,
+    user_id,
+    {field_name},
+    quantity,
+    voucher_quantity,
+    pending_quantity,
+    total_price
+)
+SELECT
+    (o.created_at AT TIME ZONE 'UTC')::date,
+    o.user_id,
+    item.{field_name},
+    $1 * COALESCE(SUM(item.quantity) FILTER (WHERE NOT o.is_voucher), 0),
+    $1 * COALESCE(SUM(item.quantity) FILTER (WHERE o.is_voucher), 0),
+    $2 * COALESCE(SUM(item.quantity) FILTER (WHERE NOT o.is_served), 0),
+    $1 * COALESCE(SUM(item.price) FILTER (WHERE NOT o.is_voucher), 0)
+FROM {items_table} item
+JOIN "order" o ON o.id = item.order_id
+WHERE {where} {items_filter}
+GROUP BY 1, 2, 3
+ON CONFLICT (day, user_id, {field_name}) DO UPDATE SET
+    quantity = {table}.quantity + EXCLUDED.quantity,
+    voucher_quantity = {table}.voucher_quantity + EXCLUDED.voucher_quantity,
+    pending_quantity = {table}.pending_quantity + EXCLUDED.pending_quantity,
+    total_price = {table}.total_price + EXCLUDED.total_price;
+"""
+
+ITEM_STATISTIC_TABLES = (
+    (
+        ProductStatistic,
+        "product_id",
+        "order_product",
+        "AND item.order_menu_field_id IS NULL",
+    ),
+    (MenuStatistic, "menu_id", "order_menu", ""),
+)
+
+ORDERS_SUMMARY_QUERY = """
+SELECT
+    COUNT(*) AS orders,
+    COALESCE(SUM(o.guests) FILTER (WHERE NOT o.is_take_away), 0) AS seated,
+    COUNT(*) FILTER (WHERE o.is_take_away) AS take_away,
+    COUNT(*) FILTER (WHERE o.is_voucher) AS vouchers,
+    COALESCE(SUM(o.price) FILTER (WHERE NOT o.is_voucher), 0) AS total_price
+FROM "order" o
+WHERE {where};
+"""
+
+ITEMS_SUMMARY_QUERY = """
+SELECT
+    item.{field_name} AS item_id,
+    COALESCE(SUM(item.quantity) FILTER (WHERE NOT o.is_voucher), 0)
+        AS quantity,
+    COALESCE(SUM(item.quantity) FILTER (WHERE o.is_voucher), 0)
+        AS voucher_quantity,
+    COALESCE(SUM(item.quantity) FILTER (WHERE NOT o.is_served), 0)
+        AS pending_quantity,
+    COALESCE(SUM(item.price) FILTER (WHERE NOT o.is_voucher), 0)
+        AS total_price
+FROM {items_table} item
+JOIN "order" o ON o.id = item.order_id
+WHERE {where} {items_filter}
+GROUP BY item.{field_name};
+"""
+
+PRIORITY_PRODUCTS_FILTER = (
+    "AND item.product_id IN (SELECT id FROM product WHERE is_priority)"
+)
+
+
+@dataclasses.dataclass(slots=True)
+class ItemStatistic:
+    quantity: int = 0
+    voucher_quantity: int = 0
+    pending_quantity: int = 0
+    total_price: Decimal = Decimal("0.00")
+
+
+@dataclasses.dataclass(slots=True)
+class StatisticSummary:
+    orders: int = 0
+    seated: int = 0
+    take_away: int = 0
+    vouchers: int = 0
+    total_price: Decimal = Decimal("0.00")
+    products: dict[int, ItemStatistic] = dataclasses.field(
+        default_factory=dict
+    )
+    menus: dict[int, ItemStatistic] = dataclasses.field(default_factory=dict)
+
+
+async def _apply_statistics(
+    order_id: int | None,
+    sign: int,
+    pending_sign: int,
+    connection: BaseDBAsyncClient,
+) -> None:
+    # Without an order, every order not deleted is applied
+    params = [order_id] if order_id else []
+
+    if sign:
+        await connection.execute_query(
+            ORDER_STATISTIC_QUERY.format(
+                where="o.id = $2" if order_id else "NOT o.is_deleted"
+            ),
+            [sign, *params],
+        )
+
+    for model, field_name, items_table, items_filter in ITEM_STATISTIC_TABLES:
+        await connection.execute_query(
+            ITEM_STATISTIC_QUERY.format(
+                table=model._meta.db_table,
+                field_name=field_name,
+                items_table=items_table,
+                where="o.id = $3" if order_id else "NOT o.is_deleted",
+                items_filter=items_filter,
+            ),
+            [sign, pending_sign, *params],
+        )
+
+
+async def add_order_statistics(
+    order_id: int, connection: BaseDBAsyncClient
+) -> None:
+    await _apply_statistics(order_id, 1, 1, connection)
+
+
+async def remove_order_statistics(
+    order_id: int, connection: BaseDBAsyncClient
+) -> None:
+    # Served orders have no pending quantity left to remove
+    await _apply_statistics(order_id, -1, -1, connection)
+
+
+async def serve_order_statistics(
+    order_id: int, connection: BaseDBAsyncClient
+) -> None:
+    """
+    Clear the pending quantities of an order. Must be called before the
+    order is marked as served.
+    """
+
+    await _apply_statistics(order_id, 0, -1, connection)
+
+
+async def seed_statistics(connection: BaseDBAsyncClient) -> None:
+    """
+    Build the statistics of the orders created before the statistics
+    existed. Nothing is done once any statistic has been recorded.
+    """
+
+    if await OrderStatistic.all().using_db(connection).exists():
+        return
+
+    await _apply_statistics(None, 1, 1, connection)
+
+
+def _to_utc(value: datetime.datetime) -> datetime.datetime:
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+
+    return value.astimezone(datetime.timezone.utc)
+
+
+def _day_start(day: datetime.date) -> datetime.datetime:
+    return datetime.datetime.combine(
+        day, datetime.time.min, tzinfo=datetime.timezone.utc
+    )
+
+
+def _add_item(
+    items: dict[int, ItemStatistic],
+    item_id: int,
+    quantity: int,
+    voucher_quantity: int,
+    pending_quantity: int,
+    total_price: Decimal,
+) -> None:
+    item = items.setdefault(item_id, ItemStatistic())
+    item.quantity += quantity
+    item.voucher_quantity += voucher_quantity
+    item.pending_quantity += pending_quantity
+    item.total_price += total_price
+
+
+async def _add_daily_statistics(
+    summary: StatisticSummary,
+    days_filter: Q,
+    role_ids: list[int] | None,
+    only_priority: bool,
+    connection: BaseDBAsyncClient,
+) -> None:
+    if role_ids:
+        # A join would make the aggregates group by every column
+        days_filter &= Q(
+            user_id__in=Subquery(
+                User.filter(role_id__in=role_ids).values("id")
+            )
+        )
+
+    orders = (
+        await OrderStatistic.filter(days_filter)
+        .annotate(
+            total_orders=Sum("orders"),
+            total_seated=Sum("seated"),
+            total_take_away=Sum("take_away"),
+            total_vouchers=Sum("vouchers"),
+            total_price_sum=Sum("total_price"),
+            rows=Count("id"),
+        )
+        .using_db(connection)
+        .values(
+            "total_orders",
+            "total_seated",
+            "total_take_away",
+            "total_vouchers",
+            "total_price_sum",
+            "rows",
+        )
+    )
+
+    if not orders or not orders[0]["rows"]:
+        return
+
+    summary.orders += orders[0]["total_orders"]
+    summary.seated += orders[0]["total_seated"]
+    summary.take_away += orders[0]["total_take_away"]
+    summary.vouchers += orders[0]["total_vouchers"]
+    summary.total_price += orders[0]["total_price_sum"]
+
+    items_filters = [
+        (
+            ProductStatistic,
+            "product_id",
+            summary.products,
+            (
+                Q(
+                    product_id__in=Subquery(
+                        Product.filter(is_priority=True).values("id")
+                    )
+                )
+                if only_priority
+                else Q()
+            ),
+        )
+    ]
+    if not only_priority:
+        items_filters.append((MenuStatistic, "menu_id", summary.menus, Q()))
+
+    for model, field_name, items, items_filter in items_filters:
+        rows = (
+            await model.filter(days_filter & items_filter)
+            .annotate(
+                total_quantity=Sum("quantity"),
+                total_voucher_quantity=Sum("voucher_quantity"),
+                total_pending_quantity=Sum("pending_quantity"),
+                total_price_sum=Sum("total_price"),
+            )
+            .group_by(field_name)
+            .using_db(connection)
+            .values(
+                field_name,
+                "total_quantity",
+                "total_voucher_quantity",
+                "total_pending_quantity",
+                "total_price_sum",
+            )
+        )
+
+        for row in rows:
+            _add_item(
+                items,
+                row[field_name],
+                row["total_quantity"],
+                row["total_voucher_quantity"],
+                row["total_pending_quantity"],
+                row["total_price_sum"],
+            )
+
+
+def _build_orders_where(
+    created_after: datetime.datetime | None = None,
+    created_from: datetime.datetime | None = None,
+    created_before: datetime.datetime | None = None,
+    role_ids: list[int] | None = None,
+    only_confirmed: bool = False,
+) -> tuple[str, list]:
+    conditions = ["NOT o.is_deleted"]
+    params = []
+
+    for condition, value in (
+        ("o.created_at > {}", created_after),
+        ("o.created_at >= {}", created_from),
+        ("o.created_at < {}", created_before),
+        (
+            'o.user_id IN (SELECT id FROM "user" WHERE role_id = ANY({}))',
+            role_ids or None,
+        ),
+    ):
+        if value is not None:
+            params.append(value)
+            conditions.append(condition.format(f"${len(params)}"))
+
+    if only_confirmed:
+        conditions.append("o.is_confirm")
+
+    return " AND ".join(conditions), params
+
+
+async def _add_orders_statistics(
+    summary: StatisticSummary,
+    where: tuple[str, list],
+    only_priority: bool,
+    connection: BaseDBAsyncClient,
+) -> None:
+    where, params = where
+
+    _, rows = await connection.execute_query(
+        ORDERS_SUMMARY_QUERY.format(where=where), params
+    )
+
+    summary.orders += rows[0]["orders"]
+    summary.seated += rows[0]["seated"]
+    summary.take_away += rows[0]["take_away"]
+    summary.vouchers += rows[0]["vouchers"]
+    summary.total_price += rows[0]["total_price"]
+
+    if not rows[0]["orders"]:
+        return
+
+    items_queries = [
+        (
+            "product_id",
+            "order_product",
+            "AND item.order_menu_field_id IS NULL "
+            + (PRIORITY_PRODUCTS_FILTER if only_priority else ""),
+            summary.products,
+        )
+    ]
+    if not only_priority:
+        items_queries.append(("menu_id", "order_menu", "", summary.menus))
+
+    for field_name, items_table, items_filter, items in items_queries:
+        _, rows = await connection.execute_query(
+            ITEMS_SUMMARY_QUERY.format(
+                field_name=field_name,
+                items_table=items_table,
+                where=where,
+                items_filter=items_filter,
+            ),
+            params,
+        )
+
+        for row in rows:
+            _add_item(
+                items,
+                row["item_id"],
+                row["quantity"],
+                row["voucher_quantity"],
+                row["pending_quantity"],
+                row["total_price"],
+            )
+
+
+async def get_statistic_summary(
+    start_date: datetime.datetime | None,
+    end_date: datetime.datetime | None,
+    role_ids: list[int] | None,
+    only_priority: bool,
+    connection: BaseDBAsyncClient,
+) -> StatisticSummary:
+    """
+    Summarize the orders created strictly between start_date and end_date.
+
+    Whole days are read from the daily statistics, only the partial days at
+    the edges of the range are aggregated from the orders.
+    """
+
+    summary = StatisticSummary()
+
+    start_date = _to_utc(start_date) if start_date else None
+    end_date = _to_utc(end_date) if end_date else None
+
+    if start_date and end_date and start_date >= end_date:
+        return summary
+
+    # An order at exactly midnight is excluded by a start at midnight, so
+    # the first day is never whole
+    first_day = (
+        start_date.date() + datetime.timedelta(days=1) if start_date else None
+    )
+    last_day = (
+        end_date.date() - datetime.timedelta(days=1) if end_date else None
+    )
+
+    if first_day and last_day and first_day > last_day:
+        where = _build_orders_where(
+            created_after=start_date,
+            created_before=end_date,
+            role_ids=role_ids,
+        )
+        await _add_orders_statistics(summary, where, only_priority, connection)
+
+        return summary
+
+    days_filter = Q()
+    if first_day:
+        days_filter &= Q(day__gte=first_day)
+    if last_day:
+        days_filter &= Q(day__lte=last_day)
+
+    await _add_daily_statistics(
+        summary, days_filter, role_ids, only_priority, connection
+    )
+
+    if start_date:
+        where = _build_orders_where(
+            created_after=start_date,
+            created_before=_day_start(first_day),
+            role_ids=role_ids,
+        )
+        await _add_orders_statistics(summary, where, only_priority, connection)
+
+    if end_date and end_date > _day_start(end_date.date()):
+        where = _build_orders_where(
+            created_from=_day_start(end_date.date()),
+            created_before=end_date,
+            role_ids=role_ids,
+        )
+        await _add_orders_statistics(summary, where, only_priority, connection)
+
+    return summary
+
+
+async def get_pending_summary(
+    role_ids: list[int] | None,
+    only_confirmed: bool,
+    only_priority: bool,
+    connection: BaseDBAsyncClient,
+) -> StatisticSummary:
+    """
+    Summarize the orders created today.
+    """
+
+    summary = StatisticSummary()
+    start_date, end_date = get_day_bounds()
+
+    where = _build_orders_where(
+        created_after=start_date,
+        created_before=end_date,
+        role_ids=role_ids,
+        only_confirmed=only_confirmed,
+    )
+    await _add_orders_statistics(summary, where, only_priority, connection)
+
+    return summary
+
+
+def get_named_items(
+    summary: StatisticSummary,
+) -> list[tuple[str, Decimal, ItemStatistic]]:
+    """
+    Return name, current price and statistic of the products and then the
+    menus of a summary. Items no longer in the catalog are left out.
+    """
+
+    catalog = Session.catalog
+    result = []
+
+    for items, catalog_items in (
+        (summary.products, catalog.products),
+        (summary.menus, catalog.menus),
+    ):
+        for item_id, values in sorted(items.items()):
+            if item := catalog_items.get(item_id):
+                result.append((item.name, item.price, values))
+
+    return result
+
+
+async def get_order_summary(
+    order_id: int,
+    connection: BaseDBAsyncClient,
+    include_deleted: bool = False,
+) -> StatisticSummary:
+    """
+    Summarize a single order, empty if the order has been deleted unless
+    include_deleted is set.
+    """
+
+    summary = StatisticSummary()
+    where = (
+        "o.id = $1" if include_deleted else "NOT o.is_deleted AND o.id = $1"
+    )
+
+    await _add_orders_statistics(
+        summary, (where, [order_id]), False, connection
+    )
+
+    return summary
@@ -2,6 +2,7 @@ __all__ = (
     "Category",
     "Permission",
     "PrinterType",
+    "PrintJobStatus",
     "ErrorCodes",
     "generate_password",
     "to_snake_case",
@@ -19,7 +20,7 @@ __all__ = (
     "check_seat_range",
 )
 
-from .enums import Category, Permission, PrinterType
+from .enums import Category, Permission, PrinterType, PrintJobStatus
 from .error_codes import ErrorCodes
 from .text_utils import generate_password, to_snake_case
 from .token_jwt import TokenJwt, decode_jwt, encode_jwt, validate_token
@@ -0,0 +1,181 @@
+import asyncio
+import contextlib
+import json
+import uuid
+from typing import Awaitable, Callable
+
+import asyncpg
+from loguru import logger
+from tortoise import connections
+
+from backend.config import Session
+
+CHANNEL = "festival_cluster"
+ELECTION_INTERVAL = 5
+QUERY_TIMEOUT = 5
+
+# Key of the session advisory lock held by the leader. The lock is
+# released by the server when the connection of the leader is lost
+LEADER_LOCK_KEY = 7_214_004
+
+TRY_LOCK_QUERY = "SELECT pg_try_advisory_lock($1);"
+NOTIFY_QUERY = "SELECT pg_notify($1, $2);"
+
+Handler = Callable[[dict], Awaitable[None]]
+
+
+class Cluster:
+    """
+    Coordination of the worker processes sharing the database.
+
+    Each process keeps a dedicated connection, used to listen to the
+    events published by the other processes and to contend for the
+    leadership. Exactly one process at a time is the leader.
+    """
+
+    def __init__(self):
+        # Events sent by a process are not delivered back to it
+        self.id = uuid.uuid4().hex
+        self.is_leader = False
+        self.connection: asyncpg.Connection | None = None
+        self.handlers: dict[str, list[Handler]] = {}
+        self.on_elected: list[Callable[[], Awaitable[None]]] = []
+        self.on_demoted: list[Callable[[], Awaitable[None]]] = []
+        self.task: asyncio.Task | None = None
+        # Set when the connection is lost, the events sent until it is
+        # opened again are missed
+        self.wakeup = asyncio.Event()
+
+    def subscribe(self, event: str, handler: Handler):
+        """
+        Run handler for each event published by the other processes. It is
+        also run with no data after a reconnection, since the events sent
+        in the meantime are lost.
+        """
+
+        self.handlers.setdefault(event, []).append(handler)
+
+    async def publish(self, event: str, **data):
+        """
+        Send an event to the other processes. Must be called after the
+        transaction that made the change has been committed.
+        """
+
+        payload = json.dumps({"event": event, "sender": self.id, **data})
+
+        await connections.get("default").execute_query(
+            NOTIFY_QUERY, [CHANNEL, payload]
+        )
+
+    def start(self):
+        self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+
+        await self._disconnect()
+
+    async def _connect(self):
+        conf = Session.config
+        connection = await asyncpg.connect(
+            host=conf.DB_HOST,
+            port=conf.DB_PORT,
+            user=conf.DB_USERNAME,
+            password=conf.DB_PASSWORD,
+            database=conf.DB_NAME,
+            timeout=QUERY_TIMEOUT,
+        )
+
+        await connection.add_listener(CHANNEL, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+
+        self.connection = connection
+
+    async def _disconnect(self):
+        connection, self.connection = self.connection, None
+
+        if connection and not connection.is_closed():
+            connection.terminate()
+
+        await self._set_leader(False)
+
+    async def _run(self):
+        is_first = True
+
+        while True:
+            try:
+                if not self.connection or self.connection.is_closed():
+                    await self._connect()
+
+                    if not is_first:
+                        logger.warning("Riconnesso al cluster")
+                        self._dispatch({})
+
+                    is_first = False
+
+                if self.is_leader:
+                    # A leader that cannot reach the database steps down,
+                    # the server releases its lock in the meantime
+                    await self.connection.fetchval(
+                        "SELECT 1;", timeout=QUERY_TIMEOUT
+                    )
+                elif await self.connection.fetchval(
+                    TRY_LOCK_QUERY, LEADER_LOCK_KEY, timeout=QUERY_TIMEOUT
+                ):
+                    await self._set_leader(True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Connessione del cluster persa: {e}")
+                await self._disconnect()
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.wakeup.wait(), ELECTION_INTERVAL)
+
+            self.wakeup.clear()
+
+    async def _set_leader(self, is_leader: bool):
+        if is_leader == self.is_leader:
+            return
+
+        self.is_leader = is_leader
+        logger.info(
+            "Processo eletto leader"
+            if is_leader
+            else "Processo non più leader"
+        )
+
+        for callback in self.on_elected if is_leader else self.on_demoted:
+            try:
+                await callback()
+            except Exception as e:
+                logger.exception(e)
+
+    def _on_termination(self, _: asyncpg.Connection):
+        self.wakeup.set()
+
+        if self.is_leader:
+            asyncio.create_task(self._set_leader(False))
+
+    def _on_notification(self, _, __, ___, payload: str):
+        data = json.loads(payload)
+
+        if data.pop("sender") != self.id:
+            self._dispatch(data)
+
+    def _dispatch(self, data: dict):
+        event = data.pop("event", None)
+
+        for name, handlers in self.handlers.items():
+            if event is None or event == name:
+                for handler in handlers:
+                    asyncio.create_task(self._run_handler(handler, data))
+
+    @staticmethod
+    async def _run_handler(handler: Handler, data: dict):
+        try:
+            await handler(data)
+        except Exception as e:
+            logger.error("Errore nella gestione di un evento del cluster")
+            logger.exception(e)
@@ -21,3 +21,10 @@ class PrinterType(StrEnum):
     DRINKS = "drinks"
     FOOD = "food"
     FOOD_AND_DRINKS = "food_and_drinks"
+
+
+class PrintJobStatus(StrEnum):
+    QUEUED = "queued"
+    SENDING = "sending"
+    PRINTED = "printed"
+    FAILED = "failed"
@@ -0,0 +1,267 @@
+import bisect
+import json
+import math
+import os
+from pathlib import Path
+from typing import Iterable
+
+# Seconds, from a cached catalog listing to a slow printer
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+# Statements per request, the upper buckets show N+1 queries
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry: list["Metric"] = []
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    labels = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+
+    return f"{{{labels}}}" if labels else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+class Metric:
+    """
+    Metric kept in memory and rendered in the Prometheus text format.
+
+    The samples of the worker processes are summed when exported, those of
+    a process that exited included, so the metric never goes backwards.
+    """
+
+    type = "untyped"
+    # Rendered per process, with a worker label, instead of summed
+    is_per_worker = False
+
+    def __init__(
+        self, name: str, documentation: str, labels: tuple[str, ...] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.values: dict[tuple[str, ...], float] = {}
+
+        registry.append(self)
+
+    def _check_labels(self, labels: tuple) -> tuple[str, ...]:
+        if len(labels) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+
+        return tuple(str(x) for x in labels)
+
+    def dump(self) -> list:
+        return [[list(key), value] for key, value in self.values.items()]
+
+    def merge(self, samples: dict, dump: list, worker: str):
+        for key, value in dump:
+            key = (worker, *key) if self.is_per_worker else tuple(key)
+            samples[key] = samples.get(key, 0) + value
+
+    def _get_label_names(self) -> tuple[str, ...]:
+        return ("worker", *self.labels) if self.is_per_worker else self.labels
+
+    def _render_samples(self, samples: dict) -> list[str]:
+        names = self._get_label_names()
+
+        return [
+            f"{self.name}{_format_labels(names, key)} {_format_value(value)}"
+            for key, value in sorted(samples.items())
+        ]
+
+    def render(self, samples: dict) -> list[str]:
+        return [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+            *self._render_samples(samples),
+        ]
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels, value: float = 1):
+        key = self._check_labels(labels)
+        self.values[key] = self.values.get(key, 0) + value
+
+
+class Gauge(Metric):
+    type = "gauge"
+    is_per_worker = True
+
+    def set(self, *labels, value: float):
+        self.values[self._check_labels(labels)] = value
+
+    def clear(self):
+        self.values.clear()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: the count of each bucket, +Inf last, and the sum
+        self.series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, *labels, value: float):
+        key = self._check_labels(labels)
+
+        if key not in self.series:
+            self.series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+
+        counts, total = self.series[key]
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def dump(self) -> list:
+        return [
+            [list(key), counts, total[0]]
+            for key, (counts, total) in self.series.items()
+        ]
+
+    def merge(self, samples: dict, dump: list, worker: str):
+        for key, counts, total in dump:
+            key = tuple(key)
+
+            if key not in samples:
+                samples[key] = ([0] * len(counts), [0.0])
+
+            merged_counts, merged_total = samples[key]
+            for index, count in enumerate(counts):
+                merged_counts[index] += count
+            merged_total[0] += total
+
+    def _render_samples(self, samples: dict) -> list[str]:
+        lines = []
+
+        for key, (counts, total) in sorted(samples.items()):
+            cumulative = 0
+
+            for bucket, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                labels = _format_labels(
+                    (*self.labels, "le"), (*key, _format_value(bucket))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+        return lines
+
+
+def reset_metrics(directory: str):
+    """
+    Create the directory shared by the workers, dropping the metrics of an
+    earlier run. Called before the workers are started.
+    """
+
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    for path in Path(directory).glob("*.json"):
+        path.unlink(missing_ok=True)
+
+
+def dump_metrics() -> dict[str, list]:
+    return {x.name: x.dump() for x in registry}
+
+
+def write_metrics(directory: str):
+    """
+    Write the metrics of this process to the directory shared by the
+    workers. The file is replaced at once, so a scrape never reads it
+    half written.
+    """
+
+    path = Path(directory, f"{os.getpid()}.json")
+    temporary_path = path.with_suffix(".tmp")
+
+    temporary_path.write_text(json.dumps(dump_metrics()))
+    os.replace(temporary_path, path)
+
+
+def _read_metrics(directory: str) -> dict[int, dict[str, list]]:
+    dumps = {}
+
+    for path in Path(directory).glob("*.json"):
+        try:
+            dumps[int(path.stem)] = json.loads(path.read_text())
+        except (OSError, ValueError):
+            # Removed or replaced in the meantime
+            continue
+
+    return dumps
+
+
+def render_metrics(directory: str | None = None) -> str:
+    """
+    Render the metrics of this process, and those written by the other
+    workers to directory when it is set.
+    """
+
+    dumps = _read_metrics(directory) if directory else {}
+    # The values of this process are current, its file may be older
+    dumps[os.getpid()] = dump_metrics()
+    alive = {pid for pid in dumps if _is_alive(pid)}
+
+    lines = []
+
+    for metric in registry:
+        samples = {}
+
+        for pid, dump in dumps.items():
+            # The gauges of an exited process no longer hold
+            if metric.is_per_worker and pid not in alive:
+                continue
+
+            if metric.name in dump:
+                metric.merge(samples, dump[metric.name], str(pid))
+
+        lines.extend(metric.render(samples))
+
+    return "\n".join(lines) + "\n"
@@ -3,21 +3,34 @@ from __future__ import annotations
 import re
 import typing
 import textwrap
+from collections import OrderedDict
 
 import pytz
-from tortoise.models import ReverseRelation
+from escpos.printer import Dummy
 
 from backend.config import Session
 from backend.utils import PrinterType, Category
 
 if typing.TYPE_CHECKING:
-    from backend.database.models import Order, OrderProduct, OrderMenu
+    from backend.models.settings import Settings
+    from backend.services.order_view import (
+        OrderView,
+        OrderViewMenu,
+        OrderViewProduct,
+    )
+
+DOUBLE_PATTERN = re.compile(r"<DOUBLE>(.*?)</DOUBLE>", re.DOTALL)
+DOUBLE_SIZE_ON = b"\x1b\x21\x30"
+DOUBLE_SIZE_OFF = b"\x1b\x21\x00"
+TICKET_CACHE_SIZE = 256
+
+_ticket_cache: OrderedDict[tuple, tuple[Settings, bytes]] = OrderedDict()
 
 
 class OrderTextManager:
     MAX_WIDTH = 42
 
-    def __init__(self, order: Order):
+    def __init__(self, order: OrderView):
         self.order = order
 
     @staticmethod
@@ -57,8 +70,8 @@ class OrderTextManager:
         return text[:cut_len] + placeholder
 
     @staticmethod
-    async def _get_products_data(
-        order_products: list[OrderProduct],
+    def _get_products_data(
+        order_products: typing.Iterable[OrderViewProduct],
         include_price: bool = False,
         is_menu: bool = False,
         only_food: bool = False,
@@ -70,27 +83,18 @@ class OrderTextManager:
             if order_product.order_menu_field_id and not is_menu:
                 continue
 
-            product = await order_product.product
-
-            if only_food and product.category != Category.FOOD:
+            if only_food and order_product.category != Category.FOOD:
                 continue
 
-            if only_drinks and product.category != Category.DRINK:
+            if only_drinks and order_product.category != Category.DRINK:
                 continue
 
             product_quantity = order_product.quantity
-            product_name = product.short_name
-
-            product_variant = ""
-            if (variant := order_product.variant) is not None:
-                if (v := await variant) is not None:
-                    product_variant = v.name
+            product_name = order_product.short_name
+            product_variant = order_product.variant_name or ""
 
             product_ingredients = " ".join(
-                [
-                    f"+{order_product_ingredient.product_ingredient.name}"
-                    for order_product_ingredient in order_product.order_product_ingredients
-                ]
+                [f"+{x}" for x in order_product.ingredient_names]
             )
 
             product_main_text = product_name
@@ -114,9 +118,9 @@ class OrderTextManager:
         return products
 
     @classmethod
-    async def _get_products_text(
+    def _get_products_text(
         cls,
-        order_products: list[OrderProduct],
+        order_products: list[OrderViewProduct],
         include_price: bool = False,
         max_width: int = MAX_WIDTH,
         only_food: bool = False,
@@ -124,7 +128,7 @@ class OrderTextManager:
     ) -> str:
         product_blocks = []
 
-        products_data = await cls._get_products_data(
+        products_data = cls._get_products_data(
             order_products, include_price, False, only_food, only_drinks
         )
 
@@ -187,16 +191,16 @@ class OrderTextManager:
         return "\n".join(product_blocks)
 
     @classmethod
-    async def _get_menu_data(
+    def _get_menu_data(
         cls,
-        order_menu: ReverseRelation[OrderMenu],
+        order_menu: typing.Iterable[OrderViewMenu],
         include_price: bool = False,
     ) -> list[dict]:
         menus = []
 
         for order in order_menu:
             menu_quantity = order.quantity
-            order_name = (await order.menu).short_name
+            order_name = order.short_name
             menu_unit_cost = order.price / menu_quantity
             menu_price = order.price if include_price else None
 
@@ -205,10 +209,7 @@ class OrderTextManager:
                 "name": order_name,
                 "unit_price": menu_unit_cost,
                 "price": menu_price,
-                "products_per_field": [
-                    x.order_menu_field_products
-                    for x in order.order_menu_fields
-                ],
+                "products_per_field": order.fields,
             }
 
             menus.append(menu_data)
@@ -216,17 +217,17 @@ class OrderTextManager:
         return menus
 
     @classmethod
-    async def _get_menu_products_text(
+    def _get_menu_products_text(
         cls,
-        order_products: ReverseRelation[OrderProduct],
+        order_products: typing.Iterable[OrderViewProduct],
         max_width: int = MAX_WIDTH,
         only_food: bool = False,
         only_drinks: bool = False,
     ):
         blocks = []
 
-        products_data = await cls._get_products_data(
-            list(order_products),
+        products_data = cls._get_products_data(
+            order_products,
             include_price=False,
             is_menu=True,
             only_food=only_food,
@@ -268,15 +269,15 @@ class OrderTextManager:
         return "\n".join(blocks)
 
     @classmethod
-    async def _get_menu_text(
+    def _get_menu_text(
         cls,
-        order_menu: ReverseRelation[OrderMenu],
+        order_menu: typing.Iterable[OrderViewMenu],
         include_price: bool = False,
         only_food: bool = False,
         only_drinks: bool = False,
     ) -> str:
         menu_blocks = []
-        menu_data = await cls._get_menu_data(order_menu, include_price)
+        menu_data = cls._get_menu_data(order_menu, include_price)
 
         for menu in menu_data:
             lines = []
@@ -311,7 +312,7 @@ class OrderTextManager:
                 lines.append(f"{indent}<DOUBLE>{shortened}</DOUBLE>")
 
             for product_list in products_per_field:
-                menu_products_text = await cls._get_menu_products_text(
+                menu_products_text = cls._get_menu_products_text(
                     product_list,
                     max_width=width,
                     only_food=only_food,
@@ -328,23 +329,13 @@ class OrderTextManager:
 
         return "\n".join(menu_blocks)
 
-    async def _get_ordered_products(self) -> list[OrderProduct]:
-        enriched_products = []
-
-        for op in self.order.order_products:
-            product = await op.product
-            subcategory = await product.subcategory if product else None
-
-            subcategory_order = subcategory.order if subcategory else 0
-            product_order = product.order if product else 0
-
-            enriched_products.append(
-                ((subcategory_order, product_order, op.id), op)
-            )
-
-        return [op for _, op in sorted(enriched_products)]
+    def _get_ordered_products(self) -> list[OrderViewProduct]:
+        return sorted(
+            self.order.products,
+            key=lambda x: (x.subcategory_order, x.order, x.id),
+        )
 
-    async def _get_header(self) -> str:
+    def _get_header(self) -> str:
         result = ""
 
         for x in Session.settings.receipt_header.split("\n"):
@@ -355,7 +346,7 @@ class OrderTextManager:
 
         result += f"* Scontrino n. {self.order.id}\n"
         result += "* Operatore di cassa:\n"
-        result += " " * 4 + self.order.user.username + "\n"
+        result += " " * 4 + self.order.username + "\n"
         result += (
             "* "
             + self.order.created_at.astimezone(
@@ -385,7 +376,7 @@ class OrderTextManager:
                 result += (
                     "* Tavolo: " + str(self.order.parent_order.table) + "\n"
                 )
-            if self.order.is_confirm:
+            if self.order.is_confirm and self.order.confirmed_at:
                 result += (
                     "* Data conferma: "
                     + self.order.confirmed_at.astimezone(
@@ -395,7 +386,7 @@ class OrderTextManager:
                 )
 
         if self.order.parent_order:
-            result += "* Aggiunta a: " + str(self.order.parent_order_id) + "\n"
+            result += "* Aggiunta a: " + str(self.order.parent_order.id) + "\n"
 
         if self.order.is_voucher:
             result += "* Buono: si" + "\n"
@@ -407,8 +398,8 @@ class OrderTextManager:
 
         return result
 
-    async def _render_receipt_text(self) -> str:
-        receipt_text = await self._get_header()
+    def _render_receipt_text(self) -> str:
+        receipt_text = self._get_header()
 
         if (
             not self.order.is_take_away
@@ -425,15 +416,15 @@ class OrderTextManager:
             )
             receipt_text += "\n"
 
-        products_text = await self._get_products_text(
-            await self._get_ordered_products(), True
+        products_text = self._get_products_text(
+            self._get_ordered_products(), True
         )
         receipt_text += products_text
 
         if products_text:
             receipt_text += "\n"
 
-        menu_text = await self._get_menu_text(self.order.order_menus, True)
+        menu_text = self._get_menu_text(self.order.menus, True)
         receipt_text += menu_text
 
         if menu_text:
@@ -448,10 +439,10 @@ class OrderTextManager:
 
         return receipt_text
 
-    async def _render_kitchen_text(
+    def _render_kitchen_text(
         self, only_food: bool = False, only_drinks: bool = False
     ) -> str:
-        kitchen_text = await self._get_header()
+        kitchen_text = self._get_header()
 
         if (
             not self.order.is_take_away
@@ -461,8 +452,8 @@ class OrderTextManager:
             kitchen_text += f"x{self.order.guests} <DOUBLE>Coperti</DOUBLE>"
             kitchen_text += "\n"
 
-        products_text = await self._get_products_text(
-            await self._get_ordered_products(),
+        products_text = self._get_products_text(
+            self._get_ordered_products(),
             only_food=only_food,
             only_drinks=only_drinks,
         )
@@ -471,8 +462,8 @@ class OrderTextManager:
         if products_text:
             kitchen_text += "\n"
 
-        menu_text = await self._get_menu_text(
-            self.order.order_menus,
+        menu_text = self._get_menu_text(
+            self.order.menus,
             only_food=only_food,
             only_drinks=only_drinks,
         )
@@ -480,7 +471,7 @@ class OrderTextManager:
 
         return kitchen_text
 
-    async def generate_text_for_printer(self, printer_type: PrinterType):
+    def generate_text_for_printer(self, printer_type: PrinterType) -> str:
         printer_formatters = {
             PrinterType.RECEIPT: self._render_receipt_text,
             PrinterType.DRINKS: lambda: self._render_kitchen_text(
@@ -492,4 +483,56 @@ class OrderTextManager:
             PrinterType.FOOD_AND_DRINKS: self._render_kitchen_text,
         }
 
-        return await printer_formatters[printer_type]()
+        return printer_formatters[printer_type]()
+
+    @staticmethod
+    def compile_ticket(text: str, order_id: int) -> bytes:
+        """
+        Compile the text of a ticket into the ESC/POS commands sent to the
+        printer, barcode and cut included.
+        """
+
+        printer = Dummy()
+        printer.set(align="left", font="a")
+
+        # Odd parts are the contents of the <DOUBLE> tags
+        for index, part in enumerate(DOUBLE_PATTERN.split(text)):
+            if not part:
+                continue
+
+            if index % 2:
+                printer._raw(DOUBLE_SIZE_ON)
+                printer.text(part)
+                printer._raw(DOUBLE_SIZE_OFF)
+            else:
+                printer.text(part)
+
+        printer.barcode(f"{{B{order_id}", "CODE128", height=100, width=3)
+        printer.cut()
+
+        return printer.output
+
+    def generate_ticket_for_printer(self, printer_type: PrinterType) -> bytes:
+        # Confirmation changes the header, settings are replaced on update
+        key = (
+            self.order.id,
+            printer_type,
+            self.order.is_confirm,
+            self.order.table,
+            self.order.confirmed_at,
+        )
+        cached = _ticket_cache.get(key)
+
+        if cached and cached[0] is Session.settings:
+            _ticket_cache.move_to_end(key)
+            return cached[1]
+
+        ticket = self.compile_ticket(
+            self.generate_text_for_printer(printer_type), self.order.id
+        )
+
+        _ticket_cache[key] = (Session.settings, ticket)
+        if len(_ticket_cache) > TICKET_CACHE_SIZE:
+            _ticket_cache.popitem(last=False)
+
+        return ticket
@@ -1,17 +1,15 @@
 from decimal import Decimal
+from typing import Iterator
 
-from tortoise import BaseDBAsyncClient
+from tortoise import BaseDBAsyncClient, Model
 
 from backend.config import Session
 from backend.database.models import (
-    Menu,
-    MenuField,
     Order,
     OrderMenu,
     OrderMenuField,
     OrderProduct,
     OrderProductIngredient,
-    Product,
     Role,
 )
 from backend.models.orders import (
@@ -20,14 +18,18 @@ from backend.models.orders import (
     CreateOrderMenuFieldItem,
     CreateOrderItem,
 )
-from backend.services.orders import get_today_quantities
+from backend.services.catalog import (
+    CatalogMenu,
+    CatalogMenuField,
+    CatalogProduct,
+)
 from backend.utils import ErrorCodes
 
 ZERO_DECIMAL = Decimal("0.00")
 
 
 async def _check_generic_product(
-    product_db: Product,
+    product_db: CatalogProduct,
     product: CreateOrderProductItem,
     is_menu: bool = False,
 ) -> tuple[bool, ErrorCodes | None]:
@@ -38,7 +40,7 @@ async def _check_generic_product(
         product_price = ZERO_DECIMAL
 
     # Extract variants and their IDs
-    product_variants = {variant.id: variant for variant in product_db.variants}
+    product_variants = product_db.variants
 
     # Validate variants
     if product_variants and not product.variant_id:
@@ -76,9 +78,7 @@ async def _check_generic_product(
         product_price += Decimal(product_variant.price).quantize(ZERO_DECIMAL)
 
     # Extract ingredients and their IDs
-    product_ingredients = {
-        ingredient.id: ingredient for ingredient in product_db.ingredients
-    }
+    product_ingredients = product_db.ingredients
 
     # Validate ingredients
     if len(set(x.ingredient_id for x in product.ingredients)) != len(
@@ -121,7 +121,7 @@ async def _check_generic_product(
 
     # Assign calculated price to the product
     product._price = product_price
-    product._has_cover_charge = product_db.subcategory.include_cover_charge
+    product._has_cover_charge = product_db.include_cover_charge
 
     return False, None
 
@@ -129,36 +129,28 @@ async def _check_generic_product(
 async def check_products(
     products: list[CreateOrderProductItem],
     role_id: int,
-    connection: BaseDBAsyncClient,
 ) -> tuple[bool, ErrorCodes | None]:
     product_ids = {x.product_id for x in products}  # Extract product IDs
 
-    # Get products from DB
-    products_db = (
-        Product.filter(id__in=product_ids)
-        .prefetch_related(
-            "dates", "ingredients", "roles", "variants", "subcategory"
-        )
-        .using_db(connection)
-    )
-
-    # Get today's quantities
-    today_quantities = await get_today_quantities(product_ids, connection)
+    # Get products from the catalog snapshot
+    catalog = Session.catalog
+    products_db = [
+        catalog.products[product_id]
+        for product_id in sorted(product_ids)
+        if product_id in catalog.products
+    ]
 
     # Check if all products exist
-    total_count = await products_db.count()
-    if total_count != len(product_ids):
+    if len(products_db) != len(product_ids):
         return True, ErrorCodes.PRODUCT_NOT_EXIST
 
-    for product in await products_db:
+    for product in products_db:
         # Check if role is valid for the product
-        if not any(role.role_id == role_id for role in product.roles):
+        if role_id not in product.role_ids:
             return True, ErrorCodes.PRODUCT_ROLE_NOT_EXIST
 
         # Check if any product date is valid
-        if not any(
-            [await date.is_valid_product_date() for date in product.dates]
-        ):
+        if not any(date.is_valid() for date in product.dates):
             return True, ErrorCodes.PRODUCT_DATE_NOT_VALID
 
         # Validate each relevant product in the order
@@ -166,15 +158,6 @@ async def check_products(
             p for p in products if p.product_id == product.id
         ]
 
-        ordered_quantity = sum(x.quantity for x in order_items_for_product)
-
-        if (
-            product.daily_max_sales
-            and (today_quantities.get(product.id, 0) + ordered_quantity)
-            > product.daily_max_sales
-        ):
-            return True, ErrorCodes.PRODUCT_DAILY_LIMIT_EXCEEDED
-
         for product_order in order_items_for_product:
             is_invalid, error_code = await _check_generic_product(
                 product, product_order
@@ -190,39 +173,10 @@ async def check_products(
     return False, None
 
 
-async def create_order_products(
-    products: list[CreateOrderProductItem],
-    order: Order,
-    connection: BaseDBAsyncClient,
-    order_menu_field: OrderMenuField | None = None,
-) -> bool:
-    for product in products:
-        order_product = await OrderProduct.create(
-            product_id=product.product_id,
-            price=product._price,
-            quantity=product.quantity,
-            variant_id=product.variant_id,
-            order=order,
-            order_menu_field=order_menu_field,
-            using_db=connection,
-        )
-
-        for ingredient in product.ingredients:
-            await OrderProductIngredient.create(
-                order_product=order_product,
-                product_ingredient_id=ingredient.ingredient_id,
-                using_db=connection,
-            )
-
-    return True
-
-
 async def _check_menu_field_products(
-    menu_field: MenuField, order_menu_field: CreateOrderMenuFieldItem
+    menu_field: CatalogMenuField, order_menu_field: CreateOrderMenuFieldItem
 ) -> tuple[bool, ErrorCodes | None]:
-    menu_field_product_ids = {
-        product.product_id for product in menu_field.field_products
-    }
+    menu_field_product_ids = set(menu_field.field_products)
     order_menu_field_product_ids = {
         product.product_id for product in order_menu_field.products
     }
@@ -248,9 +202,7 @@ async def _check_menu_field_products(
     ):
         return True, ErrorCodes.MENU_FIELD_PRODUCT_QUANTITY_EXCEEDED
 
-    menu_field_product = {
-        product.product_id: product for product in menu_field.field_products
-    }
+    menu_field_product = menu_field.field_products
 
     for product in reversed(order_menu_field.products):
         # Validate each product using the generic product checker
@@ -289,11 +241,13 @@ async def _check_menu_field_products(
 
 
 async def _check_menu_fields(
-    menu: Menu, order_menu: CreateOrderMenuItem
+    menu: CatalogMenu, order_menu: CreateOrderMenuItem
 ) -> tuple[bool, ErrorCodes | None]:
-    menu_field_ids = {field.id for field in menu.menu_fields}
+    menu_field_ids = set(menu.menu_fields)
     menu_field_obligatory_ids = {
-        field.id for field in menu.menu_fields if not field.is_optional
+        field.id
+        for field in menu.menu_fields.values()
+        if not field.is_optional
     }
     order_menu_field_ids = {field.menu_field_id for field in order_menu.fields}
 
@@ -309,7 +263,7 @@ async def _check_menu_fields(
     if not order_menu_field_ids.issubset(menu_field_ids):
         return True, ErrorCodes.MENU_FIELD_NOT_EXIST
 
-    menu_fields = {field.id: field for field in menu.menu_fields}
+    menu_fields = menu.menu_fields
     menu_price = Decimal(menu.price).quantize(ZERO_DECIMAL)
 
     for field in order_menu.fields:
@@ -340,54 +294,33 @@ async def _check_menu_fields(
 async def check_menus(
     menus: list[CreateOrderMenuItem],
     role_id: int,
-    connection: BaseDBAsyncClient,
 ) -> tuple[bool, ErrorCodes | None]:
     menu_ids = {menu.menu_id for menu in menus}
 
-    # Get menus from DB
-    menu_db = (
-        Menu.filter(id__in=menu_ids)
-        .prefetch_related(
-            "dates",
-            "menu_fields",
-            "menu_fields__field_products",
-            "menu_fields__field_products__product__subcategory",
-            "menu_fields__field_products__product__ingredients",
-            "menu_fields__field_products__product__variants",
-            "roles",
-        )
-        .using_db(connection)
-    )
-
-    # Get today's quantities
-    today_quantities = await get_today_quantities(menu_ids, connection)
+    # Get menus from the catalog snapshot
+    catalog = Session.catalog
+    menu_db = [
+        catalog.menus[menu_id]
+        for menu_id in sorted(menu_ids)
+        if menu_id in catalog.menus
+    ]
 
-    # Check if all products exist
-    total_count = await menu_db.count()
-    if total_count != len(menu_ids):
+    # Check if all menus exist
+    if len(menu_db) != len(menu_ids):
         return True, ErrorCodes.MENU_NOT_EXIST
 
-    for menu in await menu_db:
+    for menu in menu_db:
         # Check if role is valid for the product
-        if not any(role.role_id == role_id for role in menu.roles):
+        if role_id not in menu.role_ids:
             return True, ErrorCodes.MENU_ROLE_NOT_EXIST
 
         # Check if any product date is valid
-        if not any([await date.is_valid_menu_date() for date in menu.dates]):
+        if not any(date.is_valid() for date in menu.dates):
             return True, ErrorCodes.MENU_DATE_NOT_VALID
 
         # Filter relevant menus for the order
         order_items_for_menu = [m for m in menus if m.menu_id == menu.id]
 
-        ordered_quantity = sum(x.quantity for x in order_items_for_menu)
-
-        if (
-            menu.daily_max_sales
-            and (today_quantities.get(menu.id, 0) + ordered_quantity)
-            > menu.daily_max_sales
-        ):
-            return True, ErrorCodes.MENU_DAILY_LIMIT_EXCEEDED
-
         for order_menu in order_items_for_menu:
             # Validate menu fields
             is_invalid, error_code = await _check_menu_fields(menu, order_menu)
@@ -403,31 +336,137 @@ async def check_menus(
     return False, None
 
 
-async def create_order_menus(
+async def _allocate_ids(
+    counts: dict[type[Model], int],
+    connection: BaseDBAsyncClient,
+) -> dict[type[Model], Iterator[int]]:
+    """
+    Reserve primary keys for the rows of each model in a single query, so
+    that children can reference their parents before these are inserted.
+    """
+
+    models = [model for model, count in counts.items() if count]
+
+    if not models:
+        return {}
+
+    tables = [model._meta.db_table for model in models]
+    columns = [
+        f"ARRAY(SELECT nextval(pg_get_serial_sequence('\"{table}\"', 'id'))"
+        f" FROM generate_series(1, ${i}::int)) AS {table}"
+        for i, table in enumerate(tables, start=1)
+    ]
+
+    _, rows = await connection.execute_query(
+        f"SELECT {', '.join(columns)};",
+        [counts[model] for model in models],
+    )
+
+    return {model: iter(rows[0][model._meta.db_table]) for model in models}
+
+
+def _build_order_products(
+    products: list[CreateOrderProductItem],
+    order: Order,
+    ids: dict[type[Model], Iterator[int]],
+    order_products: list[OrderProduct],
+    order_product_ingredients: list[OrderProductIngredient],
+    order_menu_field_id: int | None = None,
+) -> None:
+    for product in products:
+        order_product = OrderProduct(
+            id=next(ids[OrderProduct]),
+            product_id=product.product_id,
+            price=product._price,
+            quantity=product.quantity,
+            variant_id=product.variant_id,
+            order_id=order.id,
+            order_menu_field_id=order_menu_field_id,
+        )
+        order_products.append(order_product)
+
+        for ingredient in product.ingredients:
+            order_product_ingredients.append(
+                OrderProductIngredient(
+                    id=next(ids[OrderProductIngredient]),
+                    order_product_id=order_product.id,
+                    product_ingredient_id=ingredient.ingredient_id,
+                )
+            )
+
+
+async def create_order_items(
+    products: list[CreateOrderProductItem],
     menus: list[CreateOrderMenuItem],
     order: Order,
     connection: BaseDBAsyncClient,
 ) -> bool:
+    menu_products = [
+        product
+        for menu in menus
+        for field in menu.fields
+        for product in field.products
+    ]
+
+    ids = await _allocate_ids(
+        {
+            OrderMenu: len(menus),
+            OrderMenuField: sum(len(menu.fields) for menu in menus),
+            OrderProduct: len(products) + len(menu_products),
+            OrderProductIngredient: sum(
+                len(product.ingredients)
+                for product in products + menu_products
+            ),
+        },
+        connection,
+    )
+
+    order_menus = []
+    order_menu_fields = []
+    order_products = []
+    order_product_ingredients = []
+
+    _build_order_products(
+        products, order, ids, order_products, order_product_ingredients
+    )
+
     for menu in menus:
-        order_menu = await OrderMenu.create(
+        order_menu = OrderMenu(
+            id=next(ids[OrderMenu]),
             menu_id=menu.menu_id,
             price=menu._price,
             quantity=menu.quantity,
-            order=order,
-            using_db=connection,
+            order_id=order.id,
         )
+        order_menus.append(order_menu)
 
         for field in menu.fields:
-            order_menu_field = await OrderMenuField.create(
-                order_menu=order_menu,
+            order_menu_field = OrderMenuField(
+                id=next(ids[OrderMenuField]),
+                order_menu_id=order_menu.id,
                 menu_field_id=field.menu_field_id,
-                using_db=connection,
             )
-
-            await create_order_products(
-                field.products, order, connection, order_menu_field
+            order_menu_fields.append(order_menu_field)
+
+            _build_order_products(
+                field.products,
+                order,
+                ids,
+                order_products,
+                order_product_ingredients,
+                order_menu_field.id,
             )
 
+    # Insert each level with a single statement, parents first
+    for model, rows in (
+        (OrderMenu, order_menus),
+        (OrderMenuField, order_menu_fields),
+        (OrderProduct, order_products),
+        (OrderProductIngredient, order_product_ingredients),
+    ):
+        if rows:
+            await model.bulk_create(rows, using_db=connection)
+
     return True
 
 
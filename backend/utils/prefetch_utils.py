@@ -0,0 +1,118 @@
+from typing import Mapping, Type
+
+from tortoise import Model
+from tortoise.query_utils import Prefetch
+
+from backend.database.models import ProductIngredient, ProductVariant
+
+# A relation paired with a model has its deleted rows left out
+PlanRelation = str | tuple[str, Type[Model]]
+
+# Each include flag of a to_dict tree mapped to the relation it reads. A
+# flag only takes effect when the flags it extends are set too, as
+# include_fields_products_dates needs include_fields_products and
+# include_fields
+PRODUCT_PREFETCH_PLAN: Mapping[str, PlanRelation] = {
+    "include_dates": "dates",
+    "include_ingredients": ("ingredients", ProductIngredient),
+    "include_roles": "roles",
+    "include_variants": ("variants", ProductVariant),
+}
+
+MENU_PREFETCH_PLAN: Mapping[str, PlanRelation] = {
+    "include_dates": "dates",
+    "include_fields": "menu_fields",
+    "include_fields_products": "menu_fields__field_products__product",
+    "include_fields_products_dates": (
+        "menu_fields__field_products__product__dates"
+    ),
+    "include_fields_products_ingredients": (
+        "menu_fields__field_products__product__ingredients",
+        ProductIngredient,
+    ),
+    "include_fields_products_roles": (
+        "menu_fields__field_products__product__roles"
+    ),
+    "include_fields_products_variants": (
+        "menu_fields__field_products__product__variants",
+        ProductVariant,
+    ),
+    "include_roles": "roles",
+}
+
+ORDER_PREFETCH_PLAN: Mapping[str, PlanRelation] = {
+    "include_menus": "order_menus",
+    "include_menus_menu": "order_menus__menu",
+    "include_menus_menu_dates": "order_menus__menu__dates",
+    "include_menus_menu_fields": "order_menus__menu__menu_fields",
+    "include_menus_menu_fields_products": (
+        "order_menus__menu__menu_fields__field_products__product"
+    ),
+    "include_menus_menu_fields_products_dates": (
+        "order_menus__menu__menu_fields__field_products__product__dates"
+    ),
+    "include_menus_menu_fields_products_ingredients": (
+        "order_menus__menu__menu_fields__field_products__product__ingredients"
+    ),
+    "include_menus_menu_fields_products_roles": (
+        "order_menus__menu__menu_fields__field_products__product__roles"
+    ),
+    "include_menus_menu_fields_products_variants": (
+        "order_menus__menu__menu_fields__field_products__product__variants"
+    ),
+    "include_menus_menu_roles": "order_menus__menu__roles",
+    "include_menus_fields": "order_menus__order_menu_fields",
+    "include_menus_fields_products": (
+        "order_menus__order_menu_fields__order_menu_field_products"
+    ),
+    "include_menus_fields_products_ingredients": (
+        "order_menus__order_menu_fields__order_menu_field_products"
+        "__order_product_ingredients"
+    ),
+    "include_products": "order_products",
+    "include_products_product": "order_products__product",
+    "include_products_product_dates": "order_products__product__dates",
+    "include_products_product_ingredients": (
+        "order_products__product__ingredients"
+    ),
+    "include_products_product_roles": "order_products__product__roles",
+    "include_products_product_variants": "order_products__product__variants",
+    "include_products_ingredients": (
+        "order_products__order_product_ingredients"
+    ),
+    "include_user": "user",
+    "include_confirmer_user": "confirmed_by",
+}
+
+
+def plan_prefetch(
+    plan: Mapping[str, PlanRelation], include: Mapping[str, bool]
+) -> list[str | Prefetch]:
+    """
+    Return the relations to prefetch for the include flags of a to_dict
+    tree, leaving out the ones that would not be read.
+    """
+
+    relations = [
+        relation
+        for flag, relation in plan.items()
+        if all(
+            include.get(x)
+            for x in plan
+            if x == flag or flag.startswith(f"{x}_")
+        )
+    ]
+    names = [x if isinstance(x, str) else x[0] for x in relations]
+
+    result = []
+    for relation in relations:
+        if isinstance(relation, tuple):
+            name, model = relation
+            result.append(
+                Prefetch(name, queryset=model.filter(is_deleted=False))
+            )
+        # A nested relation fetches the relations it goes through
+        elif not any(x.startswith(f"{relation}__") for x in names):
+            result.append(relation)
+
+    return result
@@ -1,234 +1,575 @@
 import asyncio
-import re
+import time
 
 from escpos.printer import Network
 from loguru import logger
-
-from backend.database.models import Order, Printer, OrderPrinter
-from backend.utils import PrinterType
+from tortoise import timezone
+from tortoise.transactions import in_transaction
+
+from backend.database.models import (
+    Order,
+    Printer,
+    OrderPrinter,
+    PrintJob,
+    RolePrinter,
+)
+from backend.services.order_view import (
+    ORDER_VIEW_PREFETCH_VALUES,
+    build_order_view,
+)
+from backend.utils import PrinterType, PrintJobStatus
+from backend.utils.cluster import Cluster
+from backend.utils.metrics import Counter, Gauge, Histogram
 from backend.utils.order_text_manager import OrderTextManager
+from backend.utils.printer_connection import PrinterConnection
 
+BURST_SIZE = 10
 MAX_RETRY_DELAY = 60
+RECONCILE_INTERVAL = 60
 RETRY_DELAY = 5
+SEND_LEASE = 30
 STEP = 2
 
+ORDER_PREFETCH_VALUES = (
+    *ORDER_VIEW_PREFETCH_VALUES,
+    "user__role__printers",
+    "user__role__order_confirmer__printers",
+    "order_printers",
+)
+
+# A job left in sending by a crashed worker is claimable again once its
+# lease expires
+CLAIM_PRINT_JOB_QUERY = """
+UPDATE print_job
+SET status = 'sending',
+    attempts = attempts + 1,
+    next_retry = now() + make_interval(secs => $2)
+WHERE id IN (
+    SELECT id
+    FROM print_job
+    WHERE printer_id = $1 AND status <> 'printed' AND next_retry <= now()
+    ORDER BY id
+    LIMIT $3
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, order_id, role_printer_id, printer_type, payload, attempts;
+"""
+
+QUEUE_DEPTH_QUERY = """
+SELECT status, count(*) AS jobs
+FROM print_job
+WHERE printer_id = $1 AND status <> 'printed'
+GROUP BY status;
+"""
+
+FAIL_PRINT_JOB_QUERY = """
+UPDATE print_job
+SET status = 'failed',
+    last_error = $2,
+    next_retry = now() + make_interval(secs => $3)
+WHERE id = $1;
+"""
+
+# Jobs of a burst left unsent keep their place in the queue
+RELEASE_PRINT_JOBS_QUERY = """
+UPDATE print_job
+SET status = 'queued',
+    attempts = attempts - 1,
+    next_retry = now() + make_interval(secs => $2)
+WHERE id = ANY($1::int[]);
+"""
+
+print_queue_depth = Gauge(
+    "festival_print_queue_jobs",
+    "Print jobs not printed yet, by printer and status, on the leader.",
+    ("printer", "status"),
+)
+print_attempts = Counter(
+    "festival_print_attempts_total",
+    "Print jobs sent to a printer, by result.",
+    ("printer", "result"),
+)
+print_render_duration = Histogram(
+    "festival_print_render_seconds",
+    "Time spent rendering the ticket of an order for a printer type.",
+    ("printer_type",),
+)
+print_send_duration = Histogram(
+    "festival_print_send_seconds",
+    "Time spent sending a burst of tickets to a printer.",
+    ("printer",),
+)
+
 
 class PrintManager:
-    def __init__(self):
-        self.queues: dict[int, asyncio.Queue] = {}
-        self.printers: dict[int, Network] = {}
-        self.in_progress: set[tuple[int, int]] = set()
+    """
+    Every process renders and queues the print jobs of its orders, only
+    the leader of the cluster runs the printer workers. The other
+    processes wake them through the cluster events.
+    """
 
-        asyncio.create_task(self.update_worker())
+    def __init__(self, cluster: Cluster):
+        self.cluster = cluster
+        self.printers: dict[int, PrinterConnection] = {}
+        self.wakeups: dict[int, asyncio.Event] = {}
+        self.notifications: asyncio.Queue[int] = asyncio.Queue()
+
+        asyncio.create_task(self.dispatch_worker())
 
     @classmethod
-    async def create(cls):
-        new_obj = cls()
-        printers = await Printer.all()
+    async def create(cls, cluster: Cluster):
+        new_obj = cls(cluster)
+
+        cluster.on_elected.append(new_obj._start)
+        cluster.on_demoted.append(new_obj._stop)
+        cluster.subscribe("print", new_obj._on_print)
+        cluster.subscribe("printers", new_obj._on_printers)
 
-        for printer in printers:
-            new_obj.add_printer(printer.id, printer.ip_address)
+        if cluster.is_leader:
+            await new_obj._start()
 
         return new_obj
 
-    def add_printer(self, printer_id: int, printer_ip_address: str):
-        if printer_id not in self.printers:
-            self.printers[printer_id] = Network(printer_ip_address, timeout=5)
-            self.queues[printer_id] = asyncio.Queue()
-            asyncio.create_task(self._worker(printer_id))
-
-    async def update_worker(self):
-        prefetch_values = [
-            "order_menus__order_menu_fields__order_menu_field_products__order_product_ingredients__product_ingredient",
-            "order_menus__menu",
-            "order_products__order_product_ingredients__product_ingredient",
-            "order_products__variant",
-            "user__role__printers__printer",
-            "user__role__order_confirmer__printers__printer",
-            "order_printers__role_printer__printer",
-            "confirmed_by__role__printers__printer",
-            "parent_order",
-        ]
+    async def _start(self):
+        await self._load_printers()
+        # Orders left over by the previous leader
+        asyncio.create_task(self._reconcile())
+
+    async def _stop(self):
+        # Workers stop after their current burst
+        self.printers.clear()
+        print_queue_depth.clear()
+        self._wake_printers(set(self.wakeups))
+        self.wakeups.clear()
+
+    async def _load_printers(self):
+        for printer in await Printer.all():
+            self._update_printer(printer.id, printer.ip_address)
+
+    async def _on_print(self, data: dict):
+        self._wake_printers(set(data.get("printer_ids", self.wakeups)))
+
+    async def _on_printers(self, _: dict):
+        if self.cluster.is_leader:
+            await self._load_printers()
+
+    def _update_printer(self, printer_id: int, printer_ip_address: str):
+        if not self.cluster.is_leader:
+            return
+
+        if printer_id in self.printers:
+            self.printers[printer_id].set_host(printer_ip_address)
+            return
+
+        self.printers[printer_id] = PrinterConnection(
+            printer_ip_address, timeout=5
+        )
+        self.wakeups[printer_id] = asyncio.Event()
+        asyncio.create_task(self._worker(printer_id))
+
+    async def update_printer(self, printer_id: int, printer_ip_address: str):
+        """
+        Start the worker of a new printer or apply its new address, on the
+        leader.
+        """
+
+        if self.cluster.is_leader:
+            self._update_printer(printer_id, printer_ip_address)
+        else:
+            await self.cluster.publish("printers")
+
+    def notify(self, order_id: int):
+        """
+        Schedule the print jobs of an order. Must be called after the
+        transaction that created or changed the order has been committed.
+        """
+
+        self.notifications.put_nowait(order_id)
+
+    def _wake_printers(self, printer_ids: set[int]):
+        for printer_id in printer_ids:
+            if printer_id in self.wakeups:
+                self.wakeups[printer_id].set()
+
+    async def dispatch_worker(self):
+        last_sweep = time.monotonic()
 
         while True:
-            orders = (
-                await Order.filter(is_done=False)
-                .order_by("created_at")
-                .prefetch_related(*prefetch_values)
-            )
-            logger.info(f"Trovati {len(orders)} ordini attivi da processare.")
+            # The sweep keeps its own clock, since the notifications never
+            # stop during a busy service
+            timeout = last_sweep + RECONCILE_INTERVAL - time.monotonic()
 
-            for order in orders:
-                logger.debug(
-                    f"Elaborazione ordine #{order.id} (Creato il {order.created_at})"
+            try:
+                order_id = await asyncio.wait_for(
+                    self.notifications.get(), max(timeout, 0)
                 )
-                user_role_printers = list(order.user.role.printers)
-                confirmed_by_role_printers = []
-                if order.user.role.order_confirmer:
-                    if order.user.role.order_confirmer.printers:
-                        confirmed_by_role_printers = list(
-                            order.user.role.order_confirmer.printers
-                        )
-                        logger.debug(
-                            f"Ordine #{order.id}: trovati {len(confirmed_by_role_printers)} stampanti per il ruolo di conferma."
-                        )
+            except asyncio.TimeoutError:
+                order_id = None
 
-                user_role_printer_ids = {x.id for x in user_role_printers}
-                role_printer_ids = {
-                    x.id: x
-                    for x in user_role_printers + confirmed_by_role_printers
-                }
-                order_role_printer_ids = {
-                    x.role_printer_id for x in order.order_printers
-                }
-                order_roles_to_print = (
-                    set(role_printer_ids.keys()) - order_role_printer_ids
-                )
-                logger.debug(
-                    f"Ordine #{order.id}: ruoli da stampare → {order_roles_to_print}"
-                )
+            if time.monotonic() - last_sweep >= RECONCILE_INTERVAL:
+                last_sweep = time.monotonic()
 
-                if order.is_take_away:
-                    logger.debug(
-                        f"Ordine #{order.id} è da asporto, rimozione stampanti per bevande..."
-                    )
-                    order_roles_to_print -= {
-                        x
-                        for x in order_roles_to_print
-                        if role_printer_ids.get(x).printer_type
-                        == PrinterType.DRINKS
-                    }
-
-                if not order_roles_to_print:
-                    logger.info(
-                        f"Ordine #{order.id} già stampato da tutti i ruoli necessari. Lo segno come completato."
-                    )
-                    order.is_done = True
-                    await order.save()
+                if self.cluster.is_leader:
+                    await self._reconcile()
 
-                    for rp in role_printer_ids.keys():
-                        self.in_progress.discard((order.id, rp))
+            if order_id is None:
+                continue
 
-                    continue
+            order_ids = {order_id}
+            while not self.notifications.empty():
+                order_ids.add(self.notifications.get_nowait())
 
-                ordered_roles_to_print = {
-                    x
-                    for x in user_role_printer_ids
-                    if x not in order_role_printer_ids
-                }
+            try:
+                orders = (
+                    await Order.filter(id__in=order_ids, is_done=False)
+                    .order_by("created_at")
+                    .prefetch_related(*ORDER_PREFETCH_VALUES)
+                )
 
-                if order.is_confirm:
-                    logger.debug(
-                        f"Ordine #{order.id} è confermato o da asporto: applico priorità ai ruoli dell'utente."
-                    )
-                    ordered_roles_to_print = sorted(
-                        order_roles_to_print,
-                        key=lambda x: (x not in user_role_printer_ids, x),
-                    )
+                await self._schedule_orders(orders)
+            except Exception as e:
+                # The reconciliation sweep will retry these orders
+                logger.error(f"Errore nella pianificazione di {order_ids}")
+                logger.exception(e)
 
-                for role_printer in ordered_roles_to_print:
-                    rp = role_printer_ids.get(role_printer)
-                    key = (order.id, rp.id)
+    async def _reconcile(self):
+        try:
+            order_ids = await Order.filter(is_done=False).values_list(
+                "id", flat=True
+            )
+            # Orders with jobs still pending are skipped, so an offline
+            # printer does not make every sweep heavier
+            busy_order_ids = set(
+                await PrintJob.filter(
+                    order_id__in=order_ids,
+                    status__not=PrintJobStatus.PRINTED,
+                ).values_list("order_id", flat=True)
+            )
+            order_ids = [x for x in order_ids if x not in busy_order_ids]
+
+            orders = []
+            if order_ids:
+                orders = (
+                    await Order.filter(id__in=order_ids)
+                    .order_by("created_at")
+                    .prefetch_related(*ORDER_PREFETCH_VALUES)
+                )
+            logger.debug(f"Trovati {len(orders)} ordini attivi da processare.")
+
+            await self._schedule_orders(orders)
+        except Exception as e:
+            logger.error("Errore durante la riconciliazione degli ordini")
+            logger.exception(e)
+
+    async def _schedule_orders(self, orders: list[Order]):
+        if not orders:
+            return
+
+        queued_jobs = set(
+            await PrintJob.filter(
+                order_id__in=[x.id for x in orders],
+                dedupe_key__not_isnull=True,
+            ).values_list("order_id", "role_printer_id")
+        )
 
-                    if key in self.in_progress:
-                        logger.debug(
-                            f"Ordine #{order.id} → Ruolo #{rp.id} → Stampante #{rp.printer_id} già in coda, salto."
-                        )
-                        continue
+        for order in orders:
+            await self._schedule_order(order, queued_jobs)
 
-                    logger.info(
-                        f"Inserisco in coda: Ordine #{order.id} → Ruolo #{rp.id} → Stampante #{rp.printer_id}"
-                    )
-                    self.in_progress.add(key)
-                    await self.queues[rp.printer_id].put((order, rp))
+    async def _schedule_order(
+        self, order: Order, queued_jobs: set[tuple[int, int]]
+    ):
+        logger.debug(
+            f"Elaborazione ordine #{order.id} (Creato il {order.created_at})"
+        )
+        user_role_printers = list(order.user.role.printers)
+        confirmed_by_role_printers = []
+        if order.user.role.order_confirmer:
+            if order.user.role.order_confirmer.printers:
+                confirmed_by_role_printers = list(
+                    order.user.role.order_confirmer.printers
+                )
+                logger.debug(
+                    f"Ordine #{order.id}: trovati {len(confirmed_by_role_printers)} stampanti per il ruolo di conferma."
+                )
 
+        user_role_printer_ids = {x.id for x in user_role_printers}
+        role_printer_ids = {
+            x.id: x for x in user_role_printers + confirmed_by_role_printers
+        }
+        order_role_printer_ids = {
+            x.role_printer_id for x in order.order_printers
+        }
+        order_roles_to_print = (
+            set(role_printer_ids.keys()) - order_role_printer_ids
+        )
+        logger.debug(
+            f"Ordine #{order.id}: ruoli da stampare → {order_roles_to_print}"
+        )
+
+        if order.is_take_away:
             logger.debug(
-                f"Fine ciclo. Attesa di {RETRY_DELAY} secondi prima del prossimo aggiornamento."
+                f"Ordine #{order.id} è da asporto, rimozione stampanti per bevande..."
+            )
+            order_roles_to_print -= {
+                x
+                for x in order_roles_to_print
+                if role_printer_ids.get(x).printer_type == PrinterType.DRINKS
+            }
+
+        if not order_roles_to_print:
+            logger.info(
+                f"Ordine #{order.id} già stampato da tutti i ruoli necessari. Lo segno come completato."
             )
-            await asyncio.sleep(RETRY_DELAY)
+            order.is_done = True
+            await order.save()
 
-    async def _worker(self, printer_id: int):
-        queue = self.queues[printer_id]
-        printer = self.printers[printer_id]
+            return
 
-        logger.debug(
-            f"Avvio worker Stampante #{printer_id} coda di {queue.qsize()} ordini"
+        ordered_roles_to_print = sorted(
+            x for x in user_role_printer_ids if x not in order_role_printer_ids
         )
 
-        while True:
-            job = await queue.get()
+        if order.is_confirm:
+            logger.debug(
+                f"Ordine #{order.id} è confermato o da asporto: applico priorità ai ruoli dell'utente."
+            )
+            ordered_roles_to_print = sorted(
+                order_roles_to_print,
+                key=lambda x: (x not in user_role_printer_ids, x),
+            )
 
-            order = job[0]
-            role_printer_printer_type = job[1].printer_type
-            role_printer_printer_id = job[1].id
+        role_printers = []
+        for role_printer in ordered_roles_to_print:
+            rp = role_printer_ids.get(role_printer)
 
-            logger.debug(
-                f"STAMPA -- Stampante #{printer_id} → Ruolo {role_printer_printer_type} → Ordine #{order.id}"
+            if (order.id, rp.id) in queued_jobs:
+                logger.debug(
+                    f"Ordine #{order.id} → Ruolo #{rp.id} → Stampante #{rp.printer_id} già in coda, salto."
+                )
+                continue
+
+            logger.info(
+                f"Inserisco in coda: Ordine #{order.id} → Ruolo #{rp.id} → Stampante #{rp.printer_id}"
+            )
+            role_printers.append(rp)
+
+        await self._create_jobs(order, role_printers, False)
+
+    async def _create_jobs(
+        self,
+        order: Order,
+        role_printers: list[RolePrinter],
+        is_reprint: bool,
+    ):
+        jobs = []
+
+        try:
+            text = OrderTextManager(build_order_view(order))
+        except Exception as e:
+            logger.error(f"Render error → Ordine #{order.id}")
+            logger.exception(e)
+            return
+
+        for rp in role_printers:
+            start = time.perf_counter()
+
+            try:
+                payload = text.generate_ticket_for_printer(rp.printer_type)
+            except Exception as e:
+                # Left to the reconciliation sweep
+                logger.error(
+                    f"Render error → Ruolo {rp.printer_type} → Ordine #{order.id}"
+                )
+                logger.exception(e)
+                continue
+
+            print_render_duration.observe(
+                rp.printer_type, value=time.perf_counter() - start
+            )
+            jobs.append(
+                PrintJob(
+                    order_id=order.id,
+                    role_printer_id=rp.id,
+                    printer_id=rp.printer_id,
+                    printer_type=rp.printer_type,
+                    payload=payload,
+                    dedupe_key=(
+                        f"{order.id}:{rp.id}" if not is_reprint else None
+                    ),
+                )
+            )
+
+        if not jobs:
+            return
+
+        # Another replica may have queued the same jobs in the meantime
+        await PrintJob.bulk_create(jobs, ignore_conflicts=True)
+
+        printer_ids = {x.printer_id for x in jobs}
+
+        if self.cluster.is_leader:
+            self._wake_printers(printer_ids)
+        else:
+            await self.cluster.publish(
+                "print", printer_ids=sorted(printer_ids)
             )
 
-            text = OrderTextManager(order)
-            content = await text.generate_text_for_printer(
-                role_printer_printer_type
+    async def _claim_jobs(self, printer_id: int) -> list[dict]:
+        async with in_transaction("default") as connection:
+            rows = await connection.execute_query_dict(
+                CLAIM_PRINT_JOB_QUERY, [printer_id, SEND_LEASE, BURST_SIZE]
             )
+            # The worker claims after each burst and each wakeup, so the
+            # depth of its queue is current without a query per scrape
+            depths = await connection.execute_query_dict(
+                QUEUE_DEPTH_QUERY, [printer_id]
+            )
+
+        for status in PrintJobStatus:
+            if status != PrintJobStatus.PRINTED:
+                print_queue_depth.set(printer_id, status.value, value=0)
+
+        for row in depths:
+            print_queue_depth.set(printer_id, row["status"], value=row["jobs"])
+
+        return sorted(rows, key=lambda x: x["id"])
+
+    @classmethod
+    def _send_jobs(
+        cls, printer: PrinterConnection, jobs: list[dict]
+    ) -> tuple[int, Exception | None]:
+        for index, job in enumerate(jobs):
+            try:
+                printer.send(
+                    lambda device: cls._print_content(device, job["payload"])
+                )
+            except Exception as e:
+                return index, e
+
+        return len(jobs), None
+
+    async def _worker(self, printer_id: int):
+        wakeup = self.wakeups[printer_id]
+        printer = self.printers[printer_id]
 
-            attempts = 0
-            while True:
+        logger.debug(f"Avvio worker Stampante #{printer_id}")
+
+        while self.printers.get(printer_id) is printer:
+            wakeup.clear()
+
+            try:
+                jobs = await self._claim_jobs(printer_id)
+            except Exception as e:
+                logger.error(
+                    f"Errore nel recupero dei lavori di #{printer_id}"
+                )
+                logger.exception(e)
+                jobs = []
+
+            if not jobs:
+                # Jobs queued by other replicas and expired leases are
+                # picked up on timeout
                 try:
-                    await asyncio.to_thread(
-                        self._print_content, printer, content, order.id
-                    )
-                except Exception as e:
-                    attempts += 1
-                    delay = min(
-                        RETRY_DELAY + (attempts - 1) * STEP, MAX_RETRY_DELAY
-                    )
+                    await asyncio.wait_for(wakeup.wait(), RECONCILE_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
 
-                    logger.error(
-                        f"Print error on {printer.host} → Ruolo {role_printer_printer_type} → Ordine #{order.id}"
-                    )
-                    logger.exception(e)
-                    await asyncio.sleep(delay)
+                continue
+
+            for job in jobs:
+                logger.debug(
+                    f"STAMPA -- Stampante #{printer_id} → Ruolo {job['printer_type']} → Ordine #{job['order_id']}"
+                )
+
+            start = time.perf_counter()
+            sent, error = await asyncio.to_thread(
+                self._send_jobs, printer, jobs
+            )
+            print_send_duration.observe(
+                printer_id, value=time.perf_counter() - start
+            )
 
-                    continue
+            if sent:
+                print_attempts.inc(printer_id, "printed", value=sent)
 
+            if error:
+                print_attempts.inc(printer_id, "failed")
+
+            for job in jobs[:sent]:
                 logger.success(
-                    f"Successfully printed {order.id} on {printer.host}"
+                    f"Successfully printed {job['order_id']} on {printer.host}"
+                )
+
+            if sent:
+                await self._mark_printed(jobs[:sent])
+
+            if error:
+                job = jobs[sent]
+                delay = min(
+                    RETRY_DELAY + (job["attempts"] - 1) * STEP,
+                    MAX_RETRY_DELAY,
                 )
-                break
 
-            queue.task_done()
+                logger.error(
+                    f"Print error on {printer.host} → Ruolo {job['printer_type']} → Ordine #{job['order_id']}"
+                )
+                logger.exception(error)
+
+                async with in_transaction("default") as connection:
+                    await connection.execute_query(
+                        FAIL_PRINT_JOB_QUERY, [job["id"], str(error), delay]
+                    )
 
-            _, is_created = await OrderPrinter.get_or_create(
-                order_id=order.id, role_printer_id=role_printer_printer_id
+                    if jobs[sent + 1 :]:
+                        await connection.execute_query(
+                            RELEASE_PRINT_JOBS_QUERY,
+                            [[x["id"] for x in jobs[sent + 1 :]], delay],
+                        )
+
+                await asyncio.sleep(delay)
+
+        logger.debug(f"Arresto worker Stampante #{printer_id}")
+        await asyncio.to_thread(printer.close)
+
+    async def _mark_printed(self, jobs: list[dict]):
+        async with in_transaction("default") as connection:
+            await PrintJob.filter(id__in=[x["id"] for x in jobs]).using_db(
+                connection
+            ).update(status=PrintJobStatus.PRINTED, printed_at=timezone.now())
+            await OrderPrinter.bulk_create(
+                [
+                    OrderPrinter(
+                        order_id=x["order_id"],
+                        role_printer_id=x["role_printer_id"],
+                    )
+                    for x in jobs
+                ],
+                ignore_conflicts=True,
+                using_db=connection,
             )
 
-            if is_created:
-                logger.success(f"Order {order.id} marked as printed.")
+        order_ids = {x["order_id"] for x in jobs}
+        pending_order_ids = set(
+            await PrintJob.filter(
+                order_id__in=order_ids, status__not=PrintJobStatus.PRINTED
+            ).values_list("order_id", flat=True)
+        )
+
+        # The last job of an order lets the dispatcher mark it as done
+        for order_id in order_ids - pending_order_ids:
+            self.notify(order_id)
 
     @staticmethod
-    def _print_content(printer: Network, content: str, order_id: int):
-        printer.open()
-        for line in re.split(r"(?<=\n)", content):
-            printer.set(align="left", font="a")
-
-            parts = re.split(r"(<DOUBLE>.*?</DOUBLE>)", line)
-            for part in parts:
-                if part.startswith("<DOUBLE>") and part.endswith("</DOUBLE>"):
-                    inner = part[len("<DOUBLE>") : -len("</DOUBLE>")]
-                    printer._raw(b"\x1b\x21\x30")
-                    printer.text(inner)
-                    printer._raw(b"\x1b\x21\x00")
-                else:
-                    printer.text(part)
-
-        printer.barcode(str(order_id), "CODE128", height=100, width=3)
-        printer.cut()
+    def _print_content(printer: Network, content: bytes):
+        # The ticket is compiled when the job is queued, one write sends it
+        printer._raw(content)
 
     async def add_job(self, order: Order, printer_types: list[PrinterType]):
         printers = list(order.user.role.printers)
+        order_confirmer = order.user.role.order_confirmer
         printers_confirmed = (
-            list(order.user.role.order_confirmer.printers)
-            if order.is_confirm or order.is_take_away
+            list(order_confirmer.printers)
+            if order_confirmer and (order.is_confirm or order.is_take_away)
             else []
         )
 
@@ -238,7 +579,4 @@ class PrintManager:
             if p.printer_type in printer_types
         ]
 
-        for role_printer in printers_to_print:
-            await self.queues[role_printer.printer_id].put(
-                (order, role_printer)
-            )
+        await self._create_jobs(order, printers_to_print, True)
@@ -0,0 +1,100 @@
+import socket
+import time
+from typing import Callable
+
+from escpos.printer import Network
+from loguru import logger
+
+HEALTH_CHECK_INTERVAL = 30
+KEEPALIVE_COUNT = 3
+KEEPALIVE_IDLE = 30
+KEEPALIVE_INTERVAL = 10
+
+
+class PrinterConnection:
+    """
+    Long-lived ESC/POS connection to a network printer.
+
+    The socket is opened on the first send and kept open between tickets.
+    A connection idle for more than HEALTH_CHECK_INTERVAL seconds is probed
+    with a real-time status request before being reused, and any error
+    closes it so that the next send reconnects.
+
+    Methods are blocking and must be called from a single worker thread.
+    """
+
+    def __init__(self, host: str, port: int = 9100, timeout: int = 5):
+        self.printer = Network(host, port=port, timeout=timeout)
+        self.host = host
+        self.is_open = False
+        self.last_used = 0.0
+
+    def set_host(self, host: str):
+        # Applied on the next send, the worker may be using the socket
+        self.host = host
+
+    def _connect(self):
+        self.printer.host = self.host
+        self.printer.open()
+
+        sock = self.printer.device
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE
+            )
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, KEEPALIVE_INTERVAL
+            )
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_KEEPCNT, KEEPALIVE_COUNT
+            )
+
+        self.is_open = True
+        self.last_used = time.monotonic()
+
+        logger.debug(f"Connessione aperta con la stampante {self.host}")
+
+    def close(self):
+        if self.is_open:
+            self.is_open = False
+            self.printer.close()
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.printer.is_online()
+        except OSError:
+            return False
+
+    def _ensure_connected(self):
+        if self.is_open and self.printer.host != self.host:
+            self.close()
+
+        if (
+            self.is_open
+            and time.monotonic() - self.last_used > HEALTH_CHECK_INTERVAL
+            and not self.is_healthy()
+        ):
+            logger.warning(
+                f"Stampante {self.host} non risponde, riconnessione"
+            )
+            self.close()
+
+        if not self.is_open:
+            self._connect()
+
+    def send(self, write: Callable[[Network], None]):
+        """
+        Run write against the open printer, connecting first if needed.
+        """
+
+        self._ensure_connected()
+
+        try:
+            write(self.printer)
+        except Exception:
+            self.close()
+            raise
+
+        self.last_used = time.monotonic()
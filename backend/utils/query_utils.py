@@ -1,11 +1,14 @@
+import base64
+import binascii
+import datetime
 from typing import Type, TypeVar
 
 from tortoise import Model, BaseDBAsyncClient
-from tortoise.exceptions import FieldError
+from tortoise.exceptions import FieldError, ParamsError
 from tortoise.expressions import Q, Expression
 from tortoise.queryset import QuerySet
 
-from backend.models.error import NotFound
+from backend.models.error import BadRequest, NotFound, UnprocessableEntity
 from backend.utils import ErrorCodes
 
 T = TypeVar("T", bound=Model)
@@ -19,16 +22,17 @@ async def process_query_with_pagination(
     limit: int,
     order_by: str,
     annotate_expression: dict[str, Expression] = None,
-) -> tuple[QuerySet[T], int, int]:
+    include_total_count: bool = True,
+) -> tuple[QuerySet[T], int | None, int | None]:
     query = model
 
     if annotate_expression:
         query = query.annotate(**annotate_expression)
 
     query = query.filter(query_filter).using_db(connection)
-    total_count = await query.count()
+    total_count = await query.count() if include_total_count else None
 
-    if not limit:
+    if not limit and total_count is not None:
         limit = total_count - offset
 
     if order_by:
@@ -38,3 +42,56 @@ async def process_query_with_pagination(
             raise NotFound(code=ErrorCodes.UNKNOWN_ORDER_BY_PARAMETER)
 
     return query, total_count, limit
+
+
+def paginate(
+    query: QuerySet[T], offset: int, limit: int | None
+) -> QuerySet[T]:
+    """
+    Apply offset and limit to a query, without limit when it is not set.
+    """
+
+    try:
+        query = query.offset(offset)
+
+        if limit:
+            query = query.limit(limit)
+    except ParamsError:
+        raise BadRequest(code=ErrorCodes.INVALID_OFFSET_OR_LIMIT_NEGATIVE)
+
+    return query
+
+
+def encode_cursor(created_at: datetime.datetime, id: int) -> str:
+    """
+    Encode the position after a row in a listing ordered by created_at, id.
+    """
+
+    value = f"{created_at.isoformat()},{id}".encode()
+
+    return base64.urlsafe_b64encode(value).decode()
+
+
+def cursor_filter(cursor: str) -> Q:
+    """
+    Filter the rows after the position encoded in a cursor.
+    """
+
+    try:
+        created_at, id = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split(",")
+        )
+        created_at = datetime.datetime.fromisoformat(created_at)
+        id = int(id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise UnprocessableEntity(code=ErrorCodes.REQUEST_VALIDATION_ERROR)
+
+    return after_filter(created_at, id)
+
+
+def after_filter(created_at: datetime.datetime, id: int) -> Q:
+    """
+    Filter the rows after a row in a listing ordered by created_at, id.
+    """
+
+    return Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=id)
@@ -0,0 +1,165 @@
+import contextvars
+import dataclasses
+import functools
+import time
+
+import fastapi.routing
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from tortoise.backends.asyncpg.client import (
+    AsyncpgDBClient,
+    TransactionWrapper,
+)
+
+from backend.utils.metrics import QUERY_BUCKETS, Histogram
+
+DATABASE_METHODS = (
+    "execute_insert",
+    "execute_many",
+    "execute_query",
+    "execute_query_dict",
+    "execute_script",
+)
+UNMATCHED_ROUTE = "unmatched"
+
+REQUEST_LABELS = ("method", "route")
+
+request_duration = Histogram(
+    "festival_http_request_duration_seconds",
+    "Time spent on a request, until its response is sent.",
+    (*REQUEST_LABELS, "status"),
+)
+request_queries = Histogram(
+    "festival_http_request_queries",
+    "SQL statements sent by a request.",
+    REQUEST_LABELS,
+    QUERY_BUCKETS,
+)
+request_database_duration = Histogram(
+    "festival_http_request_database_seconds",
+    "Time a request spent waiting on Tortoise statements.",
+    REQUEST_LABELS,
+)
+request_handler_duration = Histogram(
+    "festival_http_request_handler_seconds",
+    "Time spent in the endpoint function of a request.",
+    REQUEST_LABELS,
+)
+request_serialization_duration = Histogram(
+    "festival_http_request_serialization_seconds",
+    "Time spent validating and encoding the response of a request.",
+    REQUEST_LABELS,
+)
+
+
+@dataclasses.dataclass(slots=True)
+class RequestMetrics:
+    queries: int = 0
+    database: float = 0.0
+    handler: float = 0.0
+    serialization: float = 0.0
+
+
+# Set for the requests only, so the statements of the print manager tasks
+# are left out
+_request_metrics: contextvars.ContextVar[RequestMetrics | None] = (
+    contextvars.ContextVar("request_metrics", default=None)
+)
+
+
+def _measure(func, field: str | None = None):
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        metrics = _request_metrics.get()
+
+        if metrics is None:
+            return await func(*args, **kwargs)
+
+        start = time.perf_counter()
+
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+
+            if field:
+                setattr(metrics, field, getattr(metrics, field) + elapsed)
+            else:
+                metrics.queries += 1
+                metrics.database += elapsed
+
+    return wrapper
+
+
+def instrument() -> None:
+    """
+    Wrap the Tortoise clients and the FastAPI request handler steps, so
+    that each request records its statements and the time spent on them.
+    Wrapped once, also when the app module is imported again by a worker.
+    """
+
+    if getattr(fastapi.routing.run_endpoint_function, "__wrapped__", None):
+        return
+
+    for cls in (AsyncpgDBClient, TransactionWrapper):
+        for name in DATABASE_METHODS:
+            # Methods inherited from the client are wrapped once
+            if name in cls.__dict__:
+                setattr(cls, name, _measure(cls.__dict__[name]))
+
+    # FastAPI keeps these steps apart to allow profiling endpoints
+    fastapi.routing.run_endpoint_function = _measure(
+        fastapi.routing.run_endpoint_function, "handler"
+    )
+    fastapi.routing.serialize_response = _measure(
+        fastapi.routing.serialize_response, "serialization"
+    )
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the metrics of each HTTP request, labelled with the path of
+    the matched route.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        status = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status
+
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        token = _request_metrics.set(metrics)
+        start = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_metrics.reset(token)
+
+            # The route is set on the scope by the router while matching
+            route = scope.get("route")
+            labels = (
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+            )
+
+            request_duration.observe(*labels, status, value=elapsed)
+            request_queries.observe(*labels, value=metrics.queries)
+            request_database_duration.observe(*labels, value=metrics.database)
+            request_handler_duration.observe(*labels, value=metrics.handler)
+            request_serialization_duration.observe(
+                *labels, value=metrics.serialization
+            )
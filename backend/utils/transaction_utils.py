@@ -0,0 +1,122 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, TypeVar
+
+import asyncpg
+from loguru import logger
+from tortoise import BaseDBAsyncClient, connections
+from tortoise.transactions import in_transaction
+
+from backend.database.db_connect import REPLICA_CONNECTION, has_replica
+from backend.database.replica import is_replica_fresh, reads
+from backend.models.error import ServiceUnavailable
+from backend.utils import ErrorCodes
+from backend.utils.metrics import Counter
+
+T = TypeVar("T")
+
+MAX_TRANSACTION_ATTEMPTS = 8
+RETRY_BASE_DELAY = 0.02
+RETRY_MAX_DELAY = 0.5
+
+# Failures caused only by concurrent transactions, which succeed when run
+# again from the start
+RETRYABLE_ERRORS = (
+    asyncpg.exceptions.SerializationError,
+    asyncpg.exceptions.DeadlockDetectedError,
+)
+
+
+transactions = Counter(
+    "festival_transactions_total",
+    "Transactions run with retries, by name.",
+    ("name",),
+)
+transaction_retries = Counter(
+    "festival_transaction_retries_total",
+    "Transactions run again after a serialization failure or a deadlock.",
+    ("name",),
+)
+transactions_exhausted = Counter(
+    "festival_transactions_exhausted_total",
+    "Transactions abandoned after the last attempt.",
+    ("name",),
+)
+
+
+def get_retry_delay(attempt: int) -> float:
+    """
+    Full jitter backoff, so that the transactions that conflicted do not
+    meet again on the next attempt.
+    """
+
+    return random.uniform(
+        0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    )
+
+
+async def run_in_transaction(
+    name: str,
+    func: Callable[[BaseDBAsyncClient], Awaitable[T]],
+    isolation_level: str | None = None,
+) -> T:
+    """
+    Run func in a transaction, running it again in a new one when it fails
+    with a serialization failure or a deadlock. func must not have effects
+    outside the transaction.
+    """
+
+    transactions.inc(name)
+
+    for attempt in range(1, MAX_TRANSACTION_ATTEMPTS + 1):
+        try:
+            async with in_transaction("default") as connection:
+                if isolation_level:
+                    await connection.execute_query(
+                        f"SET TRANSACTION ISOLATION LEVEL {isolation_level};"
+                    )
+
+                return await func(connection)
+        except RETRYABLE_ERRORS as e:
+            if attempt == MAX_TRANSACTION_ATTEMPTS:
+                transactions_exhausted.inc(name)
+                logger.error(
+                    f"Transazione {name} fallita dopo {attempt} tentativi: "
+                    f"{e}"
+                )
+                raise ServiceUnavailable(
+                    code=ErrorCodes.INTERNAL_ERROR_SERVER
+                ) from e
+
+            transaction_retries.inc(name)
+            logger.debug(f"Transazione {name} ripetuta ({attempt}): {e}")
+
+            await asyncio.sleep(get_retry_delay(attempt))
+
+
+def get_read_connection(
+    max_staleness: float | None = None,
+) -> BaseDBAsyncClient:
+    """
+    Connection for the reads that need no transaction. Each statement
+    holds a pooled connection only while it runs, instead of one being
+    pinned for the whole handler, and sees the data committed when it
+    starts, as it would in a read committed transaction.
+
+    With max_staleness, the seconds of lag the endpoint tolerates, the
+    reads go to the replica while it is that fresh, otherwise to the
+    primary.
+    """
+
+    name = "default"
+
+    if (
+        max_staleness is not None
+        and has_replica()
+        and is_replica_fresh(max_staleness)
+    ):
+        name = REPLICA_CONNECTION
+
+    reads.inc(name)
+
+    return connections.get(name)
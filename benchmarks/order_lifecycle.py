@@ -0,0 +1,649 @@
+"""
+Drive the order lifecycle through the API from many simulated tills and
+report latency, throughput and query counts per endpoint.
+
+The app runs in process against the Postgres server of the configuration,
+on a new database that is dropped at the end. Tickets are sent to fake
+ESC/POS printers listening on 127.0.0.x:9100.
+
+    python -m benchmarks.order_lifecycle --tills 8 --orders 50
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+import asyncpg
+import httpx
+from loguru import logger
+
+from backend.config import Session
+from backend.database.models import (
+    Menu,
+    MenuDate,
+    MenuField,
+    MenuFieldProduct,
+    MenuRole,
+    PrintJob,
+    Printer,
+    Product,
+    ProductDate,
+    ProductIngredient,
+    ProductRole,
+    ProductVariant,
+    Role,
+    RolePrinter,
+    RoleTable,
+    Setting,
+    Subcategory,
+    Table,
+    User,
+)
+from backend.models.settings import Settings
+from backend.services.catalog import refresh_catalog
+from backend.utils import Category, PrinterType, PrintJobStatus
+from backend.utils.request_metrics import request_queries
+
+PASSWORD = "Password1!"
+PRINTER_PORT = 9100
+# ESC/POS real-time status request and the cut that closes each ticket
+STATUS_REQUEST = b"\x10\x04"
+PRINTER_ONLINE = b"\x12"
+PAPER_CUT = b"\x1dV"
+SERVE_POLL_INTERVAL = 1
+SERVE_POLLS = 120
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    latencies: list[float] = dataclasses.field(default_factory=list)
+    errors: int = 0
+
+
+# By method and route, the labels of the request metrics of the app
+stats: dict[tuple[str, str], EndpointStats] = defaultdict(EndpointStats)
+
+
+class FakePrinter:
+    """
+    ESC/POS printer that answers status requests and counts tickets.
+    """
+
+    def __init__(self, host: str):
+        self.host = host
+        self.tickets = 0
+        self.bytes = 0
+        self.server: asyncio.Server | None = None
+        self.writers: set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(
+            self._handle, self.host, PRINTER_PORT
+        )
+
+    async def stop(self) -> None:
+        self.server.close()
+
+        # The print manager keeps its connections open
+        for writer in self.writers:
+            writer.close()
+
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer) -> None:
+        self.writers.add(writer)
+
+        try:
+            while data := await reader.read(65536):
+                self.bytes += len(data)
+                self.tickets += data.count(PAPER_CUT)
+
+                if STATUS_REQUEST in data:
+                    writer.write(PRINTER_ONLINE)
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+
+@dataclasses.dataclass
+class Festival:
+    till_role: Role
+    confirmer_role: Role
+    waiter_role: Role
+    statistics_role: Role
+    products: list[Product]
+    variants: dict[int, list[int]]
+    ingredients: dict[int, list[int]]
+    menus: list[tuple[Menu, list[tuple[MenuField, list[int]]]]]
+
+
+async def seed(
+    products_count: int, menus_count: int, printers: list[FakePrinter]
+) -> Festival:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    dates = {
+        "start_date": now - datetime.timedelta(days=1),
+        "end_date": now + datetime.timedelta(days=1),
+    }
+
+    confirmer_role = await Role.create(
+        name="cassa centrale", can_confirm_orders=True
+    )
+    till_role = await Role.create(
+        name="cassa", can_order=True, order_confirmer=confirmer_role
+    )
+    waiter_role = await Role.create(name="camerieri", can_serve_orders=True)
+    statistics_role = await Role.create(
+        name="statistiche", can_statistics=True
+    )
+
+    for i in range(10):
+        table = await Table.create(
+            name=f"Zona {i}", seat_start=i * 20 + 1, seat_end=i * 20 + 20
+        )
+        await RoleTable.create(role=till_role, table=table)
+
+    printer_types = [PrinterType.RECEIPT, PrinterType.FOOD, PrinterType.DRINKS]
+    for i, fake_printer in enumerate(printers):
+        printer = await Printer.create(
+            name=f"Stampante {i}", ip_address=fake_printer.host
+        )
+        await RolePrinter.create(
+            role=till_role,
+            printer=printer,
+            printer_type=printer_types[i % len(printer_types)],
+        )
+        await Session.print_manager.update_printer(
+            printer.id, printer.ip_address
+        )
+
+    subcategories = [
+        await Subcategory.create(name=name, order=i)
+        for i, name in enumerate(("Primi", "Secondi", "Contorni", "Bevande"))
+    ]
+
+    products = []
+    variants = {}
+    ingredients = {}
+    for i in range(products_count):
+        is_drink = i % 4 == 3
+        product = await Product.create(
+            name=f"Prodotto {i}",
+            short_name=f"P{i}",
+            price=Decimal(3 + i % 7),
+            category=Category.DRINK if is_drink else Category.FOOD,
+            subcategory=subcategories[i % len(subcategories)],
+            is_priority=i % 5 == 0,
+            # High enough to never run out, but reserved on every order
+            daily_max_sales=1_000_000 if i % 6 == 0 else None,
+        )
+        await ProductDate.create(product=product, **dates)
+        await ProductRole.create(product=product, role=till_role)
+
+        if i % 3 == 1:
+            variants[product.id] = [
+                (
+                    await ProductVariant.create(
+                        product=product, name=name, price=Decimal("1.00")
+                    )
+                ).id
+                for name in ("Piccola", "Grande")
+            ]
+
+        if i % 2 == 0:
+            ingredients[product.id] = [
+                (
+                    await ProductIngredient.create(
+                        product=product, name=name, price=Decimal("0.50")
+                    )
+                ).id
+                for name in ("Formaggio", "Peperoncino")
+            ]
+
+        products.append(product)
+
+    # Menu fields offer products without variants, which need no choice
+    simple_products = [x for x in products if x.id not in variants]
+    food = [x for x in simple_products if x.category == Category.FOOD]
+    drinks = [x for x in simple_products if x.category == Category.DRINK]
+
+    menus = []
+    for i in range(menus_count):
+        menu = await Menu.create(
+            name=f"Menu {i}", short_name=f"M{i}", price=Decimal(10 + i)
+        )
+        await MenuDate.create(menu=menu, **dates)
+        await MenuRole.create(menu=menu, role=till_role)
+
+        fields = []
+        for name, choices, is_optional in (
+            ("Piatto", food, False),
+            ("Bibita", drinks, True),
+        ):
+            menu_field = await MenuField.create(
+                menu=menu,
+                name=name,
+                max_sortable_elements=1,
+                additional_cost=0,
+                is_optional=is_optional,
+            )
+            field_products = random.sample(choices, min(3, len(choices)))
+            for product in field_products:
+                await MenuFieldProduct.create(
+                    menu_field=menu_field, product=product, price=0
+                )
+            fields.append((menu_field, [x.id for x in field_products]))
+
+        menus.append((menu, fields))
+
+    await refresh_catalog()
+
+    return Festival(
+        till_role=till_role,
+        confirmer_role=confirmer_role,
+        waiter_role=waiter_role,
+        statistics_role=statistics_role,
+        products=products,
+        variants=variants,
+        ingredients=ingredients,
+        menus=menus,
+    )
+
+
+@dataclasses.dataclass
+class Staff:
+    kitchen: dict[str, str]
+    waiter: dict[str, str]
+    statistics: dict[str, str]
+    confirmer: dict[str, str] | None
+
+
+async def login(
+    client: httpx.AsyncClient, username: str, role: Role
+) -> dict[str, str]:
+    await User.create(
+        username=username,
+        password=Session.password_hasher.hash(PASSWORD),
+        role=role,
+    )
+    response = await client.post(
+        "/auth/token/", data={"username": username, "password": PASSWORD}
+    )
+    response.raise_for_status()
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def request(
+    client: httpx.AsyncClient, method: str, route: str, url: str, **kwargs
+) -> httpx.Response:
+    started = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+
+    endpoint_stats = stats[method, route]
+    endpoint_stats.latencies.append(time.perf_counter() - started)
+
+    if response.status_code >= 400:
+        endpoint_stats.errors += 1
+
+    return response
+
+
+def build_order(festival: Festival, requires_confirmation: bool) -> dict:
+    products = []
+    for product in random.sample(festival.products, random.randint(1, 4)):
+        item = {"product_id": product.id, "quantity": random.randint(1, 3)}
+
+        if product.id in festival.variants:
+            item["variant_id"] = random.choice(festival.variants[product.id])
+
+        if product.id in festival.ingredients and random.random() < 0.3:
+            item["ingredients"] = [
+                {
+                    "ingredient_id": random.choice(
+                        festival.ingredients[product.id]
+                    )
+                }
+            ]
+
+        products.append(item)
+
+    menus = []
+    if festival.menus and random.random() < 0.4:
+        menu, fields = random.choice(festival.menus)
+        menus.append(
+            {
+                "menu_id": menu.id,
+                "quantity": random.randint(1, 2),
+                "fields": [
+                    {
+                        "menu_field_id": menu_field.id,
+                        "products": [
+                            {
+                                "product_id": random.choice(product_ids),
+                                "quantity": 1,
+                            }
+                        ],
+                    }
+                    for menu_field, product_ids in fields
+                ],
+            }
+        )
+
+    return {
+        "customer": f"Cliente {random.randint(1, 9999)}",
+        "guests": random.randint(1, 6),
+        "is_take_away": False,
+        "is_takeaway_kiosk": False,
+        "table": None if requires_confirmation else random.randint(1, 200),
+        "is_voucher": False,
+        "products": products,
+        "menus": menus,
+    }
+
+
+async def serve_when_done(
+    client: httpx.AsyncClient, staff: Staff, order_id: int
+) -> None:
+    # The kitchen screen polls the order until its tickets are printed
+    for _ in range(SERVE_POLLS):
+        response = await request(
+            client,
+            "GET",
+            "/orders/{order_id}",
+            f"/orders/{order_id}",
+            headers=staff.kitchen,
+        )
+
+        if response.json().get("is_done"):
+            await request(
+                client,
+                "PATCH",
+                "/orders/{order_id}/serve",
+                f"/orders/{order_id}/serve",
+                headers=staff.waiter,
+            )
+            return
+
+        await asyncio.sleep(SERVE_POLL_INTERVAL)
+
+
+async def run_till(
+    client: httpx.AsyncClient,
+    festival: Festival,
+    headers: dict[str, str],
+    staff: Staff,
+    orders: int,
+    think_time: float,
+) -> list[asyncio.Task]:
+    waiters = []
+    etag = None
+
+    for i in range(orders):
+        # Tills refresh their catalog every few orders, revalidating it
+        if i % 10 == 0:
+            response = await request(
+                client,
+                "GET",
+                "/products/",
+                "/products/",
+                headers={
+                    **headers,
+                    **({"If-None-Match": etag} if etag else {}),
+                },
+            )
+            etag = response.headers.get("etag", etag)
+
+        response = await request(
+            client,
+            "POST",
+            "/orders/",
+            "/orders/",
+            json=build_order(festival, bool(staff.confirmer)),
+            headers=headers,
+        )
+
+        if response.status_code != 200:
+            continue
+
+        order_id = response.json()["order"]["id"]
+
+        if staff.confirmer:
+            await request(
+                client,
+                "PATCH",
+                "/orders/{order_id}/confirm",
+                f"/orders/{order_id}/confirm",
+                json={
+                    "table": random.randint(1, 200),
+                    "is_takeaway_or_kiosk": False,
+                },
+                headers=staff.confirmer,
+            )
+
+        if random.random() < 0.05:
+            await request(
+                client,
+                "POST",
+                "/orders/{order_id}/print",
+                f"/orders/{order_id}/print",
+                json={"printer_types": [PrinterType.RECEIPT]},
+                headers=staff.kitchen,
+            )
+
+        waiters.append(
+            asyncio.create_task(serve_when_done(client, staff, order_id))
+        )
+
+        await asyncio.sleep(random.uniform(0, think_time * 2))
+
+    return waiters
+
+
+async def run_statistics(
+    client: httpx.AsyncClient,
+    headers: dict[str, str],
+    stop: asyncio.Event,
+) -> None:
+    while not stop.is_set():
+        await request(
+            client, "GET", "/statistics/", "/statistics/", headers=headers
+        )
+        await request(
+            client,
+            "GET",
+            "/statistics/pending",
+            "/statistics/pending",
+            headers=headers,
+        )
+
+        try:
+            await asyncio.wait_for(stop.wait(), 1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def wait_print_drain(timeout: float) -> float:
+    started = time.perf_counter()
+
+    while time.perf_counter() - started < timeout:
+        if not await PrintJob.exclude(status=PrintJobStatus.PRINTED).exists():
+            break
+
+        await asyncio.sleep(0.1)
+
+    return time.perf_counter() - started
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def average_queries(method: str, route: str) -> float:
+    # Recorded by the request metrics middleware of the app
+    counts, total = request_queries.series.get((method, route), ([], [0]))
+
+    return total[0] / sum(counts) if counts else 0
+
+
+def report(elapsed: float, drain: float, printers: list[FakePrinter]) -> None:
+    print(
+        f"{'endpoint':<34} {'count':>6} {'err':>4} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'req/s':>7} {'queries':>8}"
+    )
+
+    for (method, route), endpoint_stats in sorted(stats.items()):
+        latencies = endpoint_stats.latencies
+
+        if not latencies:
+            continue
+
+        print(
+            f"{method + ' ' + route:<34} {len(latencies):>6} "
+            f"{endpoint_stats.errors:>4} "
+            f"{percentile(latencies, 0.50) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.95) * 1000:>8.1f} "
+            f"{percentile(latencies, 0.99) * 1000:>8.1f} "
+            f"{len(latencies) / elapsed:>7.1f} "
+            f"{average_queries(method, route):>8.1f}"
+        )
+
+    created = len(stats["POST", "/orders/"].latencies)
+    print(
+        f"{created} orders in {elapsed:.1f} s "
+        f"({created / elapsed:.1f} orders/s), "
+        f"{sum(x.tickets for x in printers)} tickets printed, "
+        f"print queue drained {drain:.1f} s after the last order"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    import main as app_main
+
+    logger.remove()
+
+    config = Session.config
+    server = await asyncpg.connect(
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        user=config.DB_USERNAME,
+        password=config.DB_PASSWORD,
+        database="postgres",
+    )
+    # Fails if the database exists, so no data is ever dropped by mistake
+    await server.execute(f'CREATE DATABASE "{args.database}"')
+    config.DB_NAME = args.database
+
+    printers = [FakePrinter(f"127.0.0.{i + 2}") for i in range(args.printers)]
+    for fake_printer in printers:
+        await fake_printer.start()
+
+    app = app_main.app
+
+    try:
+        async with app.router.lifespan_context(app):
+            setting = await Setting.first()
+            setting.order_requires_confirmation = args.confirm
+            await setting.save()
+            Session.settings = Settings(**await setting.to_dict())
+
+            random.seed(args.seed)
+            festival = await seed(args.products, args.menus, printers)
+
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://benchmark",
+            )
+
+            staff = Staff(
+                kitchen=await login(
+                    client, "cucina", await Role.get(name="admin")
+                ),
+                waiter=await login(client, "cameriere", festival.waiter_role),
+                statistics=await login(
+                    client, "statistiche", festival.statistics_role
+                ),
+                confirmer=(
+                    await login(
+                        client, "cassa centrale", festival.confirmer_role
+                    )
+                    if args.confirm
+                    else None
+                ),
+            )
+            tills_headers = [
+                await login(client, f"cassa {i}", festival.till_role)
+                for i in range(args.tills)
+            ]
+
+            stop = asyncio.Event()
+            statistics_task = asyncio.create_task(
+                run_statistics(client, staff.statistics, stop)
+            )
+
+            started = time.perf_counter()
+            waiters = await asyncio.gather(
+                *(
+                    run_till(
+                        client,
+                        festival,
+                        headers,
+                        staff,
+                        args.orders,
+                        args.think_time,
+                    )
+                    for headers in tills_headers
+                )
+            )
+            elapsed = time.perf_counter() - started
+
+            drain = await wait_print_drain(args.drain_timeout)
+            await asyncio.gather(*(x for till in waiters for x in till))
+
+            stop.set()
+            await statistics_task
+            await client.aclose()
+
+            report(elapsed, drain, printers)
+    finally:
+        for fake_printer in printers:
+            await fake_printer.stop()
+
+        if not args.keep:
+            await server.execute(
+                f'DROP DATABASE IF EXISTS "{args.database}" WITH (FORCE)'
+            )
+
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default="festival_benchmark")
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument("--tills", type=int, default=8)
+    parser.add_argument("--orders", type=int, default=50)
+    parser.add_argument("--think-time", type=float, default=0.05)
+    parser.add_argument("--products", type=int, default=40)
+    parser.add_argument("--menus", type=int, default=4)
+    parser.add_argument("--printers", type=int, default=3)
+    parser.add_argument("--confirm", action="store_true")
+    parser.add_argument("--drain-timeout", type=float, default=60)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Compare the to_dict path with the synchronous serializers on a large
+GET /orders/ response.
+
+The orders are seeded in an in-memory SQLite database, so nothing is
+written to the configured one.
+
+    python -m benchmarks.order_serialization --orders 500 --rounds 5
+"""
+
+import argparse
+import asyncio
+import datetime
+import time
+from decimal import Decimal
+
+from pydantic_core import to_json
+from tortoise import Tortoise
+
+from backend.database.models import (
+    Menu,
+    MenuField,
+    MenuFieldProduct,
+    Order,
+    OrderMenu,
+    OrderMenuField,
+    OrderProduct,
+    OrderProductIngredient,
+    Product,
+    ProductDate,
+    ProductIngredient,
+    ProductRole,
+    ProductVariant,
+    Role,
+    Subcategory,
+    User,
+)
+from backend.models.orders import GetOrdersResponse, Order as OrderModel
+from backend.services.serializers import BASE_RESPONSE, serialize_order
+from backend.utils import Category
+from backend.utils.prefetch_utils import ORDER_PREFETCH_PLAN, plan_prefetch
+
+PRODUCTS = 20
+
+
+async def seed(orders: int) -> None:
+    role = await Role.create(name="cassa", can_order=True)
+    user = await User.create(username="cassa", password="", role=role)
+    subcategory = await Subcategory.create(name="Primi")
+    now = datetime.datetime.now(datetime.timezone.utc)
+
+    products = []
+    for i in range(PRODUCTS):
+        product = await Product.create(
+            name=f"Prodotto {i}",
+            short_name=f"P{i}",
+            price=Decimal("5.50"),
+            category=Category.FOOD,
+            subcategory=subcategory,
+        )
+        await ProductDate.create(
+            product=product,
+            start_date=now - datetime.timedelta(days=1),
+            end_date=now + datetime.timedelta(days=1),
+        )
+        await ProductRole.create(product=product, role=role)
+        await ProductVariant.create(
+            product=product, name="Grande", price=Decimal("1.00")
+        )
+        await ProductIngredient.create(
+            product=product, name="Formaggio", price=Decimal("0.50")
+        )
+        products.append(
+            await Product.get(id=product.id).prefetch_related("ingredients")
+        )
+
+    menu = await Menu.create(name="Menu", short_name="M", price=Decimal("12"))
+    menu_field = await MenuField.create(
+        menu=menu, name="Primo", max_sortable_elements=1, additional_cost=0
+    )
+    for product in products[:5]:
+        await MenuFieldProduct.create(
+            menu_field=menu_field, product=product, price=Decimal("0.50")
+        )
+
+    for i in range(orders):
+        order = await Order.create(
+            customer=f"Cliente {i}",
+            guests=2,
+            is_take_away=False,
+            table=i % 50 + 1,
+            price=Decimal("30.00"),
+            user=user,
+        )
+
+        for product in products[i % PRODUCTS : i % PRODUCTS + 3]:
+            order_product = await OrderProduct.create(
+                order=order, product=product, price=Decimal("6"), quantity=2
+            )
+            await OrderProductIngredient.create(
+                order_product=order_product,
+                product_ingredient=product.ingredients[0],
+            )
+
+        order_menu = await OrderMenu.create(
+            order=order, menu=menu, price=Decimal("12.50"), quantity=1
+        )
+        order_menu_field = await OrderMenuField.create(
+            order_menu=order_menu, menu_field=menu_field
+        )
+        await OrderProduct.create(
+            order=order,
+            product=products[i % 5],
+            price=Decimal("0.50"),
+            quantity=1,
+            order_menu_field=order_menu_field,
+        )
+
+
+async def to_dict_path(orders: list[Order], include: dict[str, bool]) -> bytes:
+    response = GetOrdersResponse(
+        total_count=len(orders),
+        orders=[
+            OrderModel(**await order.to_dict(**include)) for order in orders
+        ],
+    )
+
+    return response.model_dump_json().encode()
+
+
+def serializer_path(orders: list[Order], include: dict[str, bool]) -> bytes:
+    return to_json(
+        {
+            **BASE_RESPONSE,
+            "total_count": len(orders),
+            "next_cursor": None,
+            "orders": [serialize_order(order, include) for order in orders],
+        }
+    )
+
+
+async def run(orders: int, rounds: int) -> None:
+    await Tortoise.init(
+        db_url="sqlite://:memory:",
+        modules={"models": ["backend.database.models"]},
+    )
+    await Tortoise.generate_schemas()
+    await seed(orders)
+
+    cases = {
+        "header only": dict.fromkeys(ORDER_PREFETCH_PLAN, False),
+        "all includes": dict.fromkeys(ORDER_PREFETCH_PLAN, True),
+    }
+
+    for name, include in cases.items():
+        rows = await Order.all().prefetch_related(
+            *plan_prefetch(ORDER_PREFETCH_PLAN, include)
+        )
+
+        old = await to_dict_path(rows, include)
+        new = serializer_path(rows, include)
+        assert old == new, f"{name}: outputs differ"
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            await to_dict_path(rows, include)
+        old_time = (time.perf_counter() - started) / rounds
+
+        started = time.perf_counter()
+        for _ in range(rounds):
+            serializer_path(rows, include)
+        new_time = (time.perf_counter() - started) / rounds
+
+        print(
+            f"{name}: {len(rows)} orders, {len(new)} bytes, "
+            f"to_dict {old_time * 1000:.1f} ms, "
+            f"serializers {new_time * 1000:.1f} ms "
+            f"({old_time / new_time:.1f}x)"
+        )
+
+    await Tortoise.close_connections()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
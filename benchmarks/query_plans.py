@@ -0,0 +1,355 @@
+"""
+Check that the hot order queries are planned on the indexes added by the
+migrations.
+
+A new database is created on the Postgres server of the configuration,
+filled with the orders of a few festival days and dropped at the end. The
+plan of each query is printed and the exit status is 1 when a query does
+not use its index.
+
+    python -m benchmarks.query_plans --days 10 --orders-per-day 3000
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import sys
+
+import asyncpg
+from tortoise import Tortoise, connections
+
+from backend.config import Session
+from backend.database import get_config, run_migrations
+from backend.database.models import (
+    Menu,
+    Order,
+    PrintJob,
+    Printer,
+    Product,
+    Role,
+    RolePrinter,
+    Subcategory,
+    User,
+)
+from backend.services.statistics import (
+    ITEMS_SUMMARY_QUERY,
+    ORDERS_SUMMARY_QUERY,
+    _build_orders_where,
+)
+from backend.utils import Category, PrinterType, PrintJobStatus
+from backend.utils.print_manager import CLAIM_PRINT_JOB_QUERY
+
+ROLES = 4
+USERS_PER_ROLE = 5
+PRODUCTS = 40
+MENUS = 4
+PRINTERS = 3
+EVENING = datetime.time(20)
+
+# Orders of the past days are done and printed, a few of today are still
+# waiting for the printers
+FILL_ORDERS_QUERY = """
+INSERT INTO "order" (
+    customer, guests, is_take_away, is_confirm, is_done, is_deleted,
+    is_voucher, is_served, is_takeaway_kiosk, price, created_at, user_id
+)
+SELECT
+    'cliente ' || n,
+    2 + n % 4,
+    n % 5 = 0,
+    true,
+    created_at < $3::timestamptz - interval '5 minutes',
+    n % 50 = 0,
+    n % 40 = 0,
+    created_at < $3::timestamptz - interval '30 minutes',
+    false,
+    10 + n % 30,
+    created_at,
+    (SELECT min(id) FROM "user") + n % $4::int
+FROM generate_series(1, $1::int * $2::int) AS n,
+    LATERAL (
+        SELECT $3::timestamptz - n * interval '1 day' / $2::int AS created_at
+    ) AS c;
+"""
+
+FILL_ORDER_PRODUCTS_QUERY = """
+INSERT INTO order_product (price, quantity, order_id, product_id)
+SELECT 5, 1 + (o.id + i) % 3, o.id, $1::int + (o.id * 7 + i) % $2::int
+FROM "order" o, generate_series(1, 3) AS i;
+"""
+
+FILL_ORDER_MENUS_QUERY = """
+INSERT INTO order_menu (price, quantity, order_id, menu_id)
+SELECT 12, 1, o.id, $1::int + o.id % $2::int
+FROM "order" o
+WHERE o.id % 3 = 0;
+"""
+
+FILL_PRINT_JOBS_QUERY = """
+INSERT INTO print_job (
+    printer_type, status, attempts, next_retry, payload, created_at,
+    order_id, printer_id, role_printer_id
+)
+SELECT
+    rp.printer_type,
+    CASE WHEN o.is_done THEN 'printed' ELSE 'queued' END,
+    1,
+    o.created_at,
+    '\\x1b40'::bytea,
+    o.created_at,
+    o.id,
+    rp.printer_id,
+    rp.id
+FROM "order" o
+JOIN role_printer rp ON rp.role_id = (
+    SELECT role_id FROM "user" WHERE id = o.user_id
+);
+"""
+
+
+def get_index_names(plan: dict) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+
+    for child in plan.get("Plans", ()):
+        names |= get_index_names(child)
+
+    return names
+
+
+def get_hot_queries(now: datetime.datetime) -> list[tuple[str, str, list]]:
+    """
+    Name, SQL and parameters of the hot queries, built as the app builds
+    them.
+    """
+
+    start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    today = _build_orders_where(created_after=start_date, created_before=now)
+    role_today = _build_orders_where(
+        created_after=start_date, created_before=now, role_ids=[1]
+    )
+
+    return [
+        (
+            "print sweep",
+            Order.filter(is_done=False).values_list("id", flat=True).sql(),
+            [False],
+        ),
+        (
+            "print jobs of orders",
+            PrintJob.filter(
+                order_id__in=[1, 2, 3], status__not=PrintJobStatus.PRINTED
+            )
+            .values_list("order_id", flat=True)
+            .sql(),
+            [1, 2, 3, PrintJobStatus.PRINTED.value],
+        ),
+        (
+            "print job claim",
+            # EXPLAIN does not run the update
+            CLAIM_PRINT_JOB_QUERY,
+            [1, 30, 10],
+        ),
+        (
+            "orders of today",
+            ORDERS_SUMMARY_QUERY.format(where=today[0]),
+            today[1],
+        ),
+        (
+            "products of today",
+            ITEMS_SUMMARY_QUERY.format(
+                field_name="product_id",
+                items_table="order_product",
+                where=today[0],
+                items_filter="AND item.order_menu_field_id IS NULL",
+            ),
+            today[1],
+        ),
+        (
+            "menus of today",
+            ITEMS_SUMMARY_QUERY.format(
+                field_name="menu_id",
+                items_table="order_menu",
+                where=today[0],
+                items_filter="",
+            ),
+            today[1],
+        ),
+        (
+            "orders of a role today",
+            ORDERS_SUMMARY_QUERY.format(where=role_today[0]),
+            role_today[1],
+        ),
+        (
+            "products of an order",
+            ITEMS_SUMMARY_QUERY.format(
+                field_name="product_id",
+                items_table="order_product",
+                where="NOT o.is_deleted AND o.id = $1",
+                items_filter="",
+            ),
+            [1],
+        ),
+        (
+            "orders page",
+            Order.filter(is_deleted=False)
+            .order_by("created_at", "id")
+            .limit(50)
+            .sql(),
+            [False, 50],
+        ),
+    ]
+
+
+# A plan passes when it uses any of the indexes of its query. The items of
+# a window of orders may be joined with a scan of the items, when the
+# window holds a large part of them
+EXPECTED_INDEXES = {
+    "print sweep": {"order_not_done_idx"},
+    "print jobs of orders": {"print_job_order_id_idx"},
+    "print job claim": {"print_job_claim_idx"},
+    "orders of today": {"order_created_at_idx"},
+    "products of today": {"order_created_at_idx"},
+    "menus of today": {"order_created_at_idx"},
+    "orders of a role today": {
+        "order_user_id_created_at_idx",
+        "order_created_at_idx",
+    },
+    "products of an order": {"order_product_order_id_idx"},
+    "orders page": {"order_created_at_idx"},
+}
+
+
+async def seed(days: int, orders_per_day: int) -> datetime.datetime:
+    roles = [
+        await Role.create(name=f"cassa {i}", can_order=True)
+        for i in range(ROLES)
+    ]
+    for role in roles:
+        for i in range(USERS_PER_ROLE):
+            await User.create(
+                username=f"{role.name} {i}", password="x", role=role
+            )
+
+    subcategory = await Subcategory.create(name="Cucina", order=1)
+    products = [
+        await Product.create(
+            name=f"Prodotto {i}",
+            short_name=f"P{i}",
+            price=5,
+            category=Category.FOOD,
+            order=i,
+            subcategory=subcategory,
+        )
+        for i in range(PRODUCTS)
+    ]
+    menus = [
+        await Menu.create(name=f"Menu {i}", short_name=f"M{i}", price=12)
+        for i in range(MENUS)
+    ]
+    printers = [
+        await Printer.create(name=f"Stampante {i}", ip_address=f"10.0.0.{i}")
+        for i in range(PRINTERS)
+    ]
+    for role in roles:
+        for printer, printer_type in zip(printers, PrinterType):
+            await RolePrinter.create(
+                role=role, printer=printer, printer_type=printer_type
+            )
+
+    # The evening rush, when the statistics of today read the most orders
+    now = datetime.datetime.combine(
+        datetime.date.today(), EVENING, tzinfo=datetime.timezone.utc
+    )
+    connection = connections.get("default")
+
+    await connection.execute_query(
+        FILL_ORDERS_QUERY,
+        [days, orders_per_day, now, ROLES * USERS_PER_ROLE],
+    )
+    await connection.execute_query(
+        FILL_ORDER_PRODUCTS_QUERY, [products[0].id, PRODUCTS]
+    )
+    await connection.execute_query(
+        FILL_ORDER_MENUS_QUERY, [menus[0].id, MENUS]
+    )
+    await connection.execute_query(FILL_PRINT_JOBS_QUERY)
+    # As autovacuum would, so that index-only scans are costed as such
+    await connection.execute_script("VACUUM ANALYZE;")
+
+    return now
+
+
+async def check_plans(now: datetime.datetime) -> bool:
+    connection = connections.get("default")
+    ok = True
+
+    for name, query, params in get_hot_queries(now):
+        _, rows = await connection.execute_query(
+            f"EXPLAIN (FORMAT JSON) {query}", params
+        )
+        plan = json.loads(rows[0]["QUERY PLAN"])[0]["Plan"]
+        used = get_index_names(plan)
+        expected = EXPECTED_INDEXES[name]
+        passed = bool(expected & used)
+        ok &= passed
+
+        print(
+            f"{'OK  ' if passed else 'FAIL'} {name:<24} "
+            f"cost {plan['Total Cost']:>10.1f}  "
+            f"indexes {', '.join(sorted(used)) or '-'}"
+        )
+
+        if not passed:
+            print(f"     expected {' or '.join(sorted(expected))}")
+
+    return ok
+
+
+async def run(args: argparse.Namespace) -> bool:
+    config = Session.config
+    server = await asyncpg.connect(
+        host=config.DB_HOST,
+        port=config.DB_PORT,
+        user=config.DB_USERNAME,
+        password=config.DB_PASSWORD,
+        database="postgres",
+    )
+    # Fails if the database exists, so no data is ever dropped by mistake
+    await server.execute(f'CREATE DATABASE "{args.database}"')
+    config.DB_NAME = args.database
+
+    try:
+        await Tortoise.init(config=get_config())
+        await run_migrations()
+
+        now = await seed(args.days, args.orders_per_day)
+
+        return await check_plans(now)
+    finally:
+        await connections.close_all()
+
+        if not args.keep:
+            await server.execute(
+                f'DROP DATABASE IF EXISTS "{args.database}" WITH (FORCE)'
+            )
+
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database", default="festival_query_plans")
+    parser.add_argument("--keep", action="store_true")
+    parser.add_argument("--days", type=int, default=10)
+    parser.add_argument("--orders-per-day", type=int, default=3000)
+    args = parser.parse_args()
+
+    Session.set_config()
+
+    if not asyncio.run(run(args)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
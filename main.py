@@ -1,5 +1,8 @@
+import asyncio
 import contextlib
+import os
 import sys
+import tempfile
 
 import uvicorn
 from argon2 import PasswordHasher
@@ -12,13 +15,28 @@ from starlette.exceptions import HTTPException
 from tortoise.transactions import in_transaction
 
 from backend.config import Session
-from backend.database import init_db, stop_db
+from backend.database import (
+    has_replica,
+    init_db,
+    monitor_replica,
+    run_migrations,
+    stop_db,
+)
+from backend.database.pool import update_pool_metrics
 from backend.database.models import Role, User, Setting
 from backend.models import BaseResponse, UnicornException
 from backend.models.settings import Settings
+from backend.services.catalog import refresh_catalog
+from backend.services.orders import seed_today_quantities
+from backend.services.pending_stream import publish_shared_changes
+from backend.services.permissions import invalidate_role_permissions
+from backend.services.statistics import seed_statistics
 from backend.utils import ErrorCodes, to_snake_case, generate_password
+from backend.utils.cluster import Cluster
 from backend.utils.costants import FMT
+from backend.utils.metrics import reset_metrics, write_metrics
 from backend.utils.print_manager import PrintManager
+from backend.utils.request_metrics import RequestMetricsMiddleware, instrument
 
 # Logger
 logger.remove()
@@ -32,6 +50,35 @@ logger.add(
 )
 
 
+# Key of the advisory lock taken while creating the base rows, so that the
+# workers started together create them once
+BOOTSTRAP_LOCK_KEY = 7_214_005
+# Seconds between two writes of the metrics of a worker
+METRICS_WRITE_INTERVAL = 5
+
+
+async def reload_settings(_: dict):
+    setting = await Setting.first()
+    Session.settings = Settings(**await setting.to_dict())
+
+
+async def reload_role_permissions(data: dict):
+    # Every role after a reconnection, the changes may have been missed
+    invalidate_role_permissions(data.get("role_id"))
+
+
+async def share_metrics(directory: str):
+    while True:
+        try:
+            update_pool_metrics()
+            write_metrics(directory)
+        except Exception as e:
+            logger.error("Errore nella scrittura delle metriche")
+            logger.exception(e)
+
+        await asyncio.sleep(METRICS_WRITE_INTERVAL)
+
+
 # Create admin user and role - if not exist
 @contextlib.asynccontextmanager
 async def lifespan(application: FastAPI):
@@ -39,11 +86,32 @@ async def lifespan(application: FastAPI):
     async with init_db()(application):
         logger.info(f"Tortoise-ORM started")
 
-        # Print Manager
-        Session.print_manager = await PrintManager.create()
+        # Tables of the models, indexes and changes of the schema
+        await run_migrations()
+        logger.info("Database migrations applied")
+
+        # Replica lag, the reads stay on the primary until it is known
+        replica_monitor = None
+        if has_replica():
+            replica_monitor = asyncio.create_task(monitor_replica())
+            logger.info("Initializing Replica monitor")
+
+        # Cluster, the processes serving the API
+        cluster = Session.cluster = Cluster()
+        cluster.subscribe("catalog", lambda _: refresh_catalog())
+        cluster.subscribe("settings", reload_settings)
+        cluster.subscribe("roles", reload_role_permissions)
+        cluster.subscribe("pending", publish_shared_changes)
+
+        # Print Manager, the printers are driven by the leader
+        Session.print_manager = await PrintManager.create(cluster)
         logger.info("Initializing Print Manager")
 
-        async with in_transaction() as connection:
+        async with in_transaction("default") as connection:
+            await connection.execute_query(
+                "SELECT pg_advisory_xact_lock($1);", [BOOTSTRAP_LOCK_KEY]
+            )
+
             # Create settings row
             setting = await Setting.first(using_db=connection)
 
@@ -62,6 +130,12 @@ async def lifespan(application: FastAPI):
 
             await Role.get_or_create(name="base", using_db=connection)
 
+            # Daily sales counters
+            await seed_today_quantities(connection)
+
+            # Statistics
+            await seed_statistics(connection)
+
             # Create admin user
             password = generate_password()
             ph = Session.password_hasher = PasswordHasher()
@@ -77,8 +151,33 @@ async def lifespan(application: FastAPI):
         if created:
             logger.info(f"Created the admin user with password {password}")
 
+        # Catalog snapshot
+        await refresh_catalog()
+        logger.info("Initializing Catalog snapshot")
+
+        # Leader election, once the orders can be printed
+        cluster.start()
+        logger.info("Initializing Cluster")
+
+        # Metrics, exported by whichever worker is scraped
+        metrics_dir = Session.config.METRICS_DIR
+        metrics_writer = None
+        if metrics_dir:
+            metrics_writer = asyncio.create_task(share_metrics(metrics_dir))
+            logger.info("Initializing Metrics sharing")
+
         yield
 
+        if metrics_writer:
+            metrics_writer.cancel()
+            # The last requests of the worker are kept
+            write_metrics(metrics_dir)
+
+        await cluster.stop()
+
+        if replica_monitor:
+            replica_monitor.cancel()
+
         await stop_db()
         logger.info("Tortoise-ORM shutdown")
 
@@ -105,6 +204,11 @@ app.add_middleware(
 )
 logger.info("Setting CORS")
 
+# Metrics
+instrument()
+app.add_middleware(RequestMetricsMiddleware)
+logger.info("Setting request metrics")
+
 # FastAPI - APIRouter
 from backend.api import api
 
@@ -167,8 +271,21 @@ async def internal_server_error_handler(_: Request, exc: Exception):
 
 
 if __name__ == "__main__":
+    # The workers share their metrics through a directory, inherited from
+    # the environment
+    if Session.config.APP_WORKERS > 1 and not Session.config.METRICS_DIR:
+        os.environ["METRICS_DIR"] = tempfile.mkdtemp(prefix="festival-")
+        Session.set_config()
+
+    if Session.config.METRICS_DIR:
+        reset_metrics(Session.config.METRICS_DIR)
+
     try:
-        uvicorn.run(app, host=Session.config.APP_HOST)
+        uvicorn.run(
+            "main:app",
+            host=Session.config.APP_HOST,
+            workers=Session.config.APP_WORKERS,
+        )
 
     except KeyboardInterrupt:
         pass